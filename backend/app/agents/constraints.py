@@ -1,4 +1,5 @@
 from typing import Dict, Any, List
+import numpy as np
 from ..core.models import AgentOpinion
 from ..core.constants import (
     RAMP_UP_PENALTY_DAYS, 
@@ -39,6 +40,22 @@ class ConstraintAgent:
             }
 
         return {"feasible": True, "penalty": 0.0, "reason": "No constraints detected."}
+
+    def evaluate_intervention_grid(self, action_type: str, days_to_deadline) -> Dict[str, np.ndarray]:
+        """
+        Vectorised evaluate_intervention over an array of days_to_deadline.
+        Returns { "feasible": bool array, "penalty": float array }, same shape.
+        """
+        days = np.asarray(days_to_deadline)
+
+        if action_type == "ADD_ENGINEER":
+            feasible = days >= RAMP_UP_PENALTY_DAYS
+            return {"feasible": feasible, "penalty": np.where(feasible, 0.2, 0.8)}
+
+        if action_type == "ESCALATE_DEPENDENCY":
+            return {"feasible": np.ones(days.shape, dtype=bool), "penalty": np.full(days.shape, 0.1)}
+
+        return {"feasible": np.ones(days.shape, dtype=bool), "penalty": np.zeros(days.shape)}
     
     def evaluate_all_constraints(self, context: Dict[str, Any]) -> AgentOpinion:
         """
@@ -0,0 +1,267 @@
+"""
+SimulationExecutor — process-pool execution for portfolio-scale simulations.
+
+Simulation is CPU-bound NumPy work; running hundreds of projects inline
+pins one core. The executor fans work out to a pool of worker processes:
+
+  - tasks are submitted in chunks (SIM_CHUNK_SIZE items per task) so
+    per-task pickling overhead is amortised
+  - Monte Carlo net-benefit samples can come back zero-copy: each chunk
+    writes them into one shared-memory block sized to the trials it
+    actually ran, and the parent reads views into it
+  - worker count comes from settings.SIM_WORKERS (0 → one per core)
+
+Workers never talk to Neo4j: the parent resolves every context first and
+ships plain dicts, so each worker is pure computation.
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.models import AgentOpinion, DecisionComparison
+from .simulation import SimulationAgent, POSSIBLE_ACTIONS
+
+logger = logging.getLogger(__name__)
+
+NET_BENEFIT_PERCENTILES = (5, 50, 95)
+
+
+# ── Worker-side state (one instance per worker process) ───────────────────
+
+_worker_sim_agent: Optional[SimulationAgent] = None
+_worker_team_sim = None
+
+
+def _get_worker_sim_agent() -> SimulationAgent:
+    global _worker_sim_agent
+    if _worker_sim_agent is None:
+        _worker_sim_agent = SimulationAgent()
+    return _worker_sim_agent
+
+
+def _get_worker_team_sim():
+    global _worker_team_sim
+    if _worker_team_sim is None:
+        from .team_simulator import TeamCompositionSimulator
+        _worker_team_sim = TeamCompositionSimulator()
+    return _worker_team_sim
+
+
+def _comparison_chunk(
+    items: List[Tuple[float, Dict[str, Any]]],
+    keep_samples: bool,
+) -> Tuple[list, Optional[str]]:
+    """
+    Worker task: decision comparisons for a chunk of (risk_score, context).
+    Returns (comparisons, opinion, mean_rr by action, n_trials by action)
+    per item and, with keep_samples, the name of the shared-memory block
+    holding the chunk's net-benefit samples back to back (POSSIBLE_ACTIONS
+    order). The parent owns and unlinks the block.
+    """
+    agent = _get_worker_sim_agent()
+    out, runs = [], []
+    for risk_score, context in items:
+        mc_results = agent.run_simulations(context)
+        comparisons, opinion = agent.generate_decision_comparison(risk_score, context, mc_results)
+        out.append((
+            comparisons,
+            opinion,
+            {a: mc.mean_rr for a, mc in mc_results.items()},
+            [mc_results[a].n_trials for a in POSSIBLE_ACTIONS],
+        ))
+        if keep_samples:
+            runs.append(mc_results)
+
+    if not keep_samples:
+        return out, None
+
+    total = sum(sum(n_trials) for *_, n_trials in out)
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 4)
+    try:
+        net = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+        pos = 0
+        for mc_results in runs:
+            for a in POSSIBLE_ACTIONS:
+                samples = mc_results[a].net_samples
+                net[pos:pos + len(samples)] = samples
+                pos += len(samples)
+        del net
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return out, shm.name
+
+
+def _team_chunk(
+    jobs: List[Tuple[list, Optional[float], Dict[str, Any]]],
+) -> list:
+    """Worker task: simulate_batch for a chunk of (mutations, baseline, context)."""
+    simulator = _get_worker_team_sim()
+    return [simulator.simulate_batch(mutations, baseline, context) for mutations, baseline, context in jobs]
+
+
+def _unlink_block(name: str):
+    shm = shared_memory.SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+
+# ── Parent-side API ───────────────────────────────────────────────────────
+
+class PortfolioSamples:
+    """
+    Net-benefit samples for a portfolio run, left in the workers'
+    shared-memory blocks. net(i, action) is a read-only view of project
+    i's samples for that action; each is exactly n_trials[i, a] long.
+    Call close() — or use as a context manager — to release the blocks.
+    """
+
+    def __init__(self, n_items: int):
+        self.n_trials = np.zeros((n_items, len(POSSIBLE_ACTIONS)), dtype=np.int64)
+        self._offsets = np.zeros_like(self.n_trials)
+        self._block_of = np.zeros(n_items, dtype=np.int64)
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._views: List[np.ndarray] = []
+
+    def _attach(self, name: str, start: int, n_trials: List[List[int]]):
+        shm = shared_memory.SharedMemory(name=name)
+        total = int(np.sum(n_trials))
+        view = np.ndarray((total,), dtype=np.float32, buffer=shm.buf)
+        view.flags.writeable = False
+        self._blocks.append(shm)
+        self._views.append(view)
+
+        stop = start + len(n_trials)
+        self.n_trials[start:stop] = n_trials
+        flat = np.cumsum(self.n_trials[start:stop].ravel()) - self.n_trials[start:stop].ravel()
+        self._offsets[start:stop] = flat.reshape(-1, len(POSSIBLE_ACTIONS))
+        self._block_of[start:stop] = len(self._blocks) - 1
+
+    def net(self, i: int, action: str) -> np.ndarray:
+        a = POSSIBLE_ACTIONS.index(action)
+        offset, n = self._offsets[i, a], self.n_trials[i, a]
+        return self._views[self._block_of[i]][offset:offset + n]
+
+    def percentiles(self, i: int, q: Tuple[int, ...] = NET_BENEFIT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """Percentiles of project i's net benefit per action, e.g. {"ADD_ENGINEER": {"p5": ...}}."""
+        out = {}
+        for action in POSSIBLE_ACTIONS:
+            net = self.net(i, action)
+            values = np.percentile(net, q)
+            out[action] = {f"p{p}": round(float(v), 3) for p, v in zip(q, values)}
+            out[action]["n_trials"] = len(net)
+        return out
+
+    def close(self):
+        self._views = []  # Views must go before their blocks can close
+        blocks, self._blocks = self._blocks, []
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SimulationExecutor:
+    """Runs simulation batches on a lazily-started process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.max_workers = max_workers or settings.SIM_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or settings.SIM_CHUNK_SIZE
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()  # Batches are submitted from several threads
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: workers must not inherit the Neo4j driver or server threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=mp.get_context("spawn"),
+                )
+                logger.info(f"SimulationExecutor started with {self.max_workers} workers")
+            return self._pool
+
+    def _chunks(self, items: list) -> List[Tuple[int, list]]:
+        return [(i, items[i:i + self.chunk_size]) for i in range(0, len(items), self.chunk_size)]
+
+    def decision_comparisons(
+        self,
+        items: List[Tuple[float, Dict[str, Any]]],
+        keep_samples: bool = False,
+    ) -> Tuple[
+        List[Tuple[List[DecisionComparison], AgentOpinion, Dict[str, float]]],
+        Optional[PortfolioSamples],
+    ]:
+        """
+        Run generate_decision_comparison for every (risk_score, context).
+        Each result also carries the unrounded mean risk reduction per
+        action. With keep_samples, net-benefit samples are returned
+        zero-copy in a PortfolioSamples sized to the trials each action ran.
+        """
+        if not items:
+            return [], (PortfolioSamples(0) if keep_samples else None)
+
+        pool = self._get_pool()
+        futures = [
+            (start, pool.submit(_comparison_chunk, chunk, keep_samples))
+            for start, chunk in self._chunks(items)
+        ]
+
+        results = []
+        samples = PortfolioSamples(len(items)) if keep_samples else None
+        try:
+            for start, future in futures:
+                chunk, block = future.result()
+                if block is not None:
+                    samples._attach(block, start, [n_trials for *_, n_trials in chunk])
+                results.extend((comparisons, opinion, mean_rr) for comparisons, opinion, mean_rr, _ in chunk)
+        except BaseException:
+            # Blocks of chunks not attached yet are ours to unlink too
+            wait([f for _, f in futures])
+            for _, future in futures[len(samples._blocks) if samples else 0:]:
+                block = None if future.cancelled() or future.exception() else future.result()[1]
+                if block:
+                    _unlink_block(block)
+            if samples is not None:
+                samples.close()
+            raise
+        return results, samples
+
+    def team_batches(
+        self,
+        jobs: List[Tuple[list, Optional[float], Dict[str, Any]]],
+    ) -> list:
+        """
+        Run TeamCompositionSimulator.simulate_batch for every
+        (mutations, baseline_risk, context) job; contexts must be prebuilt.
+        """
+        if not jobs:
+            return []
+        pool = self._get_pool()
+        futures = [pool.submit(_team_chunk, chunk) for _, chunk in self._chunks(jobs)]
+        return [batch for future in futures for batch in future.result()]
+
+    def shutdown(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+# Singleton
+simulation_executor = SimulationExecutor()
@@ -0,0 +1,300 @@
+"""
+PortfolioOptimizer — allocate intervention budget and headcount across projects.
+
+'Given $200k and 6 hires this quarter, where do they cut the most risk?'
+
+Each project contributes a menu of options: the feasible interventions
+from SimulationAgent and the "add <role>" changes from
+TeamCompositionSimulator, each with a dollar cost, a headcount draw and
+a projected risk. The optimiser picks at most one option per project to
+minimise total expected portfolio risk under global budget and headcount
+limits — a multiple-choice knapsack solved by dynamic programming over a
+(budget × headcount) grid, vectorised per project, with headcount priced
+by Lagrangian relaxation when that grid would be too large to keep.
+"""
+
+import logging
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .simulation import SimulationAgent, POSSIBLE_ACTIONS
+from .team_simulator import TeamCompositionSimulator, TeamMutation, ROLE_PROFILES
+
+logger = logging.getLogger(__name__)
+
+# Budget impact of each intervention for one month (USD, headcount)
+INTERVENTION_BUDGET = {
+    "ADD_ENGINEER":        {"cost": 13_500, "headcount": 1},  # Mid Engineer × 30 days
+    "ESCALATE_DEPENDENCY": {"cost": 2_000, "headcount": 0},   # Leadership time
+    "REDUCE_SCOPE":        {"cost": 4_000, "headcount": 0},   # Re-planning + stakeholder cost
+    "ACCEPT_DELAY":        {"cost": 0, "headcount": 0},
+}
+
+MAX_BUDGET_STEPS = 1000  # Largest budget axis of the DP grid before the solve turns approximate
+MAX_DP_CELLS = 10_000_000  # Backtrack cells (projects × budget × headcount) before headcount is priced
+LAGRANGE_ITERATIONS = 40  # Bisection steps on the price of a hire
+
+Menu = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (gains, budget units, headcount) per option
+
+
+def team_mutations(project_id: str) -> List[TeamMutation]:
+    """The team changes offered to every project: one hire per role."""
+    return [TeamMutation("add", role, project_id) for role in ROLE_PROFILES]
+
+
+class PortfolioOption:
+    """One candidate change for one project."""
+    __slots__ = ("project_id", "label", "source", "cost", "headcount", "projected_risk")
+
+    def __init__(self, **kwargs):
+        for k in self.__slots__:
+            setattr(self, k, kwargs.get(k))
+
+    def to_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "source": self.source,
+            "cost": round(self.cost, 2),
+            "headcount": self.headcount,
+            "projected_risk": round(self.projected_risk, 3),
+        }
+
+
+class PortfolioOptimizer:
+    """Chooses the allocation that minimises expected portfolio risk."""
+
+    def __init__(
+        self,
+        sim_agent: Optional[SimulationAgent] = None,
+        team_sim: Optional[TeamCompositionSimulator] = None,
+    ):
+        self.sim_agent = sim_agent or SimulationAgent()
+        self.team_sim = team_sim or TeamCompositionSimulator()
+
+    def build_options(
+        self,
+        project_id: str,
+        risk_score: float,
+        sim_context: Dict[str, Any],
+        team_context: Optional[Dict[str, Any]] = None,
+        mean_rr: Optional[Dict[str, float]] = None,
+        team_results: Optional[list] = None,
+    ) -> List[PortfolioOption]:
+        """
+        Feasible interventions + team additions for one project.
+        Pass `mean_rr` (per action) and `team_results` (simulate_batch over
+        team_mutations()) computed elsewhere, e.g. on the SimulationExecutor,
+        to skip simulating here.
+        """
+        options = []
+
+        if mean_rr is None:
+            mean_rr = {a: mc.mean_rr for a, mc in self.sim_agent.run_simulations(sim_context).items()}
+        for action in POSSIBLE_ACTIONS:
+            constraint_result = self.sim_agent.constraint_agent.evaluate_intervention(action, sim_context)
+            if not constraint_result["feasible"]:
+                continue
+            budget = INTERVENTION_BUDGET[action]
+            options.append(PortfolioOption(
+                project_id=project_id,
+                label=action.replace("_", " ").title(),
+                source="SimulationAgent",
+                cost=budget["cost"],
+                headcount=budget["headcount"],
+                projected_risk=risk_score * (1.0 - mean_rr[action]),
+            ))
+
+        if team_results is None:
+            team_results = self.team_sim.simulate_batch(team_mutations(project_id), risk_score, team_context)
+        for r in team_results:
+            if not r.feasible:
+                continue
+            options.append(PortfolioOption(
+                project_id=project_id,
+                label=f"Add {r.mutation.role}",
+                source="TeamCompositionSimulator",
+                cost=r.cost_delta,
+                headcount=1,
+                projected_risk=r.projected_risk,
+            ))
+
+        return options
+
+    @staticmethod
+    def _knapsack(menus: List[Menu], B: int, width: int) -> Tuple[float, List[int]]:
+        """
+        Multiple-choice knapsack DP over a (budget units × headcount) grid
+        `width` headcount cells wide — width 1 drops the headcount axis.
+        Returns (max gain, option index picked per project, -1 = no
+        change); the backtrack table costs one byte per project per grid
+        cell.
+        """
+        dp = np.zeros((B + 1, width))  # Max gain within (budget units, headcount)
+        widest = max((len(gains) for gains, _, _ in menus), default=0)
+        choices = np.zeros((len(menus), B + 1, width), dtype=np.int8 if widest < 127 else np.int16)
+
+        for (gains, units, heads), choice in zip(menus, choices):
+            new = dp.copy()
+            for k, (gain, cb, hc) in enumerate(zip(gains, units, heads)):
+                if hc >= width:
+                    continue
+                candidate = dp[:B + 1 - cb, :width - hc] + gain
+                target = new[cb:, hc:]
+                better = candidate > target
+                np.copyto(target, candidate, where=better)
+                choice[cb:, hc:][better] = k + 1
+            dp = new
+
+        # Backtrack from the full budget / headcount cell
+        picks = [-1] * len(menus)
+        b, h = B, width - 1
+        for p in range(len(menus) - 1, -1, -1):
+            k = int(choices[p, b, h]) - 1
+            if k >= 0:
+                picks[p] = k
+                b -= int(menus[p][1][k])
+                h -= int(menus[p][2][k])
+        return float(dp[B, width - 1]), picks
+
+    def _price_headcount(self, menus: List[Menu], B: int, H: int) -> Tuple[List[int], float]:
+        """
+        Lagrangian relaxation of the headcount limit for grids too large to
+        hold: each hire is charged `lam` of risk and the budget-only DP is
+        re-solved while bisecting lam. A plan that uses exactly H hires at
+        its price is optimal (Everett); otherwise the best feasible plan is
+        returned with the duality gap, an upper bound on the risk reduction
+        it may leave behind.
+        """
+        lo = 0.0
+        lam = hi = max((float(g.max()) for g, _, _ in menus if len(g)), default=0.0)
+        best, best_gain, bound = [-1] * len(menus), 0.0, np.inf
+        for _ in range(LAGRANGE_ITERATIONS):
+            value, picks = self._knapsack(_priced(menus, lam), B, 1)
+            gain, used = _totals(menus, picks)
+            if used > H:
+                lo = lam
+            else:
+                hi = lam
+                bound = min(bound, value + lam * H)
+                if gain > best_gain:
+                    best, best_gain = picks, gain
+                if used == H:
+                    break
+            lam = (lo + hi) / 2
+        return best, max(bound - best_gain, 0.0)
+
+    def optimise(
+        self,
+        projects: List[Dict[str, Any]],
+        budget: float,
+        headcount: int,
+        resolution: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Multiple-choice knapsack over projects.
+
+        `projects`: [{"project_id", "project_name", "risk_score", "options": [PortfolioOption]}]
+
+        The budget axis is the gcd of all option costs (in whole cents),
+        which makes the solution exact. If that grid would exceed
+        MAX_BUDGET_STEPS the solve is approximate: the grid becomes
+        max(`resolution`, budget / MAX_BUDGET_STEPS) and costs are rounded
+        *up* to it, so allocations still fit the real budget but may not
+        be optimal.
+
+        Headcount is handled in the cheapest way that stays exact:
+          - solve on budget alone; if that plan fits the headcount, done
+          - else add a headcount axis while the backtrack table stays
+            within MAX_DP_CELLS
+          - else price headcount by Lagrangian relaxation ("lagrangian"),
+            reporting the duality gap as "optimality_gap"
+        The response reports which case applied ("method", "exact").
+        """
+        t0 = time.time()
+        budget_cents = int(round(budget * 100))
+        option_cents = [
+            int(np.ceil(opt.cost * 100 - 1e-6))
+            for proj in projects for opt in proj["options"] if opt.cost > 0
+        ]
+        unit = int(np.gcd.reduce(option_cents)) if option_cents else max(budget_cents, 1)
+        exact = budget_cents // unit <= MAX_BUDGET_STEPS
+        if not exact:
+            unit = int(np.ceil(max((resolution or 0) * 100, budget_cents / MAX_BUDGET_STEPS)))
+        B = budget_cents // unit
+        H = max(int(headcount), 0)
+
+        def budget_units(opt: PortfolioOption) -> int:
+            return int(np.ceil((opt.cost * 100 - 1e-6) / unit)) if opt.cost > 0 else 0
+
+        # Per project: the options worth taking that fit the budget at all
+        menus: List[Menu] = []
+        kept: List[List[int]] = []
+        for proj in projects:
+            keep = [
+                k for k, opt in enumerate(proj["options"])
+                if proj["risk_score"] - opt.projected_risk > 0 and budget_units(opt) <= B
+            ]
+            opts = [proj["options"][k] for k in keep]
+            kept.append(keep)
+            menus.append((
+                np.array([proj["risk_score"] - opt.projected_risk for opt in opts]),
+                np.array([budget_units(opt) for opt in opts], dtype=np.int64),
+                np.array([opt.headcount for opt in opts], dtype=np.int64),
+            ))
+
+        method, gap = "dp", 0.0
+        _, picks = self._knapsack(_priced(menus, 0.0), B, 1)
+        if _totals(menus, picks)[1] > H:
+            if len(projects) * (B + 1) * (H + 1) <= MAX_DP_CELLS:
+                _, picks = self._knapsack(menus, B, H + 1)
+            else:
+                method = "lagrangian"
+                picks, gap = self._price_headcount(menus, B, H)
+
+        allocations = []
+        for proj, keep, k in zip(projects, kept, picks):
+            if k < 0:
+                continue
+            opt = proj["options"][keep[k]]
+            allocations.append({
+                "project_id": proj["project_id"],
+                "project_name": proj.get("project_name", ""),
+                "baseline_risk": round(proj["risk_score"], 3),
+                "option": opt.to_dict(),
+                "risk_reduction": round(proj["risk_score"] - opt.projected_risk, 3),
+            })
+
+        baseline_risk = sum(p["risk_score"] for p in projects)
+        removed = _totals(menus, picks)[0]
+        return {
+            "allocations": allocations,
+            "budget": budget,
+            "budget_used": round(sum(a["option"]["cost"] for a in allocations), 2),
+            "headcount": int(headcount),
+            "headcount_used": sum(a["option"]["headcount"] for a in allocations),
+            "portfolio_risk_before": round(baseline_risk, 3),
+            "portfolio_risk_after": round(baseline_risk - removed, 3),
+            "projects_considered": len(projects),
+            "budget_resolution": round(unit / 100, 2),
+            "method": method,
+            "optimality_gap": round(gap, 3),
+            "exact": exact and gap <= 1e-9,
+            "solve_ms": round((time.time() - t0) * 1000, 1),
+        }
+
+
+def _priced(menus: List[Menu], lam: float) -> List[Menu]:
+    """Menus with each hire charged `lam` of gain and the headcount axis dropped."""
+    return [(gains - lam * heads, units, np.zeros_like(heads)) for gains, units, heads in menus]
+
+
+def _totals(menus: List[Menu], picks: List[int]) -> Tuple[float, int]:
+    """(gain, headcount) of a plan."""
+    gain, heads = 0.0, 0
+    for (gains, _, hc), k in zip(menus, picks):
+        if k >= 0:
+            gain += float(gains[k])
+            heads += int(hc[k])
+    return gain, heads
@@ -0,0 +1,257 @@
+"""
+ReallocationOptimizer — organisation-wide member moves between projects.
+
+'Who should move where so total portfolio risk drops the most?'
+
+Every Member (MEMBER_OF a team, ASSIGNED_TO tickets) has a home project:
+the one holding most of their open tickets. Moving a member costs the
+home project the "remove" effect and gives the target the "transfer in"
+effect, both taken from the joint scenario model in TeamCompositionSimulator.
+
+Targets offer a few incoming slots each; slot k is worth the marginal
+gain of the k-th arrival, so concurrent onboarding and risk already near
+zero give diminishing returns. Choosing the moves is then a rectangular
+assignment problem (members × project slots) solved with
+scipy.optimize.linear_sum_assignment. The chosen moves are finally
+re-simulated jointly per project for the reported portfolio risk.
+"""
+
+import logging
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from ..core.neo4j_client import neo4j_client
+from . import samplers
+from .simulation import stable_seed
+from .team_simulator import (
+    TeamCompositionSimulator, TeamMutation, TeamScenario, ROLE_PROFILES, scenario_trials,
+)
+
+logger = logging.getLogger(__name__)
+
+REALLOCATION_TRIALS = 2_000   # Trials per project when pricing moves
+SLOTS_PER_PROJECT = 2         # Incoming members a project can absorb at once
+MIN_TEAM_SIZE = 2             # A source project keeps at least this many members
+MIN_MOVE_GAIN = 0.01          # Net portfolio risk reduction worth a move
+
+# Free-text Member.role → simulator role profile (first keyword match wins)
+MEMBER_ROLE_KEYWORDS = (
+    ("lead", "Tech Lead"),
+    ("senior", "Senior Engineer"),
+    ("devops", "DevOps Engineer"),
+    ("qa", "QA Engineer"),
+    ("test", "QA Engineer"),
+    ("intern", "Junior Engineer"),
+    ("junior", "Junior Engineer"),
+)
+DEFAULT_MEMBER_PROFILE = "Mid Engineer"
+
+
+def member_profile(role: Optional[str]) -> str:
+    """Map a Member's job title onto a ROLE_PROFILES key."""
+    text = (role or "").lower()
+    for keyword, profile in MEMBER_ROLE_KEYWORDS:
+        if keyword in text:
+            return profile
+    return DEFAULT_MEMBER_PROFILE
+
+
+class ReallocationOptimizer:
+    """Proposes member moves that minimise total expected portfolio risk."""
+
+    def __init__(self, team_sim: Optional[TeamCompositionSimulator] = None):
+        self.team_sim = team_sim or TeamCompositionSimulator()
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        """Members with their team and home project (most open tickets)."""
+        records, _ = neo4j_client.execute_query("""
+            MATCH (m:Member)
+            OPTIONAL MATCH (m)-[:MEMBER_OF]->(t:Team)
+            OPTIONAL MATCH (m)-[:ASSIGNED_TO]->(tk:Ticket)<-[:HAS_TICKET]-(p:Project)
+            WHERE tk.status <> 'Done'
+            WITH m, t, p, count(tk) as open_tickets
+            ORDER BY open_tickets DESC
+            RETURN m.id as id, m.name as name, m.role as role,
+                   collect(t.name)[0] as team,
+                   collect(p.id)[0] as project_id
+        """)
+        return [
+            {
+                "member_id": r["id"],
+                "name": r["name"],
+                "role": r["role"],
+                "team": r["team"],
+                "project_id": r["project_id"],
+                "profile": member_profile(r["role"]),
+            }
+            for r in records if r["id"]
+        ]
+
+    # ── Move pricing ──────────────────────────────────────────────────────
+
+    def _price_project(self, project: Dict[str, Any], slots: int, u: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        For one project: expected risk change of losing each role, and the
+        marginal gain of the k-th incoming member of each role (R × slots).
+        `u` is shared by every project so their prices are directly comparable.
+        """
+        roles = list(ROLE_PROFILES)
+        R = len(roles)
+        context, baseline = project["context"], project["risk_score"]
+
+        # Scenarios: "remove r" for every role, then "transfer in r" × k
+        S = R + R * slots
+        steps = {
+            "action": np.full((S, slots), "", dtype=object),
+            "velocity_boost": np.zeros((S, slots)),
+            "ramp_up_days": np.zeros((S, slots)),
+            "blocked_resolution": np.zeros((S, slots)),
+            "team_size": np.zeros((S, slots)),
+        }
+        for r, role in enumerate(roles):
+            profile = ROLE_PROFILES[role]
+            rows = [(r, 0, "remove")] + [
+                (R + r * slots + k - 1, step, "transfer")
+                for k in range(1, slots + 1) for step in range(k)
+            ]
+            for row, step, action in rows:
+                steps["action"][row, step] = action
+                steps["team_size"][row, step] = context["team_size"] + step
+                for f in ("velocity_boost", "ramp_up_days", "blocked_resolution"):
+                    steps[f][row, step] = profile[f]
+
+        projected, _ = scenario_trials(steps, context, baseline, u)
+        mean = projected.mean(axis=1)
+
+        after_k = mean[R:].reshape(R, slots)
+        before_k = np.concatenate([np.full((R, 1), baseline), after_k[:, :-1]], axis=1)
+        return {
+            "loss": mean[:R] - baseline,                      # (R,)  ≥ 0
+            "gain": np.maximum(before_k - after_k, 0.0),      # (R, slots)
+        }
+
+    # ── Optimisation ──────────────────────────────────────────────────────
+
+    def optimise(
+        self,
+        members: List[Dict[str, Any]],
+        projects: List[Dict[str, Any]],
+        slots_per_project: int = SLOTS_PER_PROJECT,
+    ) -> Dict[str, Any]:
+        """
+        `projects`: [{"project_id", "project_name", "risk_score", "context"}]
+        with `context` from TeamCompositionSimulator._get_project_context.
+        `members`: load_members() output.
+        """
+        t0 = time.time()
+        roles = list(ROLE_PROFILES)
+        role_index = {r: i for i, r in enumerate(roles)}
+        project_index = {p["project_id"]: j for j, p in enumerate(projects)}
+        P, K = len(projects), max(int(slots_per_project), 1)
+
+        seed = stable_seed(
+            [[p["project_id"], p["risk_score"], p["context"]] for p in projects], K, REALLOCATION_TRIALS,
+        )
+        u = samplers.uniform(np.random.default_rng(seed), REALLOCATION_TRIALS, 3 * K, self.team_sim.sampler)
+        priced = [self._price_project(p, K, u) for p in projects]
+        gain = np.stack([pr["gain"] for pr in priced], axis=1) if P else np.zeros((len(roles), 0, K))  # (R, P, K)
+        loss = np.stack([pr["loss"] for pr in priced], axis=1) if P else np.zeros((len(roles), 0))      # (R, P)
+
+        # Value of member i taking slot (j, k): target gain − source loss
+        r_idx = np.array([role_index[m["profile"]] for m in members], dtype=int)
+        src = np.array([project_index.get(m["project_id"], -1) for m in members], dtype=int)
+        value = gain[r_idx].reshape(len(members), P * K)
+        has_src = src >= 0
+        value[has_src] -= loss[r_idx[has_src], src[has_src]][:, None]
+        own = np.zeros_like(value, dtype=bool)
+        own[has_src] = (np.repeat(np.arange(P), K)[None, :] == src[has_src][:, None])
+        value[own] = 0.0
+        value = np.maximum(value, 0.0)  # Staying put is always worth 0
+
+        # Members with no profitable slot cannot change the optimum
+        rows = np.flatnonzero(value.max(axis=1, initial=0.0) > MIN_MOVE_GAIN)
+        cols = np.flatnonzero(value.max(axis=0, initial=0.0) > MIN_MOVE_GAIN) if len(rows) else np.array([], dtype=int)
+        moves = []
+        if len(rows) and len(cols):
+            sub = value[np.ix_(rows, cols)]
+            ri, ci = linear_sum_assignment(sub, maximize=True)
+            for a, b in zip(ri, ci):
+                if sub[a, b] > MIN_MOVE_GAIN:
+                    i, slot = rows[a], cols[b]
+                    moves.append((int(i), int(slot // K), float(sub[a, b])))
+
+        moves = self._respect_min_team_size(moves, members, src, projects)
+        return self._resimulate(moves, members, src, projects, time.time() - t0)
+
+    def _respect_min_team_size(self, moves, members, src, projects):
+        """Drop the weakest departures from projects that would fall below MIN_TEAM_SIZE."""
+        moves.sort(key=lambda m: m[2], reverse=True)
+        departures: Dict[int, int] = {}
+        kept = []
+        for i, j, v in moves:
+            s = src[i]
+            if s >= 0:
+                if projects[s]["context"]["team_size"] - departures.get(s, 0) - 1 < MIN_TEAM_SIZE:
+                    continue
+                departures[s] = departures.get(s, 0) + 1
+            kept.append((i, j, v))
+        return kept
+
+    def _resimulate(self, moves, members, src, projects, elapsed) -> Dict[str, Any]:
+        """Joint simulation of every affected project under the chosen moves."""
+        mutations: Dict[int, List[TeamMutation]] = {}
+        for i, j, _ in moves:
+            m = members[i]
+            if src[i] >= 0:
+                mutations.setdefault(int(src[i]), []).append(TeamMutation(
+                    "remove", m["profile"], projects[src[i]]["project_id"], m["name"],
+                ))
+        for i, j, _ in moves:
+            m = members[i]
+            mutations.setdefault(j, []).append(TeamMutation(
+                "transfer", m["profile"], projects[j]["project_id"], m["name"],
+                source_team=projects[src[i]]["project_id"] if src[i] >= 0 else None,
+            ))
+
+        per_project = []
+        after_total = 0.0
+        for j, p in enumerate(projects):
+            after = p["risk_score"]
+            if j in mutations:
+                scenario = TeamScenario("reallocation", p["project_id"], mutations[j])
+                result = self.team_sim.simulate_scenarios([scenario], p["risk_score"], p["context"])[0]
+                after = result.projected_risk
+                per_project.append({
+                    "project_id": p["project_id"],
+                    "project_name": p.get("project_name", ""),
+                    "risk_before": round(p["risk_score"], 3),
+                    "risk_after": round(after, 3),
+                    "team_size_after": result.team_size_after,
+                    "warnings": result.warnings,
+                })
+            after_total += after
+
+        before_total = sum(p["risk_score"] for p in projects)
+        return {
+            "moves": [
+                {
+                    "member_id": members[i]["member_id"],
+                    "name": members[i]["name"],
+                    "role": members[i]["role"],
+                    "profile": members[i]["profile"],
+                    "from_project": projects[src[i]]["project_id"] if src[i] >= 0 else None,
+                    "to_project": projects[j]["project_id"],
+                    "expected_net_gain": round(v, 3),
+                }
+                for i, j, v in moves
+            ],
+            "projects": per_project,
+            "portfolio_risk_before": round(before_total, 3),
+            "portfolio_risk_after": round(after_total, 3),
+            "members_considered": len(members),
+            "projects_considered": len(projects),
+            "solve_ms": round(elapsed * 1000, 1),
+        }
@@ -8,12 +8,17 @@ Mental model:
   LLM   = Explanation layer
   Human = Decision maker
 """
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 from ..core.models import AnalysisResult, AgentOpinion
 from .simulation import SimulationAgent
+from .team_simulator import project_team_context
 from .constraints import ConstraintAgent
 from ..core.neo4j_client import neo4j_client
+from ..core.model_router import model_router, TaskType
+from ..core.llm_scheduler import Priority
 from ..core.constants import (
     RISK_WEIGHTS,
     BLOCKER_CRITICAL_DAYS,
@@ -23,6 +28,32 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+HIGH_PRIORITY_BLOCKED_WEIGHT = 0.1  # Extra weight per blocked High-priority ticket
+
+
+def risk_score_from_counts(
+    blocked, blocked_high, overdue, near_deadline, total_active, weights=RISK_WEIGHTS,
+):
+    """
+    Risk score from signal counts. Works element-wise on NumPy arrays, so
+    weights or counts can be swept in one vectorised call.
+    """
+    raw = (
+        weights["blocked_dependency"] * blocked
+        + HIGH_PRIORITY_BLOCKED_WEIGHT * blocked_high
+        + weights["overdue_ticket"] * overdue
+        + weights["deadline_proximity"] * near_deadline
+    )
+    # Normalize: weight by ticket count so projects with many tickets
+    # aren't equally penalized as tiny projects with few tickets.
+    # Blend: 60% raw signal strength + 40% issue prevalence
+    issue_ratio = (blocked + overdue + near_deadline) / max(total_active, 1)
+    blended = raw * 0.6 + np.minimum(raw, 1.0) * issue_ratio * 0.4
+    if total_active > 0:
+        raw = np.where(raw > 0, blended, raw)
+    score = np.minimum(raw, 1.0)
+    return float(score) if np.ndim(score) == 0 else score
+
 
 class DeliveryRiskAgent:
     """
@@ -63,13 +94,14 @@ class DeliveryRiskAgent:
             "tickets": [dict(t) for t in rec["tickets"] if t.get("id")],
         }
 
-    def analyze(self, project_id: str) -> AnalysisResult:
+    def assess(self, project_id: str) -> Dict[str, Any]:
         """
-        Deterministic risk analysis from real Neo4j data.
+        Deterministic risk signals from real Neo4j data — no simulation, no LLM.
         Rules:
           - IF critical ticket AND blocked > 3 days AND due within 7 days → HIGH
           - IF tickets overdue but not blocked → MEDIUM
           - Else → LOW
+        Returns the risk score plus the contexts downstream agents reason on.
         """
         data = self._get_project_data(project_id)
         project = data.get("project", {})
@@ -77,7 +109,7 @@ class DeliveryRiskAgent:
         team_name = data.get("team_name", "Unknown")
 
         reasons: List[str] = []
-        risk_score = 0.0
+        blocked_high_priority = 0
         now = datetime.now()
         blocked_tickets: List[Dict] = []
         overdue_tickets: List[Dict] = []
@@ -103,12 +135,11 @@ class DeliveryRiskAgent:
                 reasons.append(
                     f"🔴 {tk_id} \"{tk_title}\" is blocked by {blocker_id} \"{blocker_title}\" (status: {blocker_status})"
                 )
-                risk_score += RISK_WEIGHTS["blocked_dependency"]
 
                 # Extra weight for high-priority blocked tickets
                 if priority == "High":
                     reasons.append(f"⚠️ Blocked ticket {tk_id} is HIGH priority")
-                    risk_score += 0.1
+                    blocked_high_priority += 1
 
             # ── Pattern 2: Deadline proximity ──
             if due_str:
@@ -122,7 +153,6 @@ class DeliveryRiskAgent:
                         reasons.append(
                             f"🕐 {tk_id} \"{tk_title}\" is {abs(days_left)} days OVERDUE (due: {due_str})"
                         )
-                        risk_score += RISK_WEIGHTS["overdue_ticket"]
 
                     elif days_left <= 7:
                         # Near deadline
@@ -130,23 +160,18 @@ class DeliveryRiskAgent:
                         reasons.append(
                             f"📅 {tk_id} \"{tk_title}\" due in {days_left} days (status: {status})"
                         )
-                        risk_score += RISK_WEIGHTS["deadline_proximity"]
                 except ValueError:
                     pass  # Skip malformed dates
 
-        # Normalize: weight by ticket count so projects with many tickets
-        # aren't equally penalized as tiny projects with few tickets
-        if total_active > 0 and risk_score > 0:
-            # Base normalization: scale raw risk by the ratio of flagged tickets
-            flagged_count = len(blocked_tickets) + len(overdue_tickets) + len(near_deadline_tickets)
-            issue_ratio = flagged_count / max(total_active, 1)
-            # Blend: 60% raw signal strength + 40% issue prevalence
-            risk_score = (risk_score * 0.6) + (min(risk_score, 1.0) * issue_ratio * 0.4)
-        risk_score = min(risk_score, 1.0)
+        total_active = len([t for t in tickets if t.get("status") != "Done"])
+
+        risk_score = risk_score_from_counts(
+            len(blocked_tickets), blocked_high_priority, len(overdue_tickets),
+            len(near_deadline_tickets), total_active,
+        )
         risk_level = get_risk_level(risk_score)
 
         # ── Compute real context for downstream agents ──
-        total_active = len([t for t in tickets if t.get("status") != "Done"])
         earliest_due = None
         for tk in tickets:
             if tk.get("status") != "Done" and tk.get("dueDate"):
@@ -175,6 +200,44 @@ class DeliveryRiskAgent:
             "team_capacity_percent": capacity_pct,
         }
 
+        return {
+            "project": project,
+            "team_name": team_name,
+            "reasons": reasons,
+            "risk_score": risk_score,
+            "risk_level": risk_level,
+            "blocked_tickets": blocked_tickets,
+            "blocked_high_priority": blocked_high_priority,
+            "overdue_tickets": overdue_tickets,
+            "near_deadline_tickets": near_deadline_tickets,
+            "total_active": total_active,
+            "days_to_deadline": days_to_deadline,
+            "sim_context": sim_context,
+            # Same snapshot in TeamCompositionSimulator's shape
+            "team_context": project_team_context(
+                project, [{**tk, "assignee": tk.get("assignee_name")} for tk in tickets]
+            ),
+        }
+
+    def _analysis(self, project_id: str) -> Tuple[AnalysisResult, Optional[str]]:
+        """
+        Deterministic part of aanalyze(): signals, agent opinions and the
+        decision comparison. Returns the result — primary_reason is the top
+        signal for now — and the LLM prompt, or None when nothing is at risk.
+        """
+        signals = self.assess(project_id)
+        project = signals["project"]
+        team_name = signals["team_name"]
+        reasons = signals["reasons"]
+        risk_score = signals["risk_score"]
+        risk_level = signals["risk_level"]
+        blocked_tickets = signals["blocked_tickets"]
+        overdue_tickets = signals["overdue_tickets"]
+        near_deadline_tickets = signals["near_deadline_tickets"]
+        total_active = signals["total_active"]
+        days_to_deadline = signals["days_to_deadline"]
+        sim_context = signals["sim_context"]
+
         # ── Agent opinions ──
         agent_opinions: List[AgentOpinion] = []
 
@@ -198,32 +261,35 @@ class DeliveryRiskAgent:
         agent_opinions.append(constraint_opinion)
 
         # 3. SimulationAgent opinion + decision comparison
+        # One Monte Carlo run per action, shared by both consumers so the
+        # comparison table and the legacy action list always agree.
+        mc_results = self.simulator.run_simulations(sim_context)
         decision_comparison, simulation_opinion = self.simulator.generate_decision_comparison(
-            risk_score, sim_context
+            risk_score, sim_context, mc_results
         )
         agent_opinions.append(simulation_opinion)
 
         # Legacy actions list
-        actions = self.simulator.simulate_interventions(risk_score, sim_context)
+        actions = self.simulator.simulate_interventions(risk_score, sim_context, mc_results)
 
-        # ── LLM Explanation (GenAI layer) ──
+        # ── LLM Explanation prompt (GenAI layer) ──
         primary_reason = "No significant risks detected — all tickets are on track."
+        prompt = None
         if reasons:
-            try:
-                from ..core.llm import llm_client
+            primary_reason = reasons[0]  # Fallback until the LLM explains it
 
-                agent_summary = "\n".join([
-                    f"- {op.agent}: {op.claim} (confidence: {op.confidence:.0%})"
-                    for op in agent_opinions
-                ])
+            agent_summary = "\n".join([
+                f"- {op.agent}: {op.claim} (confidence: {op.confidence:.0%})"
+                for op in agent_opinions
+            ])
 
-                decision_table = "\n".join([
-                    f"- {d.action}: risk_reduction={d.risk_reduction:.0%}, cost={d.cost}, "
-                    f"feasible={d.feasible}, recommended={d.recommended}"
-                    for d in decision_comparison
-                ])
+            decision_table = "\n".join([
+                f"- {d.action}: risk_reduction={d.risk_reduction:.0%}, cost={d.cost}, "
+                f"feasible={d.feasible}, recommended={d.recommended}"
+                for d in decision_comparison
+            ])
 
-                prompt = f"""
+            prompt = f"""
 Project: {project.get('name', project_id)} (Team: {team_name})
 Risk Score: {risk_score:.2f} ({risk_level})
 Days to earliest deadline: {days_to_deadline}
@@ -246,10 +312,6 @@ Task: Provide a 3-sentence analysis:
 3. CONTRAST the top two interventions from the Decision Comparison Table — explain which one is better and WHY (e.g. cost vs. risk-reduction trade-off).
 Do NOT introduce new facts. Only use the evidence above.
 """
-                primary_reason = llm_client.generate_reasoning(prompt)
-            except Exception as e:
-                logger.warning(f"LLM reasoning failed: {e}")
-                primary_reason = reasons[0] if reasons else "Analysis complete."
 
         return AnalysisResult(
             project_id=project_id,
@@ -261,4 +323,21 @@ Do NOT introduce new facts. Only use the evidence above.
             recommended_actions=actions,
             agent_opinions=agent_opinions,
             decision_comparison=decision_comparison,
-        )
+        ), prompt
+
+    async def aanalyze(self, project_id: str, priority: Optional[Priority] = None) -> AnalysisResult:
+        """
+        Full pipeline: deterministic signals → agent opinions → LLM explanation.
+        Neo4j reads and simulation run in a worker thread; the explanation
+        is awaited from the REASONING model, admitted by llm_scheduler at
+        `priority` (default: the task's).
+        """
+        result, prompt = await asyncio.to_thread(self._analysis, project_id)
+        if prompt is not None:
+            try:
+                result.primary_reason = await model_router.agenerate(
+                    TaskType.REASONING, [{"role": "user", "content": prompt}], priority=priority,
+                )
+            except Exception as e:
+                logger.warning(f"LLM reasoning failed: {e}")
+        return result
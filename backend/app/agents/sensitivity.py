@@ -0,0 +1,228 @@
+"""
+SensitivityAnalyzer — how much do recommendations depend on our assumptions?
+
+Perturbs every parameter in MC_DISTRIBUTIONS, ROLE_PROFILES and
+RISK_WEIGHTS across a relative grid and reports, per parameter, how far
+the key output moves and whether the ranking flips — the data behind a
+tornado chart.
+
+All perturbations of a parameter family are evaluated as batched
+simulations: parameters become a (scenarios × …) array broadcast against
+a single set of common random draws, SCENARIO_CHUNK scenarios at a time
+so memory stays bounded while the sweep still costs a few array
+operations instead of thousands of separate simulations.
+"""
+
+import copy
+import logging
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from ..core.constants import RISK_WEIGHTS, get_risk_level
+from . import samplers
+from .risk import risk_score_from_counts
+from .simulation import SimulationAgent, MC_DISTRIBUTIONS, POSSIBLE_ACTIONS, stable_seed
+from .team_simulator import TeamCompositionSimulator, ROLE_PROFILES, add_trials
+
+logger = logging.getLogger(__name__)
+
+SENSITIVITY_GRID = (-0.2, -0.1, 0.1, 0.2)  # Relative perturbations of each parameter
+SENSITIVITY_TRIALS = 20_000
+MAX_SENSITIVITY_TRIALS = 20_000
+SCENARIO_CHUNK = 8  # Scenarios evaluated per batch — bounds peak memory to chunk × columns × trials
+
+MC_FIELDS = ("rr_mean", "rr_std", "cp_mean", "cp_std")
+ROLE_FIELDS = ("velocity_boost", "ramp_up_days", "blocked_resolution")
+
+
+def _summarise(
+    names: List[Tuple[str, str]],
+    grid: Tuple[float, ...],
+    metric: np.ndarray,
+    columns: List[int],
+    rankings: np.ndarray,
+    labels: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Row 0 of metric (scenarios × K) and rankings is the baseline, then
+    len(grid) rows per parameter in `names` order; columns[i] picks the
+    metric column parameter i is judged on. Returns rows sorted by swing.
+    """
+    G = len(grid)
+    rows = []
+    for i, (group, field) in enumerate(names):
+        block = slice(1 + i * G, 1 + (i + 1) * G)
+        values = metric[block, columns[i]]
+        ranks = rankings[block]
+        rows.append({
+            "parameter": f"{group}.{field}",
+            "baseline": round(float(metric[0, columns[i]]), 4),
+            "low": round(float(values.min()), 4),
+            "high": round(float(values.max()), 4),
+            "swing": round(float(values.max() - values.min()), 4),
+            "by_perturbation": {
+                f"{g:+.0%}": round(float(v), 4) for g, v in zip(grid, values)
+            },
+            "ranking_changes": int((ranks != rankings[0]).any(axis=1).sum()),
+            "top_choices": sorted({labels[r[0]] for r in ranks}),
+        })
+    rows.sort(key=lambda r: r["swing"], reverse=True)
+    return rows
+
+
+class SensitivityAnalyzer:
+    """Batched one-at-a-time sensitivity analysis over simulation assumptions."""
+
+    def __init__(self, sim_agent: SimulationAgent, team_sim: TeamCompositionSimulator):
+        self.sim_agent = sim_agent
+        self.team_sim = team_sim
+
+    # ── MC_DISTRIBUTIONS → intervention ranking ──────────────────────────
+
+    def _interventions(self, risk_score, sim_context, grid, n_trials, rng) -> Dict[str, Any]:
+        names = [(a, f) for a in POSSIBLE_ACTIONS for f in MC_FIELDS]
+        scenarios = [MC_DISTRIBUTIONS]
+        for action, field in names:
+            for g in grid:
+                dist = copy.deepcopy(MC_DISTRIBUTIONS)
+                dist[action][field] *= 1.0 + g
+                scenarios.append(dist)
+
+        # (scenarios, actions, 4) → one broadcast against shared draws
+        params = np.array([
+            [self.sim_agent._action_params(a, sim_context, dist) for a in POSSIBLE_ACTIONS]
+            for dist in scenarios
+        ])
+        z = samplers.normal(rng, n_trials, 2, self.sim_agent.sampler)
+        mean_rr = np.empty(params.shape[:2])
+        mean_cp = np.empty(params.shape[:2])
+        prob_positive = np.empty(params.shape[:2])
+        for start in range(0, len(params), SCENARIO_CHUNK):
+            block = params[start:start + SCENARIO_CHUNK]
+            rr = np.clip(block[..., 0:1] + block[..., 1:2] * z[:, 0], 0.0, 1.0)
+            cp = np.clip(block[..., 2:3] + block[..., 3:4] * z[:, 1], 0.0, 1.0)
+            rows = slice(start, start + len(block))
+            mean_rr[rows] = rr.mean(axis=-1)
+            mean_cp[rows] = cp.mean(axis=-1)
+            prob_positive[rows] = ((rr - cp) > 0.05).mean(axis=-1)
+
+        constraints = [
+            self.sim_agent.constraint_agent.evaluate_intervention(a, sim_context)
+            for a in POSSIBLE_ACTIONS
+        ]
+        feasible = np.array([c["feasible"] for c in constraints])
+        penalty = np.array([c["penalty"] for c in constraints])
+        net = mean_rr - mean_cp - penalty
+        recommended = feasible & (net > 0.05) & (prob_positive > 0.5)
+
+        # Same ordering as generate_decision_comparison: recommended first, then rr
+        rankings = np.argsort(-(recommended * 10.0 + mean_rr), axis=1, kind="stable")
+        top_rr = np.take_along_axis(mean_rr, rankings[:, :1], axis=1)[:, 0]
+
+        labels = [a.replace("_", " ").title() for a in POSSIBLE_ACTIONS]
+        return {
+            "metric": "risk reduction of top-ranked intervention",
+            "baseline_ranking": [labels[i] for i in rankings[0]],
+            "expected_risk_after": round(float(risk_score * (1.0 - top_rr[0])), 4),
+            "parameters": _summarise(names, grid, top_rr[:, None], [0] * len(names), rankings, labels),
+            "_top_rr": float(top_rr[0]),
+        }
+
+    # ── ROLE_PROFILES → team addition ranking ────────────────────────────
+
+    def _roles(self, team_context, baseline_risk, grid, n_trials, rng) -> Dict[str, Any]:
+        roles = list(ROLE_PROFILES)
+        base = {f: np.array([ROLE_PROFILES[r][f] for r in roles], dtype=float) for f in ROLE_FIELDS}
+        names = [(r, f) for r in roles for f in ROLE_FIELDS]
+
+        scenario_params = {f: [base[f]] for f in ROLE_FIELDS}
+        for role, field in names:
+            k = roles.index(role)
+            for g in grid:
+                for f in ROLE_FIELDS:
+                    values = base[f].copy()
+                    if f == field:
+                        values[k] *= 1.0 + g
+                    scenario_params[f].append(values)
+
+        # (scenarios, roles, 1) parameters × (N, 3) uniforms → (scenarios, roles, N)
+        stacked = {f: np.array(v)[..., None] for f, v in scenario_params.items()}
+        u = samplers.uniform(rng, n_trials, 3, self.team_sim.sampler)
+        S = len(stacked["velocity_boost"])
+        delta = np.empty((S, len(roles)))
+        for start in range(0, S, SCENARIO_CHUNK):
+            block = slice(start, start + SCENARIO_CHUNK)
+            projected, _ = add_trials(
+                stacked["velocity_boost"][block], stacked["ramp_up_days"][block],
+                stacked["blocked_resolution"][block], team_context, baseline_risk, u,
+            )
+            delta[block] = projected.mean(axis=-1) - baseline_risk
+        rankings = np.argsort(delta, axis=1, kind="stable")
+
+        # Each parameter is judged on the delta of the role it belongs to
+        columns = [roles.index(role) for role, _ in names]
+        rows = _summarise(names, grid, delta, columns, rankings, roles)
+
+        return {
+            "metric": "risk delta of adding the role",
+            "baseline_ranking": [roles[i] for i in rankings[0]],
+            "parameters": rows,
+        }
+
+    # ── RISK_WEIGHTS → baseline risk score ───────────────────────────────
+
+    def _risk_weights(self, signals, grid, top_rr) -> Dict[str, Any]:
+        names = [("RISK_WEIGHTS", k) for k in RISK_WEIGHTS]
+        weights = {k: [v] for k, v in RISK_WEIGHTS.items()}
+        for _, key in names:
+            for g in grid:
+                for k, v in RISK_WEIGHTS.items():
+                    weights[k].append(v * (1.0 + g) if k == key else v)
+        weights = {k: np.array(v) for k, v in weights.items()}
+
+        scores = risk_score_from_counts(
+            len(signals["blocked_tickets"]), signals["blocked_high_priority"],
+            len(signals["overdue_tickets"]), len(signals["near_deadline_tickets"]),
+            signals["total_active"], weights,
+        )
+        scores = np.broadcast_to(scores, weights["blocked_dependency"].shape)
+        levels = np.array([["LOW", "MEDIUM", "HIGH"].index(get_risk_level(s)) for s in scores])[:, None]
+
+        rows = _summarise(names, grid, scores[:, None], [0] * len(names), levels, ["LOW", "MEDIUM", "HIGH"])
+        for r in rows:
+            r["expected_risk_after_low"] = round(r["low"] * (1.0 - top_rr), 4)
+            r["expected_risk_after_high"] = round(r["high"] * (1.0 - top_rr), 4)
+        return {
+            "metric": "baseline risk score",
+            "baseline_level": get_risk_level(float(scores[0])),
+            "parameters": rows,
+        }
+
+    # ── Entry point ───────────────────────────────────────────────────────
+
+    def analyze(
+        self,
+        signals: Dict[str, Any],
+        team_context: Dict[str, Any],
+        grid: Tuple[float, ...] = SENSITIVITY_GRID,
+        n_trials: int = SENSITIVITY_TRIALS,
+    ) -> Dict[str, Any]:
+        """
+        `signals` is DeliveryRiskAgent.assess() output; `team_context` is
+        the TeamCompositionSimulator project context.
+        """
+        risk_score = signals["risk_score"]
+        seed = stable_seed(signals["sim_context"], team_context, risk_score, grid, n_trials)
+        rng = np.random.default_rng(seed)
+
+        interventions = self._interventions(risk_score, signals["sim_context"], grid, n_trials, rng)
+        top_rr = interventions.pop("_top_rr")
+        return {
+            "risk_score": round(risk_score, 4),
+            "grid": list(grid),
+            "n_trials": n_trials,
+            "interventions": interventions,
+            "roles": self._roles(team_context, risk_score, grid, n_trials, rng),
+            "risk_weights": self._risk_weights(signals, grid, top_rr),
+        }
@@ -1,5 +1,10 @@
-import random
-from typing import List, Dict, Any, Tuple
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from . import samplers
 from .constraints import ConstraintAgent
 from ..core.models import AnalysisResult, AgentOpinion, DecisionComparison
 from ..core.constants import INTERVENTION_IMPACTS
@@ -13,7 +18,148 @@ MC_DISTRIBUTIONS = {
     "ACCEPT_DELAY":          {"rr_mean": 0.00, "rr_std": 0.02, "cp_mean": 0.00, "cp_std": 0.01},
 }
 
-N_SIMULATIONS = 200  # Number of Monte Carlo trials per action
+N_SIMULATIONS = 100_000  # Maximum Monte Carlo trials per action
+
+# Sequential stopping rule: trials are drawn in batches until the 95%
+# confidence half-width on both estimates falls below its tolerance.
+MC_BATCH_SIZE = 2_000
+MC_RR_TOLERANCE = 0.005    # Half-width on mean risk reduction
+MC_PROB_TOLERANCE = 0.01   # Half-width on probability of positive outcome
+Z_95 = 1.96
+
+MC_SAMPLER = "antithetic"  # See samplers.SAMPLERS
+
+# Pairwise interaction multipliers on combined risk reduction (≤ 1.0:
+# overlapping interventions deliver less together than apart)
+INTERVENTION_INTERACTIONS = {
+    frozenset({"ADD_ENGINEER", "REDUCE_SCOPE"}): 0.85,        # Less scope → extra hands matter less
+    frozenset({"ESCALATE_DEPENDENCY", "REDUCE_SCOPE"}): 0.90,  # Cut scope may drop the blocked work
+    frozenset({"ADD_ENGINEER", "ACCEPT_DELAY"}): 0.90,         # Extra time already absorbs ramp-up
+}
+MAX_COMBINED_COST = 0.5  # Default cap on total cost penalty for a combination
+
+SIM_CACHE_SIZE = 256  # Memoised simulation results kept per engine
+SIM_CACHE_BYTES = 64 * 2**20  # Sample arrays held per engine's cache
+
+POSSIBLE_ACTIONS = [
+    "ADD_ENGINEER",
+    "ESCALATE_DEPENDENCY",
+    "REDUCE_SCOPE",
+    "ACCEPT_DELAY",
+]
+
+
+def stable_seed(*parts: Any) -> int:
+    """
+    Deterministic 64-bit seed from a hash of the simulation inputs.
+    Same context + same configuration → same RNG stream → same result.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return int.from_bytes(hashlib.sha256(payload.encode()).digest()[:8], "big")
+
+
+def as_date(value: Any) -> Optional[date]:
+    """
+    Calendar date of a graph date property: a "YYYY-MM-DD" string or a
+    Neo4j Date/DateTime (converted with to_native()). None when missing
+    or unparseable.
+    """
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    return None
+
+
+class SimulationCache:
+    """
+    Bounded LRU memo of simulation results, keyed by stable_seed().
+    Bounded by entry count and by the bytes of the NumPy arrays the
+    results hold (raw trial samples dominate); a result larger than the
+    whole byte budget is not kept.
+    """
+
+    def __init__(self, max_entries: int = SIM_CACHE_SIZE, max_bytes: int = SIM_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[int, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: int) -> Optional[Any]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def set(self, key: int, value: Any):
+        size = _array_bytes(value)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            self.nbytes -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+def _array_bytes(value: Any) -> int:
+    """Bytes of the NumPy arrays reachable through containers and __slots__ objects."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_array_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_array_bytes(v) for v in value)
+    slots = getattr(type(value), "__slots__", None)
+    if slots and not isinstance(value, (str, bytes)):
+        return sum(_array_bytes(getattr(value, k, None)) for k in slots)
+    return 0
+
+
+def _cost_label(total_penalty: float) -> str:
+    if total_penalty < 0.15:
+        return "Low"
+    elif total_penalty < 0.3:
+        return "Medium"
+    return "High"
+
+
+class MonteCarloResult:
+    """
+    Simulated outcome of one action in one context.
+    Keeps the raw trial samples so every consumer of an analysis
+    reads the same draws instead of re-simulating.
+    """
+    __slots__ = (
+        "action", "rr_samples", "cp_samples",
+        "mean_rr", "p5_rr", "p95_rr", "mean_cp", "prob_positive", "n_trials",
+    )
+
+    def __init__(self, action: str, rr_samples: np.ndarray, cp_samples: np.ndarray):
+        self.action = action
+        self.rr_samples = rr_samples
+        self.cp_samples = cp_samples
+        self.n_trials = len(rr_samples)
+        self.mean_rr = float(rr_samples.mean())
+        self.p5_rr, self.p95_rr = (float(q) for q in np.quantile(rr_samples, [0.05, 0.95]))
+        self.mean_cp = float(cp_samples.mean())
+        self.prob_positive = float(((rr_samples - cp_samples) > 0.05).mean())
+
+    @property
+    def net_samples(self) -> np.ndarray:
+        return self.rr_samples - self.cp_samples
 
 
 class SimulationAgent:
@@ -23,15 +169,39 @@ class SimulationAgent:
     expected risk reduction, 95th-percentile bounds, and
     probability of positive net benefit.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        rr_tolerance: float = MC_RR_TOLERANCE,
+        prob_tolerance: float = MC_PROB_TOLERANCE,
+        max_trials: int = N_SIMULATIONS,
+        batch_size: int = MC_BATCH_SIZE,
+        sampler: str = MC_SAMPLER,
+    ):
+        if sampler not in samplers.SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}'. Available: {list(samplers.SAMPLERS)}")
         self.constraint_agent = ConstraintAgent()
+        self._cache = SimulationCache()
+        self.rr_tolerance = rr_tolerance
+        self.prob_tolerance = prob_tolerance
+        self.max_trials = max_trials
+        self.batch_size = batch_size
+        self.sampler = sampler
 
-    def _monte_carlo(self, action: str, context: Dict[str, Any]) -> Dict[str, float]:
-        """
-        Run N_SIMULATIONS trials for one action.
-        Returns: mean_rr, p5_rr, p95_rr, mean_cp, prob_positive
-        """
-        dist = MC_DISTRIBUTIONS.get(action, {"rr_mean": 0, "rr_std": 0.05, "cp_mean": 0, "cp_std": 0.02})
+    def _converged(self, rr: np.ndarray, net: np.ndarray) -> bool:
+        """True once the 95% half-widths — mean (sampler-aware) and probability (Wilson) — are within tolerance."""
+        rr_half_width = samplers.half_width(rr, self.sampler, Z_95)
+        prob_half_width = samplers.proportion_half_width(net > 0.05, Z_95)
+        return rr_half_width <= self.rr_tolerance and prob_half_width <= self.prob_tolerance
+
+    def _action_params(
+        self,
+        action: str,
+        context: Dict[str, Any],
+        distributions: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> Tuple[float, float, float, float]:
+        """Distribution parameters for one action, with context-specific boosts applied."""
+        distributions = distributions or MC_DISTRIBUTIONS
+        dist = distributions.get(action, {"rr_mean": 0, "rr_std": 0.05, "cp_mean": 0, "cp_std": 0.02})
         rr_mean = dist["rr_mean"]
         rr_std = dist["rr_std"]
         cp_mean = dist["cp_mean"]
@@ -45,52 +215,95 @@ class SimulationAgent:
             rr_mean *= 0.5  # Adding engineers late is less effective
             cp_mean *= 1.5
 
-        rr_samples = []
-        cp_samples = []
-        net_samples = []
+        return rr_mean, rr_std, cp_mean, cp_std
 
-        for _ in range(N_SIMULATIONS):
-            rr = max(0.0, min(1.0, random.gauss(rr_mean, rr_std)))
-            cp = max(0.0, min(1.0, random.gauss(cp_mean, cp_std)))
-            rr_samples.append(rr)
-            cp_samples.append(cp)
-            net_samples.append(rr - cp)
+    def run_simulations(
+        self, context: Dict[str, Any], actions: Optional[List[str]] = None
+    ) -> Dict[str, MonteCarloResult]:
+        """
+        Vectorised engine: simulates every action once for this context.
+        All actions share the same standard-normal draws (common random
+        numbers), so differences between actions reflect their parameters
+        rather than sampling noise.
 
-        rr_samples.sort()
-        net_samples.sort()
+        Trials are drawn in batches until each action's confidence
+        intervals are within tolerance (or max_trials is reached), so
+        near-deterministic actions stop early and noisy ones run longer.
+        Actions that stop early have consumed a prefix of the shared stream.
 
-        return {
-            "mean_rr": sum(rr_samples) / N_SIMULATIONS,
-            "p5_rr": rr_samples[int(N_SIMULATIONS * 0.05)],
-            "p95_rr": rr_samples[int(N_SIMULATIONS * 0.95)],
-            "mean_cp": sum(cp_samples) / N_SIMULATIONS,
-            "prob_positive": sum(1 for n in net_samples if n > 0.05) / N_SIMULATIONS,
+        The RNG is seeded from the context and configuration, and results
+        are memoised on that seed: unchanged inputs return the identical
+        result without re-simulating.
+        Returns: {action: MonteCarloResult}
+        """
+        actions = actions or POSSIBLE_ACTIONS
+        seed = stable_seed(
+            context, actions, MC_DISTRIBUTIONS,
+            self.max_trials, self.batch_size, self.rr_tolerance, self.prob_tolerance,
+            self.sampler,
+        )
+        cached = self._cache.get(seed)
+        if cached is not None:
+            return cached
+
+        params = np.array([self._action_params(a, context) for a in actions])
+        rr_mean, rr_std, cp_mean, cp_std = (params[:, i:i + 1] for i in range(4))
+
+        rng = np.random.default_rng(seed)
+        rr_batches: List[List[np.ndarray]] = [[] for _ in actions]
+        cp_batches: List[List[np.ndarray]] = [[] for _ in actions]
+        active = np.ones(len(actions), dtype=bool)
+        n_drawn = 0
+
+        while active.any() and n_drawn < self.max_trials:
+            size = min(self.batch_size, self.max_trials - n_drawn)
+            z_rr, z_cp = samplers.normal(rng, size, 2, self.sampler).T
+            rr = np.clip(rr_mean + rr_std * z_rr, 0.0, 1.0)
+            cp = np.clip(cp_mean + cp_std * z_cp, 0.0, 1.0)
+            n_drawn += size
+
+            for i in np.flatnonzero(active):
+                rr_batches[i].append(rr[i])
+                cp_batches[i].append(cp[i])
+                rr_i = np.concatenate(rr_batches[i])
+                cp_i = np.concatenate(cp_batches[i])
+                rr_batches[i], cp_batches[i] = [rr_i], [cp_i]
+                if self._converged(rr_i, rr_i - cp_i):
+                    active[i] = False
+
+        results = {
+            action: MonteCarloResult(action, rr_batches[i][0], cp_batches[i][0])
+            for i, action in enumerate(actions)
         }
+        self._cache.set(seed, results)
+        return results
 
-    def simulate_interventions(self, risk_score: float, context: Dict[str, Any]) -> List[str]:
+    def simulate_interventions(
+        self,
+        risk_score: float,
+        context: Dict[str, Any],
+        mc_results: Optional[Dict[str, MonteCarloResult]] = None,
+    ) -> List[str]:
         """
         Returns a ranked list of recommended actions using Monte Carlo.
+        Pass `mc_results` from run_simulations() to reuse an existing run.
         """
-        possible_actions = [
-            "ADD_ENGINEER",
-            "ESCALATE_DEPENDENCY",
-            "REDUCE_SCOPE",
-            "ACCEPT_DELAY"
-        ]
+        if mc_results is None:
+            mc_results = self.run_simulations(context)
 
         recommendations = []
 
-        for action in possible_actions:
+        for action in POSSIBLE_ACTIONS:
             constraint_result = self.constraint_agent.evaluate_intervention(action, context)
             if not constraint_result["feasible"]:
                 continue
 
-            mc = self._monte_carlo(action, context)
-            net_benefit = mc["mean_rr"] - mc["mean_cp"] - constraint_result["penalty"]
+            mc = mc_results[action]
+            net_benefit = mc.mean_rr - mc.mean_cp - constraint_result["penalty"]
 
-            if net_benefit > 0.05 and mc["prob_positive"] > 0.5:
+            if net_benefit > 0.05 and mc.prob_positive > 0.5:
                 msg = action.replace("_", " ").title()
-                msg += f" (risk ↓{mc['mean_rr']:.0%}, {mc['prob_positive']:.0%} chance of positive outcome)"
+                msg += f" (risk ↓{mc.mean_rr:.0%}, {mc.prob_positive:.0%} chance of positive outcome)"
                 if constraint_result.get("reason") and constraint_result["penalty"] > 0:
                     msg += f" — Note: {constraint_result['reason']}"
                 recommendations.append((net_benefit, msg))
@@ -99,68 +312,64 @@ class SimulationAgent:
         return [r[1] for r in recommendations]
 
     def generate_decision_comparison(
-        self, risk_score: float, context: Dict[str, Any]
+        self,
+        risk_score: float,
+        context: Dict[str, Any],
+        mc_results: Optional[Dict[str, MonteCarloResult]] = None,
     ) -> Tuple[List[DecisionComparison], AgentOpinion]:
         """
         Returns structured comparison with Monte Carlo stats + agent opinion.
+        Pass `mc_results` from run_simulations() to reuse an existing run.
         """
-        possible_actions = [
-            "ADD_ENGINEER",
-            "ESCALATE_DEPENDENCY",
-            "REDUCE_SCOPE",
-            "ACCEPT_DELAY"
-        ]
+        if mc_results is None:
+            mc_results = self.run_simulations(context)
 
         comparisons = []
         evidence = []
 
-        for action in possible_actions:
+        for action in POSSIBLE_ACTIONS:
             constraint_result = self.constraint_agent.evaluate_intervention(action, context)
-            mc = self._monte_carlo(action, context)
+            mc = mc_results[action]
 
-            total_penalty = mc["mean_cp"] + constraint_result["penalty"]
-            net_benefit = mc["mean_rr"] - total_penalty
+            total_penalty = mc.mean_cp + constraint_result["penalty"]
+            net_benefit = mc.mean_rr - total_penalty
 
-            if total_penalty < 0.15:
-                cost = "Low"
-            elif total_penalty < 0.3:
-                cost = "Medium"
-            else:
-                cost = "High"
+            cost = _cost_label(total_penalty)
 
             recommended = (
                 constraint_result["feasible"]
                 and net_benefit > 0.05
-                and mc["prob_positive"] > 0.5
+                and mc.prob_positive > 0.5
             )
 
             if not constraint_result["feasible"]:
                 reason = constraint_result["reason"]
             elif recommended:
                 reason = (
-                    f"Monte Carlo: {mc['mean_rr']:.0%} avg risk reduction "
-                    f"(95% CI: {mc['p5_rr']:.0%}–{mc['p95_rr']:.0%}), "
-                    f"{mc['prob_positive']:.0%} chance of net positive"
+                    f"Monte Carlo: {mc.mean_rr:.0%} avg risk reduction "
+                    f"(95% CI: {mc.p5_rr:.0%}–{mc.p95_rr:.0%}), "
+                    f"{mc.prob_positive:.0%} chance of net positive"
                 )
             else:
                 reason = (
                     f"Low expected benefit ({net_benefit:.2f}), "
-                    f"only {mc['prob_positive']:.0%} chance of positive outcome"
+                    f"only {mc.prob_positive:.0%} chance of positive outcome"
                 )
 
             comparisons.append(DecisionComparison(
                 action=action.replace("_", " ").title(),
-                risk_reduction=round(mc["mean_rr"], 3),
+                risk_reduction=round(mc.mean_rr, 3),
                 cost=cost,
                 feasible=constraint_result["feasible"],
                 recommended=recommended,
                 reason=reason,
+                n_trials=mc.n_trials,
             ))
 
             if recommended:
                 evidence.append(
                     f"{action.replace('_', ' ').title()}: "
-                    f"{mc['mean_rr']:.0%} ↓risk ({mc['prob_positive']:.0%} confidence)"
+                    f"{mc.mean_rr:.0%} ↓risk ({mc.prob_positive:.0%} confidence)"
                 )
 
         comparisons.sort(key=lambda x: (x.recommended, x.risk_reduction), reverse=True)
@@ -187,3 +396,122 @@ class SimulationAgent:
         )
 
         return comparisons, opinion
+
+    # ── Combinatorial search ──────────────────────────────────────────────
+
+    def search_combinations(
+        self,
+        risk_score: float,
+        context: Dict[str, Any],
+        max_cost: float = MAX_COMBINED_COST,
+        mc_results: Optional[Dict[str, MonteCarloResult]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Branch-and-bound search over combinations of feasible actions.
+
+        A combination's risk reduction is 1 − Π(1 − rr_i) per trial, scaled
+        by INTERVENTION_INTERACTIONS for every pair it contains; its cost is
+        the sum of simulated cost penalties plus constraint penalties.
+
+        Pruning uses the individual action results: costs only grow as
+        actions are added, and because all actions share common random
+        numbers, 1 − Π(1 − mean_rr_i) bounds the mean reduction of any
+        superset. A branch is cut when it exceeds max_cost or when an
+        already-found combination beats its bound at no greater cost.
+
+        Returns the Pareto frontier (risk reduction vs cost), ranked by
+        net benefit, plus search statistics.
+        """
+        if mc_results is None:
+            mc_results = self.run_simulations(context)
+
+        penalties = {}
+        for action in POSSIBLE_ACTIONS:
+            constraint_result = self.constraint_agent.evaluate_intervention(action, context)
+            if constraint_result["feasible"]:
+                penalties[action] = constraint_result["penalty"]
+
+        # Highest individual payoff first → good incumbents early → more pruning
+        actions = sorted(penalties, key=lambda a: mc_results[a].mean_rr, reverse=True)
+        cost = {a: mc_results[a].mean_cp + penalties[a] for a in actions}
+        keep = {a: 1.0 - mc_results[a].mean_rr for a in actions}  # Share of risk left
+
+        frontier: List[Dict[str, Any]] = []
+        stats = {"evaluated": 0, "pruned": 0}
+
+        def evaluate(combo: Tuple[str, ...]) -> Dict[str, Any]:
+            n = min(mc_results[a].n_trials for a in combo)  # Shared CRN prefix
+            remaining = np.ones(n)
+            cp = np.zeros(n)
+            for a in combo:
+                remaining *= 1.0 - mc_results[a].rr_samples[:n]
+                cp += mc_results[a].cp_samples[:n]
+            interaction = 1.0
+            for i, a in enumerate(combo):
+                for b in combo[i + 1:]:
+                    interaction *= INTERVENTION_INTERACTIONS.get(frozenset({a, b}), 1.0)
+            rr = (1.0 - remaining) * interaction
+            total_cost = float(cp.mean()) + sum(penalties[a] for a in combo)
+            net = rr - cp - sum(penalties[a] for a in combo)
+            stats["evaluated"] += 1
+            return {
+                "actions": list(combo),
+                "risk_reduction": float(rr.mean()),
+                "cost_penalty": total_cost,
+                "net_benefit": float(rr.mean()) - total_cost,
+                "prob_positive": float((net > 0.05).mean()),
+                "n_trials": n,
+            }
+
+        def dominated(rr_bound: float, cost_floor: float) -> bool:
+            return any(
+                f["risk_reduction"] >= rr_bound and f["cost_penalty"] <= cost_floor
+                for f in frontier
+            )
+
+        def add_to_frontier(candidate: Dict[str, Any]):
+            if dominated(candidate["risk_reduction"], candidate["cost_penalty"]):
+                return
+            frontier[:] = [
+                f for f in frontier
+                if not (candidate["risk_reduction"] >= f["risk_reduction"]
+                        and candidate["cost_penalty"] <= f["cost_penalty"])
+            ]
+            frontier.append(candidate)
+
+        def branch(start: int, combo: Tuple[str, ...], combo_cost: float, combo_keep: float):
+            for j in range(start, len(actions)):
+                action = actions[j]
+                new_cost = combo_cost + cost[action]
+                if new_cost > max_cost:
+                    stats["pruned"] += 1
+                    continue
+                new_combo = combo + (action,)
+                # Best any extension of new_combo could reach
+                bound_keep = combo_keep * keep[action]
+                for a in actions[j + 1:]:
+                    bound_keep *= keep[a]
+                if dominated(1.0 - bound_keep, new_cost):
+                    stats["pruned"] += 1
+                    continue
+                add_to_frontier(evaluate(new_combo))
+                branch(j + 1, new_combo, new_cost, combo_keep * keep[action])
+
+        branch(0, (), 0.0, 1.0)
+
+        frontier.sort(key=lambda f: f["net_benefit"], reverse=True)
+        for f in frontier:
+            f["label"] = " + ".join(a.replace("_", " ").title() for a in f["actions"])
+            f["cost"] = _cost_label(f["cost_penalty"])
+            f["projected_risk"] = round(risk_score * (1.0 - f["risk_reduction"]), 3)
+            f["risk_reduction"] = round(f["risk_reduction"], 3)
+            f["cost_penalty"] = round(f["cost_penalty"], 3)
+            f["net_benefit"] = round(f["net_benefit"], 3)
+            f["prob_positive"] = round(f["prob_positive"], 3)
+
+        return {
+            "frontier": frontier,
+            "max_cost": max_cost,
+            "evaluated": stats["evaluated"],
+            "pruned": stats["pruned"],
+        }
@@ -8,16 +8,29 @@ Uses Monte Carlo simulation on modified team compositions to
 predict risk impact of team changes before they happen.
 """
 
-import random
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+import numpy as np
+from scipy.special import ndtri
 from ..core.neo4j_client import neo4j_client
 from ..core.context_manager import context_assembler
-from .simulation import SimulationAgent, MC_DISTRIBUTIONS, N_SIMULATIONS
+from . import samplers
+from .simulation import SimulationAgent, SimulationCache, MC_DISTRIBUTIONS, as_date, stable_seed
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+N_SIMULATIONS = 20_000  # Trials per mutation
+TEAM_SAMPLER = "sobol"  # See samplers.SAMPLERS
+
+SCENARIO_TRIALS = 20_000      # Trials per batch of compound scenarios
+MAX_SCENARIO_STEPS = 10       # Mutations per scenario
+ONBOARDING_OVERLAP = 0.25     # Extra ramp-up per newcomer already onboarding
+
+SWEEP_TRIALS = 2_000          # Trials per cell of a what-if sweep grid
+MAX_SWEEP_CELLS = 2_500       # days × team sizes per role in one sweep
+SWEEP_HELP_THRESHOLD = 0.05   # Risk reduction that counts as "still helps"
+
 
 # ── Role effectiveness profiles ───────────────────────────────────────────
 
@@ -83,7 +96,7 @@ class TeamMutation:
 class SimulationResult:
     """Result of a team composition simulation."""
     __slots__ = (
-        "mutation", "baseline_risk", "projected_risk",
+        "mutation", "baseline_risk", "projected_risk", "p10_risk", "p90_risk",
         "risk_delta", "cost_delta", "velocity_change",
         "confidence", "reasoning", "feasible", "warning",
     )
@@ -102,6 +115,8 @@ class SimulationResult:
             },
             "baseline_risk": round(self.baseline_risk, 3),
             "projected_risk": round(self.projected_risk, 3),
+            "projected_risk_p10": round(self.p10_risk, 3),
+            "projected_risk_p90": round(self.p90_risk, 3),
             "risk_delta": round(self.risk_delta, 3),
             "cost_delta": round(self.cost_delta, 2),
             "velocity_change": round(self.velocity_change, 3),
@@ -112,169 +127,351 @@ class SimulationResult:
         }
 
 
+class TeamScenario:
+    """An ordered list of team changes to one project, simulated jointly."""
+    __slots__ = ("name", "project_id", "mutations")
+
+    def __init__(self, name: str, project_id: str, mutations: List[TeamMutation]):
+        self.name = name
+        self.project_id = project_id
+        self.mutations = mutations
+
+
+class ScenarioResult:
+    """Result of a joint simulation of one compound scenario."""
+    __slots__ = (
+        "scenario", "baseline_risk", "projected_risk", "p10_risk", "p90_risk",
+        "risk_delta", "cost_delta", "velocity_change", "team_size_after",
+        "confidence", "feasible", "warnings",
+    )
+
+    def __init__(self, **kwargs):
+        for k in self.__slots__:
+            setattr(self, k, kwargs.get(k))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.scenario.name,
+            "project_id": self.scenario.project_id,
+            "mutations": [
+                {"action": m.action, "role": m.role, "member_name": m.member_name}
+                for m in self.scenario.mutations
+            ],
+            "baseline_risk": round(self.baseline_risk, 3),
+            "projected_risk": round(self.projected_risk, 3),
+            "projected_risk_p10": round(self.p10_risk, 3),
+            "projected_risk_p90": round(self.p90_risk, 3),
+            "risk_delta": round(self.risk_delta, 3),
+            "cost_delta": round(self.cost_delta, 2),
+            "velocity_change": round(self.velocity_change, 3),
+            "team_size_after": self.team_size_after,
+            "confidence": round(self.confidence, 2),
+            "feasible": self.feasible,
+            "warnings": self.warnings,
+        }
+
+
+def project_team_context(project: Dict[str, Any], tickets: List[dict]) -> Dict[str, Any]:
+    """
+    Simulation context from a project's raw data. `tickets` uses the
+    get_project_raw() shape (one row per blocker, `assignee` = member name).
+    """
+    blocked = [t for t in tickets if t.get("blocker_id") and t.get("blocker_status") != "Done"]
+    active = [t for t in tickets if t.get("status") != "Done"]
+
+    from datetime import datetime
+    now = datetime.now()
+    days_to_deadline = 30
+    deadline = as_date(project.get("deadline"))
+    if deadline is not None:
+        days_to_deadline = max(0, (datetime.combine(deadline, datetime.min.time()) - now).days)
+
+    team_size = TeamCompositionSimulator._team_size_from_tickets(tickets)
+    return {
+        "is_blocked": len(blocked) > 0,
+        "blocked_count": len(blocked),
+        "active_tickets": len(active),
+        "total_tickets": len(tickets),
+        "days_to_deadline": days_to_deadline,
+        "team_size": team_size,
+        "team_capacity_percent": int(len(active) / team_size * 40),
+    }
+
+
+def mutation_feasibility(
+    action: str,
+    role_profile: Dict[str, Any],
+    team_size: int,
+    days_to_deadline: int,
+    active_tickets: int,
+) -> Tuple[bool, Optional[str]]:
+    """Organisational feasibility of one mutation at the given team size."""
+    feasible = True
+    warning = None
+
+    if action == "add":
+        if role_profile["ramp_up_days"] >= days_to_deadline:
+            warning = (
+                f"Ramp-up time ({role_profile['ramp_up_days']}d) exceeds "
+                f"deadline ({days_to_deadline}d). Member won't be effective in time."
+            )
+            feasible = False
+        if team_size >= 8:
+            warning = "Team already at maximum recommended size (8). Brooks's Law applies."
+            feasible = False
+
+    elif action == "remove":
+        if team_size <= 1:
+            warning = "Cannot remove the only team member."
+            feasible = False
+        elif team_size <= 2 and active_tickets > 3:
+            warning = "Removing a member leaves insufficient capacity for active tickets."
+            feasible = False
+
+    return feasible, warning
+
+
+def mutation_cost(action: str, role_profile: Dict[str, Any]) -> float:
+    """Monthly cost delta of one mutation."""
+    if action == "add":
+        return role_profile["cost_per_day"] * 30  # Monthly cost
+    if action == "remove":
+        return -role_profile["cost_per_day"] * 30
+    return role_profile["cost_per_day"] * 5  # Transition overhead
+
+
+def add_trials(
+    velocity_boost,
+    ramp_up_days,
+    blocked_resolution,
+    context: Dict[str, Any],
+    baseline_risk_score: float,
+    u: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised "add" trials. Profile parameters, the context's team_size
+    and days_to_deadline, and the baseline may be scalars or arrays shaped
+    (..., 1) to evaluate many profiles / contexts against the same (N × 3)
+    uniforms at once. Returns (projected_risk, velocity), shape (..., N).
+    """
+    team_size = context["team_size"]
+    days_to_deadline = context["days_to_deadline"]
+    z = ndtri(np.clip(u[:, 0], 1e-12, 1 - 1e-12))
+
+    # Risk reduction from adding a capable person
+    velocity = velocity_boost + velocity_boost * 0.3 * z
+    # Ramp-up penalty proportional to how close deadline is
+    ramp_penalty = (ramp_up_days / np.maximum(days_to_deadline, 1)) * 0.1
+    # Blocker resolution chance
+    if context["is_blocked"]:
+        resolved = u[:, 1] < blocked_resolution
+        blocker_relief = np.where(resolved, 0.10 + 0.15 * u[:, 2], 0.0)
+    else:
+        blocker_relief = 0.0
+
+    net_rr = np.maximum(0.0, velocity + blocker_relief - ramp_penalty)
+    # Brooks's Law: diminishing returns above 5 members
+    net_rr = net_rr * np.where(team_size > 5, np.maximum(0.3, 1.0 - (np.asarray(team_size) - 5) * 0.15), 1.0)
+
+    projected = np.clip(baseline_risk_score - net_rr, 0.0, 1.0)
+    return projected, velocity - ramp_penalty
+
+
+def mutation_trials(
+    action: str,
+    role_profile: Dict[str, Any],
+    context: Dict[str, Any],
+    baseline_risk_score: float,
+    u: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn an (N × 3) matrix of uniforms into N projected-risk and velocity
+    samples for one mutation. Columns: velocity noise (via inverse normal
+    CDF), blocker-resolution draw, relief/focus magnitude.
+    """
+    if action == "add":
+        return add_trials(
+            role_profile["velocity_boost"], role_profile["ramp_up_days"],
+            role_profile["blocked_resolution"], context, baseline_risk_score, u,
+        )
+
+    team_size = context["team_size"]
+    days_to_deadline = context["days_to_deadline"]
+    z = ndtri(np.clip(u[:, 0], 1e-12, 1 - 1e-12))
+    boost = role_profile["velocity_boost"]
+
+    if action == "remove":
+        # Risk increase from removing capacity
+        velocity_loss = boost + boost * 0.2 * z
+        # Smaller teams may get a focus benefit (inverse Brooks)
+        focus_bonus = 0.05 * u[:, 2] if team_size > 5 else 0.0
+        net_increase = np.maximum(0.0, velocity_loss - focus_bonus)
+        projected = np.clip(baseline_risk_score + net_increase, 0.0, 1.0)
+        return projected, focus_bonus - velocity_loss
+
+    # Transfer = remove from source + add to target (simplified)
+    velocity = boost * 0.8 + boost * 0.3 * z
+    ramp_penalty = (role_profile["ramp_up_days"] / max(days_to_deadline, 1)) * 0.08
+    net_rr = np.maximum(0.0, velocity - ramp_penalty)
+    projected = np.clip(baseline_risk_score - net_rr, 0.0, 1.0)
+    return projected, velocity - ramp_penalty
+
+
+def scenario_trials(
+    steps: Dict[str, np.ndarray],
+    context: Dict[str, Any],
+    baseline_risk_score: float,
+    u: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Joint trials for S scenarios of up to K ordered mutations.
+
+    `steps` holds (S, K) arrays: action codes ("add" / "remove" /
+    "transfer", "" for padding), velocity_boost, ramp_up_days,
+    blocked_resolution and team_size (size *before* the step). `u` is
+    (N × 3K); step k uses columns 3k..3k+2, shared by every scenario.
+
+    Per step the single-mutation model applies, with joint effects:
+    Brooks's factor uses the running team size, each newcomer ramps up
+    slower while earlier newcomers are still onboarding, and a blocker
+    resolved by one step yields relief only once. Returns
+    (projected_risk, velocity), shape (S, N).
+    """
+    action = steps["action"]
+    S, K = action.shape
+    days = max(context["days_to_deadline"], 1)
+
+    change = np.zeros((S, len(u)))  # Net risk change (negative = reduction)
+    velocity = np.zeros((S, len(u)))
+    resolved = np.zeros((S, len(u)), dtype=bool)
+    newcomers = np.zeros((S, 1))
+
+    for k in range(K):
+        is_add = (action[:, k] == "add")[:, None]
+        is_remove = (action[:, k] == "remove")[:, None]
+        is_transfer = (action[:, k] == "transfer")[:, None]
+        if not (is_add | is_remove | is_transfer).any():
+            continue
+
+        boost = steps["velocity_boost"][:, k:k + 1]
+        ramp = steps["ramp_up_days"][:, k:k + 1] * (1.0 + ONBOARDING_OVERLAP * newcomers)
+        team_size = steps["team_size"][:, k:k + 1]
+        z = ndtri(np.clip(u[:, 3 * k], 1e-12, 1 - 1e-12))
+
+        # Add: velocity + one-off blocker relief − ramp-up, scaled by Brooks
+        add_velocity = boost + boost * 0.3 * z
+        add_penalty = ramp / days * 0.1
+        if context["is_blocked"]:
+            hit = is_add & ~resolved & (u[:, 3 * k + 1] < steps["blocked_resolution"][:, k:k + 1])
+            relief = np.where(hit, 0.10 + 0.15 * u[:, 3 * k + 2], 0.0)
+            resolved |= hit
+        else:
+            relief = 0.0
+        brooks = np.where(team_size > 5, np.maximum(0.3, 1.0 - (team_size - 5) * 0.15), 1.0)
+        add_rr = np.maximum(0.0, add_velocity + relief - add_penalty) * brooks
+
+        # Remove: lost velocity, with a focus bonus on large teams
+        loss = boost + boost * 0.2 * z
+        focus = np.where(team_size > 5, 0.05 * u[:, 3 * k + 2], 0.0)
+
+        # Transfer in: reduced boost, shorter ramp penalty
+        transfer_velocity = boost * 0.8 + boost * 0.3 * z
+        transfer_penalty = ramp / days * 0.08
+
+        change -= np.where(is_add, add_rr, 0.0)
+        change += np.where(is_remove, np.maximum(0.0, loss - focus), 0.0)
+        change -= np.where(is_transfer, np.maximum(0.0, transfer_velocity - transfer_penalty), 0.0)
+        velocity += np.where(is_add, add_velocity - add_penalty, 0.0)
+        velocity += np.where(is_remove, focus - loss, 0.0)
+        velocity += np.where(is_transfer, transfer_velocity - transfer_penalty, 0.0)
+        newcomers = newcomers + (is_add | is_transfer)
+
+    projected = np.clip(baseline_risk_score + change, 0.0, 1.0)
+    return projected, velocity
+
+
 class TeamCompositionSimulator:
     """
     Simulates the impact of team composition changes on project risk.
     Uses Monte Carlo trials with role-specific effectiveness profiles.
     """
 
-    def __init__(self):
+    def __init__(self, sampler: str = TEAM_SAMPLER):
+        if sampler not in samplers.SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}'. Available: {list(samplers.SAMPLERS)}")
         self.sim_agent = SimulationAgent()
+        self._cache = SimulationCache()
+        self.sampler = sampler
+
+    @staticmethod
+    def _team_size_from_tickets(tickets: List[dict]) -> int:
+        """Number of distinct assignees on a project's tickets (at least 1)."""
+        return max(len({t["assignee"] for t in tickets if t.get("assignee")}), 1)
 
     def _get_current_team_size(self, project_id: str) -> int:
         """Get current number of assigned members for a project."""
         try:
             raw = context_assembler.get_project_raw(project_id)
-            assignees = set()
-            for t in raw["tickets"]:
-                if t.get("assignee"):
-                    assignees.add(t["assignee"])
-            return max(len(assignees), 1)
+            return self._team_size_from_tickets(raw["tickets"])
         except Exception:
             return 3  # default fallback
 
     def _get_project_context(self, project_id: str) -> Dict[str, Any]:
         """Build simulation context from Neo4j data."""
         raw = context_assembler.get_project_raw(project_id)
-        tickets = raw["tickets"]
-
-        blocked = [t for t in tickets if t.get("blocker_id") and t.get("blocker_status") != "Done"]
-        active = [t for t in tickets if t.get("status") != "Done"]
-
-        from datetime import datetime
-        now = datetime.now()
-        days_to_deadline = 30
-        if raw["project"].get("deadline"):
-            try:
-                dl = datetime.strptime(raw["project"]["deadline"], "%Y-%m-%d")
-                days_to_deadline = max(0, (dl - now).days)
-            except ValueError:
-                pass
-
-        return {
-            "is_blocked": len(blocked) > 0,
-            "blocked_count": len(blocked),
-            "active_tickets": len(active),
-            "total_tickets": len(tickets),
-            "days_to_deadline": days_to_deadline,
-            "team_size": self._get_current_team_size(project_id),
-            "team_capacity_percent": int(len(active) / max(self._get_current_team_size(project_id), 1) * 40),
-        }
+        return project_team_context(raw["project"], raw["tickets"])
 
     def simulate_mutation(
         self,
         mutation: TeamMutation,
         baseline_risk_score: Optional[float] = None,
+        context: Optional[Dict[str, Any]] = None,
     ) -> SimulationResult:
         """
         Simulate the impact of a single team mutation using Monte Carlo.
+        Trials are drawn from an RNG seeded on the mutation, context and
+        role profile; identical requests return the memoised result.
+        Pass a prebuilt `context` to skip the Neo4j lookup.
         """
         role_profile = ROLE_PROFILES.get(mutation.role, ROLE_PROFILES["Mid Engineer"])
-        context = self._get_project_context(mutation.project_id)
+        if context is None:
+            context = self._get_project_context(mutation.project_id)
 
         # Baseline risk from risk agent cache or estimate
         if baseline_risk_score is None:
             baseline_risk_score = self._estimate_baseline_risk(context)
 
+        seed = stable_seed(
+            [getattr(mutation, k) for k in TeamMutation.__slots__],
+            baseline_risk_score, context, role_profile, N_SIMULATIONS, self.sampler,
+        )
+        cached = self._cache.get(seed)
+        if cached is not None:
+            return cached
+
         team_size = context["team_size"]
         days_to_deadline = context["days_to_deadline"]
 
         # ── Check feasibility ─────────────────────────────────────
-        feasible = True
-        warning = None
-
-        if mutation.action == "add":
-            if role_profile["ramp_up_days"] >= days_to_deadline:
-                warning = (
-                    f"Ramp-up time ({role_profile['ramp_up_days']}d) exceeds "
-                    f"deadline ({days_to_deadline}d). Member won't be effective in time."
-                )
-                feasible = False
-            if team_size >= 8:
-                warning = "Team already at maximum recommended size (8). Brooks's Law applies."
-                feasible = False
-
-        elif mutation.action == "remove":
-            if team_size <= 1:
-                warning = "Cannot remove the only team member."
-                feasible = False
-            elif team_size <= 2 and context["active_tickets"] > 3:
-                warning = "Removing a member leaves insufficient capacity for active tickets."
-                feasible = False
+        feasible, warning = mutation_feasibility(
+            mutation.action, role_profile, team_size, days_to_deadline, context["active_tickets"],
+        )
 
         # ── Monte Carlo simulation ────────────────────────────────
         N = N_SIMULATIONS
-        risk_samples = []
-        velocity_samples = []
-
-        for _ in range(N):
-            if mutation.action == "add":
-                # Risk reduction from adding a capable person
-                velocity_boost = random.gauss(
-                    role_profile["velocity_boost"],
-                    role_profile["velocity_boost"] * 0.3,
-                )
-                # Ramp-up penalty proportional to how close deadline is
-                ramp_penalty = (role_profile["ramp_up_days"] / max(days_to_deadline, 1)) * 0.1
-                # Blocker resolution chance
-                blocker_relief = 0
-                if context["is_blocked"]:
-                    if random.random() < role_profile["blocked_resolution"]:
-                        blocker_relief = random.uniform(0.10, 0.25)
-
-                net_rr = max(0, velocity_boost + blocker_relief - ramp_penalty)
-                # Brooks's Law: diminishing returns above 5 members
-                if team_size > 5:
-                    brooks_factor = max(0.3, 1.0 - (team_size - 5) * 0.15)
-                    net_rr *= brooks_factor
-
-                projected = max(0, min(1, baseline_risk_score - net_rr))
-                risk_samples.append(projected)
-                velocity_samples.append(velocity_boost - ramp_penalty)
-
-            elif mutation.action == "remove":
-                # Risk increase from removing capacity
-                velocity_loss = random.gauss(
-                    role_profile["velocity_boost"],
-                    role_profile["velocity_boost"] * 0.2,
-                )
-                # Smaller teams may get a focus benefit (inverse Brooks)
-                if team_size > 5:
-                    focus_bonus = random.uniform(0, 0.05)
-                else:
-                    focus_bonus = 0
-
-                net_increase = max(0, velocity_loss - focus_bonus)
-                projected = max(0, min(1, baseline_risk_score + net_increase))
-                risk_samples.append(projected)
-                velocity_samples.append(-velocity_loss + focus_bonus)
-
-            else:
-                # Transfer = remove from source + add to target (simplified)
-                velocity_boost = random.gauss(
-                    role_profile["velocity_boost"] * 0.8,
-                    role_profile["velocity_boost"] * 0.3,
-                )
-                ramp_penalty = (role_profile["ramp_up_days"] / max(days_to_deadline, 1)) * 0.08
-                net_rr = max(0, velocity_boost - ramp_penalty)
-                projected = max(0, min(1, baseline_risk_score - net_rr))
-                risk_samples.append(projected)
-                velocity_samples.append(velocity_boost - ramp_penalty)
-
-        risk_samples.sort()
-        mean_risk = sum(risk_samples) / N
-        mean_velocity = sum(velocity_samples) / N
-
-        # Cost calculation
-        if mutation.action == "add":
-            cost_delta = role_profile["cost_per_day"] * 30  # Monthly cost
-        elif mutation.action == "remove":
-            cost_delta = -role_profile["cost_per_day"] * 30
-        else:
-            cost_delta = role_profile["cost_per_day"] * 5  # Transition overhead
+        u = samplers.uniform(np.random.default_rng(seed), N, 3, self.sampler)
+        risk_samples, velocity_samples = mutation_trials(
+            mutation.action, role_profile, context, baseline_risk_score, u,
+        )
+
+        mean_risk = float(risk_samples.mean())
+        mean_velocity = float(velocity_samples.mean())
+        p10_risk, p90_risk = np.percentile(risk_samples, [10, 90])
+
+        cost_delta = mutation_cost(mutation.action, role_profile)
 
         risk_delta = mean_risk - baseline_risk_score
-        confidence_in_result = self._calc_confidence(risk_samples, N)
+        confidence_in_result = self._calc_confidence(risk_samples)
 
         # Build reasoning text
         reasoning = self._build_reasoning(
@@ -282,10 +479,12 @@ class TeamCompositionSimulator:
             cost_delta, mean_velocity, context, role_profile, feasible, warning,
         )
 
-        return SimulationResult(
+        result = SimulationResult(
             mutation=mutation,
             baseline_risk=baseline_risk_score,
             projected_risk=mean_risk,
+            p10_risk=float(p10_risk),
+            p90_risk=float(p90_risk),
             risk_delta=risk_delta,
             cost_delta=cost_delta,
             velocity_change=mean_velocity,
@@ -294,18 +493,224 @@ class TeamCompositionSimulator:
             feasible=feasible,
             warning=warning,
         )
+        self._cache.set(seed, result)
+        return result
 
     def simulate_batch(
         self,
         mutations: List[TeamMutation],
         baseline_risk_score: Optional[float] = None,
+        context: Optional[Dict[str, Any]] = None,
     ) -> List[SimulationResult]:
-        """Simulate multiple mutations and return ranked results."""
-        results = [self.simulate_mutation(m, baseline_risk_score) for m in mutations]
+        """
+        Simulate multiple mutations and return ranked results.
+        Without a prebuilt `context`, each distinct project's context is
+        read once for the whole batch, so every result reflects the same
+        snapshot of the data.
+        """
+        if context is None:
+            snapshot = {
+                pid: self._get_project_context(pid)
+                for pid in dict.fromkeys(m.project_id for m in mutations)
+            }
+            results = [
+                self.simulate_mutation(m, baseline_risk_score, snapshot[m.project_id])
+                for m in mutations
+            ]
+        else:
+            results = [self.simulate_mutation(m, baseline_risk_score, context) for m in mutations]
         # Sort by risk delta (most beneficial first)
         results.sort(key=lambda r: r.risk_delta)
         return results
 
+    def simulate_scenarios(
+        self,
+        scenarios: List[TeamScenario],
+        baseline_risk_score: Optional[float] = None,
+        context: Optional[Dict[str, Any]] = None,
+        ranked: bool = True,
+    ) -> List[ScenarioResult]:
+        """
+        Jointly simulate compound scenarios and return them ranked by risk
+        delta, or in input order with ranked=False. Scenarios of the same
+        project run in one batched pass over shared draws, so their
+        differences are not sampling noise.
+        """
+        by_project: Dict[str, List[int]] = {}
+        for i, sc in enumerate(scenarios):
+            by_project.setdefault(sc.project_id, []).append(i)
+
+        results: List[ScenarioResult] = [None] * len(scenarios)
+        for project_id, indices in by_project.items():
+            ctx = context if context is not None else self._get_project_context(project_id)
+            group = self._simulate_scenario_group([scenarios[i] for i in indices], baseline_risk_score, ctx)
+            for i, result in zip(indices, group):
+                results[i] = result
+        if ranked:
+            results.sort(key=lambda r: r.risk_delta)
+        return results
+
+    def _simulate_scenario_group(
+        self,
+        scenarios: List[TeamScenario],
+        baseline_risk_score: Optional[float],
+        context: Dict[str, Any],
+    ) -> List[ScenarioResult]:
+        if baseline_risk_score is None:
+            baseline_risk_score = self._estimate_baseline_risk(context)
+
+        seed = stable_seed(
+            [[sc.name, [[getattr(m, k) for k in TeamMutation.__slots__] for m in sc.mutations]] for sc in scenarios],
+            baseline_risk_score, context, ROLE_PROFILES, ONBOARDING_OVERLAP, SCENARIO_TRIALS, self.sampler,
+        )
+        cached = self._cache.get(seed)
+        if cached is not None:
+            return cached
+
+        S = len(scenarios)
+        K = max((len(sc.mutations) for sc in scenarios), default=0) or 1
+        steps = {
+            "action": np.full((S, K), "", dtype=object),
+            "velocity_boost": np.zeros((S, K)),
+            "ramp_up_days": np.zeros((S, K)),
+            "blocked_resolution": np.zeros((S, K)),
+            "team_size": np.zeros((S, K)),
+        }
+
+        # Walk each scenario once for team sizes, feasibility and cost
+        team_after, feasible, warnings, costs = [], [], [], []
+        for i, sc in enumerate(scenarios):
+            team_size = context["team_size"]
+            ok, notes, cost = True, [], 0.0
+            for k, m in enumerate(sc.mutations):
+                profile = ROLE_PROFILES.get(m.role, ROLE_PROFILES["Mid Engineer"])
+                step_ok, warning = mutation_feasibility(
+                    m.action, profile, team_size, context["days_to_deadline"], context["active_tickets"],
+                )
+                if warning:
+                    notes.append(f"Step {k + 1} ({m.action} {m.role}): {warning}")
+                ok &= step_ok
+                cost += mutation_cost(m.action, profile)
+
+                steps["action"][i, k] = m.action
+                steps["team_size"][i, k] = team_size
+                for f in ("velocity_boost", "ramp_up_days", "blocked_resolution"):
+                    steps[f][i, k] = profile[f]
+                team_size += -1 if m.action == "remove" else 1
+
+            team_after.append(team_size)
+            feasible.append(ok)
+            warnings.append(notes)
+            costs.append(cost)
+
+        u = samplers.uniform(np.random.default_rng(seed), SCENARIO_TRIALS, 3 * K, self.sampler)
+        projected, velocity = scenario_trials(steps, context, baseline_risk_score, u)
+
+        mean_risk = projected.mean(axis=1)
+        p10, p90 = np.percentile(projected, [10, 90], axis=1)
+        mean_velocity = velocity.mean(axis=1)
+        confidence = np.clip(1.0 - projected.std(axis=1) * 2, 0.4, 0.95)
+
+        results = [
+            ScenarioResult(
+                scenario=sc,
+                baseline_risk=baseline_risk_score,
+                projected_risk=float(mean_risk[i]),
+                p10_risk=float(p10[i]),
+                p90_risk=float(p90[i]),
+                risk_delta=float(mean_risk[i] - baseline_risk_score),
+                cost_delta=costs[i],
+                velocity_change=float(mean_velocity[i]),
+                team_size_after=team_after[i],
+                confidence=float(confidence[i]),
+                feasible=feasible[i],
+                warnings=warnings[i],
+            )
+            for i, sc in enumerate(scenarios)
+        ]
+        self._cache.set(seed, results)
+        return results
+
+    def sweep(
+        self,
+        days_to_deadline: Sequence[int],
+        team_sizes: Sequence[int],
+        roles: Sequence[str],
+        context: Dict[str, Any],
+        baseline_risk_score: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        What-if grid for adding each role: every (days_to_deadline ×
+        team_size) cell is simulated in one broadcast pass per role against
+        shared draws. `context` supplies is_blocked / active_tickets; the
+        swept fields are overridden. Matrices are [day][team_size].
+        """
+        if len(days_to_deadline) * len(team_sizes) > MAX_SWEEP_CELLS:
+            raise ValueError(f"Sweep grid exceeds {MAX_SWEEP_CELLS} cells per role")
+
+        days = np.asarray(days_to_deadline, dtype=float)[:, None, None]   # (D, 1, 1)
+        sizes = np.asarray(team_sizes, dtype=float)[None, :, None]        # (1, S, 1)
+
+        if baseline_risk_score is None:
+            # _estimate_baseline_risk, per deadline
+            baseline = 0.3 + (0.25 if context["is_blocked"] else 0.0) + (0.10 if context["active_tickets"] > 5 else 0.0)
+            baseline = np.minimum(baseline + np.where(days < 7, 0.20, 0.0), 1.0)
+        else:
+            baseline = np.full(days.shape, float(baseline_risk_score))
+
+        seed = stable_seed(
+            context, list(days_to_deadline), list(team_sizes), list(roles),
+            baseline_risk_score, [ROLE_PROFILES[r] for r in roles], SWEEP_TRIALS, self.sampler,
+        )
+        cached = self._cache.get(seed)
+        if cached is not None:
+            return cached
+
+        u = samplers.uniform(np.random.default_rng(seed), SWEEP_TRIALS, 3, self.sampler)
+        grid_context = {**context, "days_to_deadline": days, "team_size": sizes}
+        constraint = self.sim_agent.constraint_agent.evaluate_intervention_grid("ADD_ENGINEER", days[:, 0, 0])
+
+        heatmaps = []
+        for role in roles:
+            profile = ROLE_PROFILES[role]
+            projected, _ = add_trials(
+                profile["velocity_boost"], profile["ramp_up_days"], profile["blocked_resolution"],
+                grid_context, baseline, u,
+            )
+            projected = projected.mean(axis=-1)                      # (D, S)
+            delta = projected - baseline[..., 0]
+            # Same rules as simulate_mutation's "add" feasibility check
+            feasible = (profile["ramp_up_days"] < days[..., 0]) & (sizes[..., 0] < 8)
+            helps = feasible & (delta <= -SWEEP_HELP_THRESHOLD)
+
+            # Tightest deadline at which the addition still helps, per team size
+            min_days = np.where(helps, days[..., 0], np.inf).min(axis=0)
+            heatmaps.append({
+                "role": role,
+                "projected_risk": np.round(projected, 3).tolist(),
+                "risk_delta": np.round(delta, 3).tolist(),
+                "feasible": feasible.tolist(),
+                "helps": helps.tolist(),
+                "min_days_to_help": [int(d) if np.isfinite(d) else None for d in min_days],
+            })
+
+        result = {
+            "axes": {
+                "days_to_deadline": [int(d) for d in days_to_deadline],
+                "team_size": [int(t) for t in team_sizes],
+            },
+            "baseline_risk": np.round(baseline[:, 0, 0], 3).tolist(),
+            "constraint": {
+                "feasible": constraint["feasible"].tolist(),
+                "penalty": constraint["penalty"].tolist(),
+            },
+            "help_threshold": SWEEP_HELP_THRESHOLD,
+            "n_trials": SWEEP_TRIALS,
+            "roles": heatmaps,
+        }
+        self._cache.set(seed, result)
+        return result
+
     # ── Helpers ───────────────────────────────────────────────────────────
 
     def _estimate_baseline_risk(self, context: Dict[str, Any]) -> float:
@@ -319,15 +724,12 @@ class TeamCompositionSimulator:
             risk += 0.10
         return min(risk, 1.0)
 
-    def _calc_confidence(self, samples: List[float], n: int) -> float:
+    def _calc_confidence(self, samples: np.ndarray) -> float:
         """Confidence based on how tight the distribution is."""
-        if n < 10:
+        if len(samples) < 10:
             return 0.3
-        mean = sum(samples) / n
-        variance = sum((s - mean) ** 2 for s in samples) / n
-        std = variance ** 0.5
         # Tighter distribution = higher confidence
-        return min(0.95, max(0.4, 1.0 - std * 2))
+        return min(0.95, max(0.4, 1.0 - float(samples.std()) * 2))
 
     def _build_reasoning(
         self, mutation, baseline, projected, delta,
@@ -0,0 +1,92 @@
+"""
+Sampler benchmark — estimator error vs. trial count for each sampler.
+
+Measures RMSE of the simulation estimates against a large pseudo-random
+reference run, on the real parameter sets:
+  MC_DISTRIBUTIONS → SimulationAgent mean risk reduction + P(positive)
+  ROLE_PROFILES    → TeamCompositionSimulator projected risk ("add")
+
+Run: python -m backend.app.benchmarks.sampler_error
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from backend.app.agents import samplers
+from backend.app.agents.simulation import SimulationAgent, MC_DISTRIBUTIONS
+from backend.app.agents.team_simulator import ROLE_PROFILES, mutation_trials
+
+
+REPLICATES = 30
+MC_TRIAL_COUNTS = (256, 1024, 4096, 16384)
+TEAM_TRIAL_COUNTS = (64, 256, 1024, 4096)
+
+MC_CONTEXT = {"is_blocked": False, "days_to_deadline": 30}
+TEAM_CONTEXT = {"is_blocked": True, "days_to_deadline": 20, "team_size": 4, "active_tickets": 6}
+TEAM_BASELINE = 0.6
+
+
+def _fixed_agent(sampler: str, n: int) -> SimulationAgent:
+    """Agent that always runs exactly n trials (zero tolerance never converges)."""
+    return SimulationAgent(
+        rr_tolerance=0.0, prob_tolerance=0.0, max_trials=n, batch_size=n, sampler=sampler,
+    )
+
+
+def bench_mc_distributions():
+    actions = list(MC_DISTRIBUTIONS)
+    reference = _fixed_agent("pseudo", 2_000_000).run_simulations(MC_CONTEXT, actions)
+
+    print("\nMC_DISTRIBUTIONS — RMSE averaged over actions (mean_rr / prob_positive)")
+    print(f"{'trials':>8} " + " ".join(f"{s:>22}" for s in samplers.SAMPLERS))
+    for n in MC_TRIAL_COUNTS:
+        row = []
+        for sampler in samplers.SAMPLERS:
+            agent = _fixed_agent(sampler, n)
+            rr_err, prob_err = [], []
+            for r in range(REPLICATES):
+                res = agent.run_simulations({**MC_CONTEXT, "replicate": r}, actions)
+                rr_err += [(res[a].mean_rr - reference[a].mean_rr) ** 2 for a in actions]
+                prob_err += [(res[a].prob_positive - reference[a].prob_positive) ** 2 for a in actions]
+            row.append(f"{np.sqrt(np.mean(rr_err)):.5f} / {np.sqrt(np.mean(prob_err)):.5f}")
+        print(f"{n:>8} " + " ".join(f"{c:>22}" for c in row))
+
+
+def bench_role_profiles():
+    def estimate(profile, u):
+        risk, _ = mutation_trials("add", profile, TEAM_CONTEXT, TEAM_BASELINE, u)
+        return float(np.mean(risk))
+
+    rng = np.random.default_rng(0)
+    reference = {
+        role: estimate(p, samplers.uniform(rng, 200_000, 3, "pseudo"))
+        for role, p in ROLE_PROFILES.items()
+    }
+
+    print("\nROLE_PROFILES — RMSE of projected risk averaged over roles ('add')")
+    print(f"{'trials':>8} " + " ".join(f"{s:>12}" for s in samplers.SAMPLERS))
+    for n in TEAM_TRIAL_COUNTS:
+        row = []
+        for sampler in samplers.SAMPLERS:
+            errs = []
+            for r in range(REPLICATES):
+                rng = np.random.default_rng(r)
+                for role, profile in ROLE_PROFILES.items():
+                    u = samplers.uniform(rng, n, 3, sampler)
+                    errs.append((estimate(profile, u) - reference[role]) ** 2)
+            row.append(f"{np.sqrt(np.mean(errs)):.5f}")
+        print(f"{n:>8} " + " ".join(f"{c:>12}" for c in row))
+
+
+if __name__ == "__main__":
+    t0 = time.time()
+    print("=" * 60)
+    print(f"Sampler benchmark ({REPLICATES} replicates per cell)")
+    print("=" * 60)
+    bench_mc_distributions()
+    bench_role_profiles()
+    print(f"\nDone in {time.time() - t0:.1f}s")
@@ -8,12 +8,60 @@ class Settings(BaseSettings):
     FEATHERLESS_BASE_URL: str = "https://api.featherless.ai/v1"
     MODEL_ID: str = "Qwen/Qwen2.5-32B-Instruct"
 
+    # Shared LLM HTTP transport — keep-alive pool, HTTP/2, default timeouts (s)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE: int = 10
+    LLM_KEEPALIVE_EXPIRY: float = 60.0
+    LLM_HTTP2: bool = True
+    LLM_TIMEOUT: float = 60.0
+    LLM_CONNECT_TIMEOUT: float = 5.0
+
+    # SSE token coalescing — a frame is flushed after FLUSH_MS or once it
+    # holds FLUSH_BYTES; 0 / 0 sends one frame per token
+    SSE_FLUSH_MS: float = 30.0
+    SSE_FLUSH_BYTES: int = 256
+
+    # LLM scheduler — global concurrency cap, slots batch work may hold
+    # (the rest stay free for interactive chat), request token bucket,
+    # and jittered retries on 429 (s)
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_BATCH_CONCURRENCY: int = 4
+    LLM_RATE_PER_SECOND: float = 4.0
+    LLM_RATE_BURST: int = 8
+    LLM_MAX_RETRIES: int = 4
+    LLM_RETRY_BASE: float = 0.5
+    LLM_RETRY_MAX: float = 8.0
+
+    # Local intent classifier — below this confidence the LLM decides
+    INTENT_CONFIDENCE_THRESHOLD: float = 0.6
+    INTENT_LOG_PATH: str = os.path.join(os.path.dirname(__file__), "..", "..", "intent_log.jsonl")
+    INTENT_LOG_MAX_ENTRIES: int = 5000  # Log is compacted past this many lines
+
     # Neo4j Aura — loaded from .env
     NEO4J_URI: str = ""
     NEO4J_USERNAME: str = "neo4j"
     NEO4J_PASSWORD: str = ""
     NEO4J_DATABASE: str = "neo4j"
 
+    # Simulation process pool — 0 workers means one per CPU core
+    SIM_WORKERS: int = 0
+    SIM_CHUNK_SIZE: int = 16
+
+    # Background simulation jobs — thread pool size, per-user cap, retention
+    JOB_WORKERS: int = 4
+    JOB_MAX_PER_USER: int = 2
+    JOB_TTL_SECONDS: int = 600
+
+    # Generated documents (postmortems, narratives, reports) kept in memory
+    DOCUMENT_CACHE_SIZE: int = 256
+
+    # Background pre-generation of narratives and the company report (s):
+    # inputs are checked every POLL seconds, each document is regenerated
+    # at most once per MIN_INTERVAL
+    DOCUMENT_PRECOMPUTE: bool = True
+    DOCUMENT_POLL_SECONDS: float = 60.0
+    DOCUMENT_MIN_INTERVAL: float = 300.0
+
     # CORS — restrict to known frontend origins
     CORS_ORIGINS: list = [
         "http://localhost:8080",
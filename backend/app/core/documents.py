@@ -0,0 +1,297 @@
+"""
+DocumentCache — LLM-generated documents keyed by an input fingerprint.
+
+Postmortems, role narratives and the company report are regenerated by
+the LLM only when what they are generated from changes. Each document is
+stored under a key (e.g. "narrative:hr") together with the fingerprint of
+its exact inputs: the prompt template version, the model and the data
+the prompt is built from (see document_fingerprint).
+
+  hit    → stored fingerprint matches; served from memory
+  stale  → fingerprint changed; the previous document is served at once
+           and a regeneration starts in the background
+  miss   → nothing stored yet; generated while the caller waits
+
+Concurrent requests for the same key share one generation.
+
+DocumentScheduler keeps selected documents (role narratives, the company
+report) precomputed: it polls their fingerprints and regenerates every
+changed document concurrently, each at most once per
+settings.DOCUMENT_MIN_INTERVAL. Their endpoints serve latest() and never
+wait on the LLM once the first generation has landed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+def document_fingerprint(*parts: Any) -> str:
+    """Hex sha256 of the JSON-serialised inputs of a document."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CachedDocument:
+    """One generated document and the fingerprint it was generated from."""
+    __slots__ = ("fingerprint", "document", "generated_at")
+
+    def __init__(self, fingerprint: str, document: Dict[str, Any]):
+        self.fingerprint = fingerprint
+        self.document = document
+        self.generated_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint[:16],
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.generated_at)),
+        }
+
+
+class DocumentCache:
+    """Bounded LRU of generated documents with background regeneration."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.DOCUMENT_CACHE_SIZE
+        self._entries: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self.stats = {HIT: 0, STALE: 0, MISS: 0, "generated": 0, "failed": 0}
+
+    def _store(self, key: str, entry: CachedDocument):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _generation(
+        self,
+        key: str,
+        fingerprint: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> asyncio.Task:
+        """The running generation of `key` at `fingerprint`, started if needed."""
+        running = self._inflight.get(key)
+        if running is not None and running[0] == fingerprint:
+            return running[1]
+
+        async def run() -> CachedDocument:
+            try:
+                entry = CachedDocument(fingerprint, await generate())
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            finally:
+                if self._inflight.get(key, (None, None))[1] is task:
+                    del self._inflight[key]
+            self.stats["generated"] += 1
+            current = self._entries.get(key)
+            # A generation for a newer fingerprint may already have landed
+            if current is None or current.generated_at <= entry.generated_at:
+                self._store(key, entry)
+            return entry
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = (fingerprint, task)
+        return task
+
+    async def get(
+        self,
+        key: str,
+        fingerprint: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        (document, cache metadata). `generate` is awaited only on a miss
+        or, in the background, when the fingerprint has changed.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            self._entries.move_to_end(key)
+            self.stats[HIT] += 1
+            return entry.document, {"status": HIT, **entry.to_dict()}
+
+        if entry is not None:
+            self.stats[STALE] += 1
+            task = self._generation(key, fingerprint, generate)
+            task.add_done_callback(self._log_failure(key))
+            return entry.document, {"status": STALE, "regenerating": True, **entry.to_dict()}
+
+        self.stats[MISS] += 1
+        # Shielded: a client disconnecting must not cancel a shared generation
+        entry = await asyncio.shield(self._generation(key, fingerprint, generate))
+        return entry.document, {"status": MISS, **entry.to_dict()}
+
+    def latest(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """The most recent document for `key` regardless of fingerprint."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.stats[HIT] += 1
+        return entry.document, {"status": HIT, **entry.to_dict()}
+
+    def fingerprint(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry.fingerprint if entry is not None else None
+
+    def put(self, key: str, fingerprint: str, document: Dict[str, Any]) -> CachedDocument:
+        """Store a document generated outside the cache (e.g. streamed)."""
+        entry = CachedDocument(fingerprint, document)
+        self._store(key, entry)
+        self.stats["generated"] += 1
+        return entry
+
+    async def refresh(
+        self,
+        key: str,
+        fingerprint: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> CachedDocument:
+        """Generate `key` at `fingerprint` now (joining a running generation)."""
+        return await asyncio.shield(self._generation(key, fingerprint, generate))
+
+    @staticmethod
+    def _log_failure(key: str):
+        def done(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Background regeneration of {key} failed: {task.exception()}")
+        return done
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "regenerating": len(self._inflight),
+        }
+
+
+# A source returns (fingerprint, generate) for the document's current inputs
+DocumentSource = Callable[[], Awaitable[Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]]]
+
+UNCHANGED = "unchanged"
+DEFERRED = "deferred"
+REGENERATED = "regenerated"
+FAILED = "failed"
+
+
+class DocumentScheduler:
+    """Keeps registered documents regenerated as their inputs change."""
+
+    def __init__(
+        self,
+        cache: DocumentCache,
+        poll_seconds: Optional[float] = None,
+        min_interval: Optional[float] = None,
+    ):
+        self.cache = cache
+        self.poll_seconds = poll_seconds or settings.DOCUMENT_POLL_SECONDS
+        self.min_interval = min_interval if min_interval is not None else settings.DOCUMENT_MIN_INTERVAL
+        self._sources: Dict[str, DocumentSource] = {}
+        self._last_generated: Dict[str, float] = {}
+        self._last_status: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+
+    def register(self, key: str, source: DocumentSource):
+        self._sources[key] = source
+
+    async def _refresh(self, key: str, force: bool) -> str:
+        fingerprint, generate = await self._sources[key]()
+        current = self.cache.fingerprint(key)
+        if fingerprint == current:
+            return UNCHANGED
+        if (
+            not force
+            and current is not None
+            and time.time() - self._last_generated.get(key, 0.0) < self.min_interval
+        ):
+            return DEFERRED
+        self._last_generated[key] = time.time()
+        await self.cache.refresh(key, fingerprint, generate)
+        return REGENERATED
+
+    async def refresh_one(self, key: str, force: bool = False) -> str:
+        """Regenerate `key` if its fingerprint changed and the interval allows."""
+        try:
+            status = await self._refresh(key, force)
+        except Exception as e:
+            logger.warning(f"Pre-generation of {key} failed: {e}")
+            status = FAILED
+        self._last_status[key] = status
+        return status
+
+    async def refresh(self, force: bool = False) -> Dict[str, str]:
+        """Check every registered document concurrently."""
+        keys = list(self._sources)
+        statuses = await asyncio.gather(*(self.refresh_one(k, force) for k in keys))
+        self.runs += 1
+        return dict(zip(keys, statuses))
+
+    async def latest(self, key: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Latest precomputed version of `key`. Only before its first
+        generation has landed (e.g. just after startup) does this wait.
+        """
+        latest = self.cache.latest(key)
+        if latest is None:
+            self._last_status[key] = await self._refresh(key, force=True)
+            latest = self.cache.latest(key)
+        return latest
+
+    async def _run(self):
+        while True:
+            statuses = await self.refresh()
+            changed = [k for k, s in statuses.items() if s == REGENERATED]
+            if changed:
+                logger.info(f"Pre-generated {len(changed)} documents: {', '.join(changed)}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Document pre-generation started for {len(self._sources)} documents "
+                f"(poll {self.poll_seconds:.0f}s, min interval {self.min_interval:.0f}s)"
+            )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "documents": {
+                key: {
+                    "status": self._last_status.get(key),
+                    "last_generated": (
+                        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._last_generated[key]))
+                        if key in self._last_generated else None
+                    ),
+                }
+                for key in self._sources
+            },
+        }
+
+
+# Singletons
+document_cache = DocumentCache()
+document_scheduler = DocumentScheduler(document_cache)
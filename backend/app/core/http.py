@@ -0,0 +1,127 @@
+"""
+Shared HTTP transport for every LLM call.
+
+All LLM traffic goes to one Featherless base URL through ModelRouter's
+async client, which runs on one shared httpx client instead of opening
+its own pool:
+
+  - keep-alive pool sized by settings.LLM_MAX_CONNECTIONS /
+    LLM_MAX_KEEPALIVE, idle connections kept LLM_KEEPALIVE_EXPIRY seconds
+  - HTTP/2 when settings.LLM_HTTP2 is on and the `h2` package is installed
+    (httpx falls back to HTTP/1.1 if the server does not negotiate it)
+  - connection-reuse metrics from httpcore trace events, exposed on
+    /api/metrics
+
+Per-task request timeouts live on the ModelRouter registry and are passed
+per call; the client-level timeout is only the default.
+"""
+
+import logging
+import threading
+from typing import Dict, Any
+
+import httpx
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 — only needed for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPMetrics:
+    """Thread-safe counters for requests and new connections."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.errors = 0
+        self.http_versions: Dict[str, int] = {}
+
+    def _add(self, field: str, n: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def trace(self, event: str, info: Dict[str, Any]):
+        if event == "connection.connect_tcp.complete":
+            self._add("new_connections")
+        elif event == "connection.start_tls.complete":
+            self._add("tls_handshakes")
+
+    def response(self, response: httpx.Response):
+        with self._lock:
+            self.requests += 1
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+            if response.status_code >= 400:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_connections": reused,
+                "connection_reuse_ratio": round(reused / self.requests, 3) if self.requests else None,
+                "error_responses": self.errors,
+                "http_versions": dict(self.http_versions),
+                "http2_enabled": settings.LLM_HTTP2 and HTTP2_AVAILABLE,
+            }
+
+
+class LLMTransport:
+    """Lazily-built shared httpx client with pooled keep-alive connections."""
+
+    def __init__(self):
+        self.metrics = HTTPMetrics()
+        self._async_client: httpx.AsyncClient = None
+        self._lock = threading.Lock()
+
+    def _options(self) -> Dict[str, Any]:
+        return {
+            "http2": settings.LLM_HTTP2 and HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            ),
+            "timeout": httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+        }
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                metrics = self.metrics
+
+                async def trace(event: str, info: Dict[str, Any]):
+                    metrics.trace(event, info)
+
+                async def on_request(request: httpx.Request):
+                    request.extensions["trace"] = trace
+
+                async def on_response(response: httpx.Response):
+                    metrics.response(response)
+
+                self._async_client = httpx.AsyncClient(
+                    event_hooks={"request": [on_request], "response": [on_response]},
+                    **self._options(),
+                )
+                logger.info(f"LLM transport ready (http2={self._options()['http2']})")
+            return self._async_client
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+# Singleton
+llm_transport = LLMTransport()
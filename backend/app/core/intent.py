@@ -0,0 +1,233 @@
+"""
+IntentClassifier — local intent classification for chat messages.
+
+Choosing between five intent labels does not need an LLM round trip on
+every message. The classifier combines:
+
+  - keyword rules: phrases that all but decide a label
+  - multinomial naive Bayes over word unigrams + bigrams, trained on
+    seed examples plus every intent the LLM has decided before
+    (settings.INTENT_LOG_PATH, one JSON line per decision, holding the
+    normalised query only; past settings.INTENT_LOG_MAX_ENTRIES lines it
+    is compacted to the newest decision per query)
+
+predict() runs in microseconds. ModelRouter only asks the LLM when the
+local confidence is below settings.INTENT_CONFIDENCE_THRESHOLD, caches
+that answer by normalised query, and feeds it back with learn() so the
+local model improves with use.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+INTENTS = ("risk_analysis", "team_query", "simulation", "financial", "general")
+
+KEYWORD_RULES: Dict[str, Tuple[str, ...]] = {
+    "risk_analysis": (
+        "risk", "at risk", "blocked", "blocker", "overdue", "deadline", "delay",
+        "slip", "late", "why is", "health", "bottleneck", "dependency",
+    ),
+    "team_query": (
+        "team", "who is", "who's", "member", "workload", "assigned", "assignee",
+        "burnout", "overloaded", "capacity", "engineer on", "people",
+    ),
+    "simulation": (
+        "what if", "simulate", "simulation", "scenario", "if we add", "if we remove",
+        "add an engineer", "hire", "reduce scope", "escalate", "monte carlo", "forecast",
+    ),
+    "financial": (
+        "cost", "budget", "spend", "money", "roi", "price", "expensive",
+        "salary", "dollar", "$", "finance", "financial",
+    ),
+    "general": (
+        "hello", "hi", "thanks", "thank you", "help", "what can you do",
+    ),
+}
+
+# Seed examples so the model is useful before any intent has been logged
+SEED_EXAMPLES: Tuple[Tuple[str, str], ...] = (
+    ("why is the blockchain app at risk", "risk_analysis"),
+    ("which tickets are blocked or overdue", "risk_analysis"),
+    ("will we hit the deadline for alpha", "risk_analysis"),
+    ("what is slowing this project down", "risk_analysis"),
+    ("who is working on the analytics dashboard", "team_query"),
+    ("which team members are overloaded", "team_query"),
+    ("show me the workload of the datalis team", "team_query"),
+    ("who owns the wallet connection ticket", "team_query"),
+    ("what if we add a senior engineer", "simulation"),
+    ("simulate removing a junior developer from the team", "simulation"),
+    ("what happens if we reduce scope", "simulation"),
+    ("should we escalate the dependency or accept the delay", "simulation"),
+    ("how much will adding an engineer cost", "financial"),
+    ("what is the budget impact of the delay", "financial"),
+    ("what is the roi of escalating", "financial"),
+    ("how much are we spending on this project", "financial"),
+    ("hello", "general"),
+    ("what can you do", "general"),
+    ("summarise the project", "general"),
+    ("thanks that helps", "general"),
+)
+
+RULE_WEIGHT = 1.5   # Log-odds added per keyword hit
+CACHE_SIZE = 2048
+
+_TOKEN_RE = re.compile(r"[a-z0-9$']+")
+
+
+def normalise_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(_TOKEN_RE.findall(query.lower()))
+
+
+def _features(text: str) -> List[str]:
+    words = text.split()
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class IntentClassifier:
+    """Keyword rules + naive Bayes, with an LRU cache of LLM decisions."""
+
+    def __init__(self, log_path: Optional[str] = None):
+        self.log_path = log_path if log_path is not None else settings.INTENT_LOG_PATH
+        self._lock = threading.Lock()
+        self._word_counts: Dict[str, Dict[str, int]] = {i: {} for i in INTENTS}
+        self._total_words: Dict[str, int] = {i: 0 for i in INTENTS}
+        self._doc_counts: Dict[str, int] = {i: 0 for i in INTENTS}
+        self._vocab: set = set()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._log_lines = 0
+
+        for query, intent in SEED_EXAMPLES:
+            self._fit_one(normalise_query(query), intent)
+        self._load_log()
+
+    # ── Training ──────────────────────────────────────────────────────────
+
+    def _fit_one(self, text: str, intent: str):
+        counts = self._word_counts[intent]
+        for f in _features(text):
+            counts[f] = counts.get(f, 0) + 1
+            self._total_words[intent] += 1
+            self._vocab.add(f)
+        self._doc_counts[intent] += 1
+
+    def _read_log(self) -> List[Tuple[str, str]]:
+        """The newest INTENT_LOG_MAX_ENTRIES valid (normalised query, intent) rows."""
+        rows: "deque[Tuple[str, str]]" = deque(maxlen=settings.INTENT_LOG_MAX_ENTRIES)
+        self._log_lines = 0
+        if not self.log_path or not os.path.exists(self.log_path):
+            return []
+        try:
+            with open(self.log_path) as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    if row.get("intent") in INTENTS and row.get("query"):
+                        rows.append((normalise_query(row["query"]), row["intent"]))
+        except OSError as e:
+            logger.warning(f"Could not read intent log {self.log_path}: {e}")
+        return list(rows)
+
+    def _load_log(self):
+        rows = self._read_log()
+        for text, intent in rows:
+            self._fit_one(text, intent)
+            self._cache_put(text, intent)
+        logger.info(f"IntentClassifier trained on {len(SEED_EXAMPLES)} seed + {len(rows)} logged intents")
+
+    def _compact_log(self):
+        """Rewrite the log as the newest decision per query, half the cap at most."""
+        latest: "OrderedDict[str, str]" = OrderedDict()
+        for text, intent in self._read_log():
+            latest[text] = intent
+            latest.move_to_end(text)
+        keep = list(latest.items())[-(settings.INTENT_LOG_MAX_ENTRIES // 2):]
+        tmp = f"{self.log_path}.tmp"
+        with open(tmp, "w") as f:
+            for text, intent in keep:
+                f.write(json.dumps({"query": text, "intent": intent}) + "\n")
+        os.replace(tmp, self.log_path)
+        self._log_lines = len(keep)
+
+    def learn(self, query: str, intent: str):
+        """Record an authoritative (LLM) decision: cache, fit and log it."""
+        if intent not in INTENTS:
+            return
+        text = normalise_query(query)
+        if not text:
+            return
+        with self._lock:
+            self._fit_one(text, intent)
+            self._cache_put(text, intent)
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a") as f:
+                        f.write(json.dumps({"query": text, "intent": intent}) + "\n")
+                    self._log_lines += 1
+                    if self._log_lines > settings.INTENT_LOG_MAX_ENTRIES:
+                        self._compact_log()
+                except OSError as e:
+                    logger.warning(f"Could not write intent log {self.log_path}: {e}")
+
+    # ── Cache ─────────────────────────────────────────────────────────────
+
+    def _cache_put(self, text: str, intent: str):
+        self._cache[text] = intent
+        self._cache.move_to_end(text)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def cached(self, query: str) -> Optional[str]:
+        """A previous LLM decision for this normalised query, if any."""
+        text = normalise_query(query)
+        with self._lock:
+            intent = self._cache.get(text)
+            if intent is not None:
+                self._cache.move_to_end(text)
+            return intent
+
+    # ── Prediction ────────────────────────────────────────────────────────
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        """Return (intent, confidence in [0, 1]) without any network call."""
+        text = normalise_query(query)
+        if not text:
+            return "general", 1.0
+        padded = f" {text} "
+        features = _features(text)
+
+        with self._lock:
+            total_docs = sum(self._doc_counts.values())
+            V = len(self._vocab) + 1
+            scores = {}
+            for intent in INTENTS:
+                counts = self._word_counts[intent]
+                denom = self._total_words[intent] + V
+                score = math.log((self._doc_counts[intent] + 1) / (total_docs + len(INTENTS)))
+                score += sum(math.log((counts.get(f, 0) + 1) / denom) for f in features)
+                hits = sum(1 for kw in KEYWORD_RULES[intent] if f" {kw} " in padded or (kw == "$" and "$" in text))
+                scores[intent] = score + RULE_WEIGHT * hits
+
+        # Softmax over log scores → posterior-like confidence
+        top = max(scores.values())
+        exp = {i: math.exp(s - top) for i, s in scores.items()}
+        z = sum(exp.values())
+        intent = max(exp, key=exp.get)
+        return intent, exp[intent] / z
+
+
+# Singleton
+intent_classifier = IntentClassifier()
@@ -0,0 +1,235 @@
+"""
+JobManager — background jobs with streamed results and cancellation.
+
+Long simulation batches should not hold an HTTP request open until the
+last item finishes. A job wraps a generator of result dicts:
+
+  submit  → returns a Job immediately; the generator runs on a bounded
+            thread pool (settings.JOB_WORKERS)
+  events  → async iterator over results as they are produced, replayed
+            from the start for late subscribers (drives SSE endpoints)
+  cancel  → stops the job between results; queued jobs never start
+
+Each owner may have at most settings.JOB_MAX_PER_USER unfinished jobs.
+The owner is the identity the server resolved for the request; the
+user_id a client sends is only a label and never counts toward a limit.
+Finished jobs are kept for settings.JOB_TTL_SECONDS so clients can
+reconnect and read them.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETED, CANCELLED, FAILED)
+
+
+class JobLimitError(Exception):
+    """Raised when an owner already has the maximum number of unfinished jobs."""
+
+
+class Job:
+    """One submitted job: its status, results so far and subscribers."""
+    __slots__ = (
+        "id", "owner", "user_id", "kind", "total", "status", "results", "error",
+        "created_at", "finished_at", "future",
+        "_lock", "_cancel", "_subscribers",
+    )
+
+    def __init__(self, owner: str, user_id: str, kind: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.user_id = user_id
+        self.kind = kind
+        self.total = total
+        self.status = QUEUED
+        self.results: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._subscribers: List[Callable[[], None]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def _notify(self):
+        for wake in list(self._subscribers):
+            try:
+                wake()
+            except RuntimeError:  # Subscriber's event loop already closed
+                pass
+
+    def _append(self, result: Dict[str, Any]):
+        with self._lock:
+            self.results.append(result)
+        self._notify()
+
+    def _finish(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+        self._notify()
+
+    def snapshot(self, start: int = 0) -> Dict[str, Any]:
+        """Status plus results from index `start` onwards."""
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "total": self.total,
+                "completed": len(self.results),
+                "error": self.error,
+                "results": self.results[start:],
+            }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.snapshot(),
+            "user_id": self.user_id,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Runs jobs on a bounded thread pool with per-owner limits."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or settings.JOB_WORKERS
+        self.max_per_user = max_per_user or settings.JOB_MAX_PER_USER
+        self.ttl_seconds = ttl_seconds or settings.JOB_TTL_SECONDS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def submit(
+        self,
+        owner: str,
+        user_id: str,
+        kind: str,
+        work: Callable[[], Iterable[Dict[str, Any]]],
+        total: int,
+    ) -> Job:
+        """
+        Queue `work` — a callable returning an iterable of result dicts,
+        evaluated lazily on a pool thread. `owner` is the server-resolved
+        identity the limit is keyed on; `user_id` is recorded as given.
+        Raises JobLimitError when the owner is at their limit.
+        """
+        with self._lock:
+            self._purge()
+            active = sum(1 for j in self._jobs.values() if j.owner == owner and not j.finished)
+            if active >= self.max_per_user:
+                raise JobLimitError(
+                    f"Already {active} unfinished jobs from this client (limit {self.max_per_user})"
+                )
+            job = Job(owner, user_id, kind, total)
+            self._jobs[job.id] = job
+            job.future = self._pool.submit(self._run, job, work)
+        logger.info(f"Job {job.id} ({kind}, {total} items) queued for {user_id}")
+        return job
+
+    def _run(self, job: Job, work: Callable[[], Iterable[Dict[str, Any]]]):
+        if job.cancel_requested:
+            job._finish(CANCELLED)
+            return
+        with job._lock:
+            job.status = RUNNING
+        job._notify()
+        try:
+            for result in work():
+                job._append(result)
+                if job.cancel_requested:
+                    job._finish(CANCELLED)
+                    return
+            job._finish(COMPLETED)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job._finish(FAILED, str(e))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; returns the job, or None if unknown."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job._finish(CANCELLED)  # Never started
+        return job
+
+    async def events(self, job: Job) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield {"type": "result", "index", "data"} for every result (past
+        and future), then one {"type": "end", "status", "error"}.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def notify():
+            loop.call_soon_threadsafe(wake.set)
+
+        job._subscribers.append(notify)
+        try:
+            cursor = 0
+            while True:
+                wake.clear()
+                snap = job.snapshot(cursor)
+                for offset, result in enumerate(snap["results"]):
+                    yield {"type": "result", "index": cursor + offset, "data": result}
+                cursor += len(snap["results"])
+                if snap["status"] in FINISHED_STATES:
+                    yield {"type": "end", "status": snap["status"], "error": snap["error"]}
+                    return
+                await wake.wait()
+        finally:
+            job._subscribers.remove(notify)
+
+    def shutdown(self):
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                job._cancel.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for job in list(self._jobs.values()):
+            if not job.finished and job.future is not None and job.future.cancelled():
+                job._finish(CANCELLED)  # Dropped from the queue, never started
+
+
+# Singleton
+job_manager = JobManager()
@@ -0,0 +1,250 @@
+"""
+LLMScheduler — admission control in front of every LLM call.
+
+Report generation can burst far above the provider's rate limit and
+leave interactive chat queued behind it. Every call waits here for a
+slot before it reaches Featherless:
+
+  - priority classes: INTERACTIVE (intent, chat) is always admitted
+    before BATCH (reports, postmortems, narratives); FIFO within a class
+  - a global concurrency cap (settings.LLM_MAX_CONCURRENCY), of which
+    BATCH may hold at most LLM_BATCH_CONCURRENCY so chat always has room
+  - a token bucket of LLM_RATE_PER_SECOND requests, bursting to
+    LLM_RATE_BURST
+  - 429 responses pause admission for the provider's Retry-After (or the
+    base backoff) and the call is re-queued after a jittered exponential
+    delay, up to LLM_MAX_RETRIES times
+
+Streams hold their slot until the last token. Queue depth, waits and
+retries are exposed on /api/metrics.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from openai import RateLimitError
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "future", "enqueued_at")
+
+    def __init__(self, priority: Priority, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """Priority admission with a concurrency cap, token bucket and 429 backoff."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        batch_concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.batch_concurrency = min(batch_concurrency or settings.LLM_BATCH_CONCURRENCY, self.max_concurrency)
+        self.rate = rate_per_second or settings.LLM_RATE_PER_SECOND
+        self.burst = burst or settings.LLM_RATE_BURST
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: List[_Waiter] = []
+        self._active: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._seq = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.stats = {
+            p: {"admitted": 0, "wait_total": 0.0, "wait_max": 0.0, "max_queue": 0, "retries": 0, "rate_limited": 0}
+            for p in Priority
+        }
+
+    # ── Admission ─────────────────────────────────────────────────────────
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _has_room(self, priority: Priority) -> bool:
+        if sum(self._active.values()) >= self.max_concurrency:
+            return False
+        return priority != Priority.BATCH or self._active[Priority.BATCH] < self.batch_concurrency
+
+    def _dispatch(self):
+        """Admit waiters in (priority, arrival) order while slots and tokens allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        self._waiters = [w for w in self._waiters if not w.future.done()]
+        self._waiters.sort(key=lambda w: (w.priority, w.seq))
+
+        for waiter in list(self._waiters):
+            if now < self._paused_until or self._tokens < 1.0:
+                break
+            if not self._has_room(waiter.priority):
+                continue  # e.g. BATCH at its cap — an INTERACTIVE waiter behind it may still fit
+            self._waiters.remove(waiter)
+            self._tokens -= 1.0
+            self._admit(waiter.priority, now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+        if self._waiters and self._timer is None:
+            delay = max(self._paused_until - now, (1.0 - self._tokens) / self.rate, 0.0)
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _admit(self, priority: Priority, waited: float):
+        self._active[priority] += 1
+        s = self.stats[priority]
+        s["admitted"] += 1
+        s["wait_total"] += waited
+        s["wait_max"] = max(s["wait_max"], waited)
+
+    async def _acquire(self, priority: Priority):
+        loop = asyncio.get_running_loop()
+        self._seq += 1
+        waiter = _Waiter(priority, self._seq, loop.create_future())
+        self._waiters.append(waiter)
+        depth = sum(1 for w in self._waiters if w.priority == priority)
+        self.stats[priority]["max_queue"] = max(self.stats[priority]["max_queue"], depth)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(priority)  # Admitted just as the caller gave up
+            raise
+
+    def _release(self, priority: Priority):
+        self._active[priority] -= 1
+        self._dispatch()
+
+    # ── Rate limiting ─────────────────────────────────────────────────────
+
+    def _backoff(self, priority: Priority, attempt: int, error: RateLimitError) -> float:
+        """Pause admission for Retry-After; return this call's jittered delay."""
+        retry_after = None
+        try:
+            retry_after = float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            pass
+        pause = retry_after if retry_after is not None else settings.LLM_RETRY_BASE
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        self.stats[priority]["retries"] += 1
+
+        # Full jitter so paused callers do not all come back at once
+        ceiling = min(settings.LLM_RETRY_MAX, settings.LLM_RETRY_BASE * 2 ** attempt)
+        delay = max(pause, random.uniform(0, ceiling))
+        logger.warning(f"LLM rate limited (429); retry {attempt}/{self.max_retries} in {delay:.2f}s")
+        return delay
+
+    def _give_up(self, priority: Priority):
+        self.stats[priority]["rate_limited"] += 1
+
+    # ── Entry points ──────────────────────────────────────────────────────
+
+    async def call(self, priority: Priority, request: Callable[[], Awaitable[T]]) -> T:
+        """Run `request` once admitted, retrying on 429."""
+        attempt = 0
+        while True:
+            await self._acquire(priority)
+            try:
+                return await request()
+            except RateLimitError as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._give_up(priority)
+                    raise
+                delay = self._backoff(priority, attempt, e)
+            finally:
+                self._release(priority)
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        priority: Priority,
+        open_stream: Callable[[], Awaitable[AsyncIterator[Any]]],
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate the stream returned by `open_stream`, holding the slot until
+        it ends. Opening is retried on 429; a stream that has started is not.
+        """
+        attempt = 0
+        while True:
+            await self._acquire(priority)
+            try:
+                stream = await open_stream()
+            except RateLimitError as e:
+                self._release(priority)
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._give_up(priority)
+                    raise
+                await asyncio.sleep(self._backoff(priority, attempt, e))
+                continue
+            except BaseException:
+                self._release(priority)
+                raise
+            try:
+                async for item in stream:
+                    yield item
+            finally:
+                self._release(priority)
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    await close()
+            return
+
+    # ── Metrics ───────────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        self._refill(now)
+        waiting = [w for w in self._waiters if not w.future.done()]
+        classes = {}
+        for p in Priority:
+            s = self.stats[p]
+            classes[p.name.lower()] = {
+                "queued": sum(1 for w in waiting if w.priority == p),
+                "active": self._active[p],
+                "admitted": s["admitted"],
+                "avg_wait_ms": round(s["wait_total"] / s["admitted"] * 1000, 1) if s["admitted"] else None,
+                "max_wait_ms": round(s["wait_max"] * 1000, 1),
+                "max_queue_depth": s["max_queue"],
+                "retries_429": s["retries"],
+                "gave_up_429": s["rate_limited"],
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "batch_concurrency": self.batch_concurrency,
+            "rate_per_second": self.rate,
+            "bucket_tokens": round(self._tokens, 2),
+            "paused_for_ms": round(max(self._paused_until - now, 0.0) * 1000, 1),
+            "classes": classes,
+        }
+
+
+# Singleton
+llm_scheduler = LLMScheduler()
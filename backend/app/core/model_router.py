@@ -12,9 +12,12 @@ All models go through Featherless API with same base URL / key.
 """
 
 from enum import Enum
-from typing import List, Dict, Generator, Optional
-from openai import OpenAI
+from typing import AsyncGenerator, List, Dict, Optional
+from openai import AsyncOpenAI
 from .config import settings
+from .http import llm_transport
+from .llm_scheduler import llm_scheduler, Priority
+from .intent import intent_classifier
 import logging
 import time
 
@@ -30,13 +33,23 @@ class TaskType(Enum):
 
 
 class _ModelConfig:
-    __slots__ = ("model_id", "max_tokens", "temperature", "system_prompt")
+    __slots__ = ("model_id", "max_tokens", "temperature", "system_prompt", "timeout", "priority")
 
-    def __init__(self, model_id: str, max_tokens: int, temperature: float, system_prompt: str):
+    def __init__(
+        self,
+        model_id: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: str,
+        timeout: float,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
         self.model_id = model_id
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.system_prompt = system_prompt
+        self.timeout = timeout  # Seconds per request (streams: per read)
+        self.priority = priority  # Default LLMScheduler class; interactive callers override it
 
 
 # ── System prompts per task type ──────────────────────────────────────────
@@ -83,30 +96,37 @@ MODEL_REGISTRY: Dict[TaskType, _ModelConfig] = {
         max_tokens=20,
         temperature=0.0,
         system_prompt=_SYSTEM_PROMPTS[TaskType.INTENT],
+        timeout=10.0,
     ),
     TaskType.REASONING: _ModelConfig(
         model_id="Qwen/Qwen2.5-32B-Instruct",
         max_tokens=800,
         temperature=0.3,
         system_prompt=_SYSTEM_PROMPTS[TaskType.REASONING],
+        timeout=45.0,
     ),
     TaskType.EXPLANATION: _ModelConfig(
         model_id="Qwen/Qwen2.5-32B-Instruct",
         max_tokens=1000,
         temperature=0.4,
         system_prompt=_SYSTEM_PROMPTS[TaskType.EXPLANATION],
+        timeout=60.0,
     ),
     TaskType.POSTMORTEM: _ModelConfig(
         model_id="Qwen/Qwen2.5-32B-Instruct",
         max_tokens=1500,
         temperature=0.2,
         system_prompt=_SYSTEM_PROMPTS[TaskType.POSTMORTEM],
+        priority=Priority.BATCH,
+        timeout=120.0,
     ),
     TaskType.SUMMARY: _ModelConfig(
         model_id="Qwen/Qwen2.5-32B-Instruct",
         max_tokens=300,
         temperature=0.3,
         system_prompt=_SYSTEM_PROMPTS[TaskType.SUMMARY],
+        priority=Priority.BATCH,
+        timeout=30.0,
     ),
 }
 
@@ -128,28 +148,41 @@ class ModelRouter:
     """
 
     def __init__(self):
-        self.client = OpenAI(
+        # Pooled LLM transport; LLMScheduler owns 429 retries, so the
+        # SDK's own are off
+        self.async_client = AsyncOpenAI(
             base_url=settings.FEATHERLESS_BASE_URL,
             api_key=settings.FEATHERLESS_API_KEY,
+            http_client=llm_transport.async_client,
+            max_retries=0,
         )
+        self.intent_stats = {"local": 0, "cached": 0, "llm": 0, "llm_failed": 0}
 
-    # ── Core dispatch ─────────────────────────────────────────────────────
+    # ── Core dispatch (every call is admitted by llm_scheduler) ───────────
 
-    def generate(
+    async def agenerate(
         self,
         task: TaskType,
         messages: List[Dict[str, str]],
+        priority: Optional[Priority] = None,
     ) -> str:
-        """Synchronous generation with task-specific model + prompt."""
+        """
+        Generation with task-specific model + prompt, admitted by
+        llm_scheduler at `priority` (default: the task's).
+        """
         cfg = MODEL_REGISTRY[task]
         full = [{"role": "system", "content": cfg.system_prompt}] + messages
         try:
             t0 = time.time()
-            resp = self.client.chat.completions.create(
-                model=cfg.model_id,
-                messages=full,
-                temperature=cfg.temperature,
-                max_tokens=cfg.max_tokens,
+            resp = await llm_scheduler.call(
+                cfg.priority if priority is None else priority,
+                lambda: self.async_client.chat.completions.create(
+                    model=cfg.model_id,
+                    messages=full,
+                    temperature=cfg.temperature,
+                    max_tokens=cfg.max_tokens,
+                    timeout=cfg.timeout,
+                ),
             )
             elapsed = time.time() - t0
             logger.info(f"ModelRouter [{task.value}] model={cfg.model_id} tokens={resp.usage.total_tokens if resp.usage else '?'} time={elapsed:.1f}s")
@@ -158,60 +191,85 @@ class ModelRouter:
             logger.error(f"ModelRouter [{task.value}] error: {e}")
             raise RuntimeError(f"LLM [{task.value}] failed: {e}") from e
 
-    def stream(
+    async def astream(
         self,
         task: TaskType,
         messages: List[Dict[str, str]],
-    ) -> Generator[str, None, None]:
-        """Streaming generation — yields tokens as they arrive."""
+        priority: Optional[Priority] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Streaming agenerate() — yields tokens as they arrive; holds a scheduler slot throughout."""
         cfg = MODEL_REGISTRY[task]
         full = [{"role": "system", "content": cfg.system_prompt}] + messages
-        try:
-            stream = self.client.chat.completions.create(
+        stream = llm_scheduler.stream(
+            cfg.priority if priority is None else priority,
+            lambda: self.async_client.chat.completions.create(
                 model=cfg.model_id,
                 messages=full,
                 temperature=cfg.temperature,
                 max_tokens=cfg.max_tokens,
+                timeout=cfg.timeout,
                 stream=True,
-            )
-            for chunk in stream:
+            ),
+        )
+        try:
+            async for chunk in stream:
                 delta = chunk.choices[0].delta if chunk.choices else None
                 if delta and delta.content:
                     yield delta.content
         except Exception as e:
             logger.error(f"ModelRouter stream [{task.value}] error: {e}")
             yield f"[ERROR] {e}"
+        finally:
+            await stream.aclose()  # Frees the scheduler slot if the consumer stops early
 
     # ── Intent classification ─────────────────────────────────────────────
 
-    def classify_intent(self, query: str) -> str:
-        """Use fast model to classify user intent into a category."""
+    @staticmethod
+    def _normalise_intent(raw: str) -> str:
+        intent = raw.strip().lower().replace('"', "").replace("'", "")
+        # Normalise to known categories
+        return intent if intent in INTENT_TO_TASK else "general"
+
+    def _local_intent(self, query: str) -> tuple:
+        """
+        (intent, decided) from the local classifier or the cache of earlier
+        LLM decisions; decided is False when the LLM should be asked.
+        """
+        cached = intent_classifier.cached(query)
+        if cached is not None:
+            self.intent_stats["cached"] += 1
+            return cached, True
+        intent, confidence = intent_classifier.predict(query)
+        if confidence >= settings.INTENT_CONFIDENCE_THRESHOLD:
+            self.intent_stats["local"] += 1
+            return intent, True
+        return intent, False
+
+    async def aclassify_intent(self, query: str) -> str:
+        """
+        Classify user intent locally; only low-confidence queries go to the
+        fast model, and its answer is cached and learned from.
+        """
+        guess, decided = self._local_intent(query)
+        if decided:
+            return guess
         try:
-            raw = self.generate(
+            raw = await self.agenerate(
                 TaskType.INTENT,
                 [{"role": "user", "content": f"Query: {query}"}],
+                priority=Priority.INTERACTIVE,
             )
-            intent = raw.strip().lower().replace('"', "").replace("'", "")
-            # Normalise to known categories
-            if intent not in INTENT_TO_TASK:
-                intent = "general"
+            intent = self._normalise_intent(raw)
+            intent_classifier.learn(query, intent)
+            self.intent_stats["llm"] += 1
             return intent
         except Exception:
-            return "general"
+            self.intent_stats["llm_failed"] += 1
+            return guess
 
     def task_for_intent(self, intent: str) -> TaskType:
         return INTENT_TO_TASK.get(intent, TaskType.EXPLANATION)
 
-    # ── Convenience helpers ───────────────────────────────────────────────
-
-    def chat(self, messages: List[Dict[str, str]], temperature: float = 0.4) -> str:
-        """Drop-in replacement for the old llm_client.chat()"""
-        return self.generate(TaskType.EXPLANATION, messages)
-
-    def chat_stream(self, messages: List[Dict[str, str]], temperature: float = 0.4) -> Generator[str, None, None]:
-        """Drop-in replacement for the old llm_client.chat_stream()"""
-        return self.stream(TaskType.EXPLANATION, messages)
-
 
 # Singleton
 model_router = ModelRouter()
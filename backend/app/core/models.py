@@ -23,6 +23,7 @@ class DecisionComparison(BaseModel):
     feasible: bool
     recommended: bool
     reason: str             # Why recommended or rejected
+    n_trials: int = 0       # Monte Carlo trials behind the estimate
 
 
 class AnalysisResult(BaseModel):
@@ -0,0 +1,137 @@
+"""
+Token coalescing for SSE responses.
+
+ModelRouter.astream yields one small delta per token. Writing each as its
+own `data:` frame costs a write, a flush and per-frame parsing in every
+proxy and browser along the way. coalesce_tokens() merges deltas into
+frames, flushing when either
+
+  - settings.SSE_FLUSH_MS have passed since the frame's first token, or
+  - the frame holds settings.SSE_FLUSH_BYTES bytes,
+
+and at the end of the stream. A slow model still gets its tokens out
+within the window; a fast one sends a few hundred bytes per frame.
+
+StreamMetrics records token frames per response for each stream kind
+(exposed on /api/metrics) so the window can be tuned against proxy
+buffering.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class StreamMetrics:
+    """Per-kind counters of tokens in and frames out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kinds: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, tokens: int, frames: int, nbytes: int):
+        with self._lock:
+            k = self._kinds.setdefault(
+                kind, {"responses": 0, "tokens": 0, "frames": 0, "bytes": 0, "max_frames": 0},
+            )
+            k["responses"] += 1
+            k["tokens"] += tokens
+            k["frames"] += frames
+            k["bytes"] += nbytes
+            k["max_frames"] = max(k["max_frames"], frames)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            kinds = {
+                kind: {
+                    "responses": k["responses"],
+                    "token_frames": k["frames"],
+                    "tokens": k["tokens"],
+                    "avg_frames_per_response": round(k["frames"] / k["responses"], 1),
+                    "max_frames_per_response": k["max_frames"],
+                    "avg_tokens_per_frame": round(k["tokens"] / k["frames"], 1) if k["frames"] else None,
+                    "avg_bytes_per_frame": round(k["bytes"] / k["frames"], 1) if k["frames"] else None,
+                }
+                for kind, k in self._kinds.items()
+            }
+        return {
+            "flush_ms": settings.SSE_FLUSH_MS,
+            "flush_bytes": settings.SSE_FLUSH_BYTES,
+            "streams": kinds,
+        }
+
+
+async def coalesce_tokens(
+    tokens: AsyncIterator[str],
+    kind: str,
+    flush_ms: Optional[float] = None,
+    flush_bytes: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Merge token deltas into frames (see module docstring). "[ERROR] …"
+    tokens are never merged, so consumers can still recognise them.
+    """
+    window = (settings.SSE_FLUSH_MS if flush_ms is None else flush_ms) / 1000.0
+    max_bytes = settings.SSE_FLUSH_BYTES if flush_bytes is None else flush_bytes
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for token in tokens:
+                queue.put_nowait(token)
+        finally:
+            queue.put_nowait(_END)
+
+    reader = asyncio.create_task(pump())
+    n_tokens = n_frames = n_bytes = 0
+    buffer, size, deadline = [], 0, None
+    try:
+        while True:
+            timeout = None if deadline is None else max(deadline - loop.time(), 0.0)
+            try:
+                token = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                token = None  # Window elapsed
+            if token is _END:
+                break
+
+            if token is not None and not token.startswith("[ERROR]"):
+                n_tokens += 1
+                buffer.append(token)
+                size += len(token.encode())
+                if deadline is None:
+                    deadline = loop.time() + window
+                if size < max_bytes and loop.time() < deadline:
+                    continue
+
+            if buffer:
+                n_frames += 1
+                n_bytes += size
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+            if token is not None and token.startswith("[ERROR]"):
+                n_frames += 1
+                yield token
+
+        if buffer:
+            n_frames += 1
+            n_bytes += size
+            yield "".join(buffer)
+        await reader  # Re-raise a failure of the token source
+    finally:
+        if not reader.done():
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        stream_metrics.record(kind, n_tokens, n_frames, n_bytes)
+
+
+# Singleton
+stream_metrics = StreamMetrics()
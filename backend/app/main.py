@@ -3,18 +3,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+import asyncio
+import json
 import logging
+import re
 import time
 from .agents.risk import DeliveryRiskAgent
-from .agents.team_simulator import TeamCompositionSimulator, TeamMutation, ROLE_PROFILES, team_simulator
+from .agents.team_simulator import (
+    TeamCompositionSimulator, TeamMutation, TeamScenario, ROLE_PROFILES,
+    MAX_SCENARIO_STEPS, MAX_SWEEP_CELLS, team_simulator,
+)
+from .agents.executor import simulation_executor
+from .agents.delivery_sim import delivery_simulator, DELIVERY_TRIALS
+from .agents.portfolio import PortfolioOptimizer, team_mutations
+from .agents.reallocation import ReallocationOptimizer, SLOTS_PER_PROJECT
+from .agents.sensitivity import SensitivityAnalyzer, SENSITIVITY_TRIALS, MAX_SENSITIVITY_TRIALS
 from .core.models import AnalysisResult, RiskSnapshot
 from .core.constants import ROLE_DEFINITIONS
 from .core.config import settings
 from .api.routes import router as crud_router
 from .core.neo4j_client import neo4j_client
-from .core.llm import llm_client
-from .core.model_router import model_router, TaskType
+from .core.model_router import model_router, TaskType, MODEL_REGISTRY
+from .core.llm_scheduler import llm_scheduler, Priority
 from .core.context_manager import context_assembler
+from .core.jobs import job_manager, JobLimitError
+from .core.http import llm_transport
+from .core.documents import document_cache, document_fingerprint, document_scheduler
+from .core.streaming import coalesce_tokens, stream_metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -51,11 +66,22 @@ def _set_cached_risk(project_id: str, result: AnalysisResult):
     _risk_cache[project_id] = {"result": result, "ts": time.time()}
 
 
+# ── Startup: background pre-generation of narratives and the company report ──
+@app.on_event("startup")
+async def startup_event():
+    if settings.DOCUMENT_PRECOMPUTE:
+        document_scheduler.start()
+
+
 # ── Shutdown: close Neo4j driver ──
 @app.on_event("shutdown")
 async def shutdown_event():
+    await document_scheduler.stop()
     neo4j_client.close()
     logger.info("Neo4j connection closed")
+    simulation_executor.shutdown()
+    job_manager.shutdown()
+    await llm_transport.aclose()
 
 
 # Include CRUD routes
@@ -63,6 +89,9 @@ app.include_router(crud_router)
 
 # Initialize risk agent (reads Neo4j directly)
 risk_agent = DeliveryRiskAgent()
+portfolio_optimizer = PortfolioOptimizer(risk_agent.simulator, team_simulator)
+sensitivity_analyzer = SensitivityAnalyzer(risk_agent.simulator, team_simulator)
+reallocation_optimizer = ReallocationOptimizer(team_simulator)
 
 
 @app.get("/api/analyze/{project_id}", response_model=AnalysisResult)
@@ -76,7 +105,7 @@ async def analyze_project(project_id: str):
         cached = _get_cached_risk(project_id)
         if cached:
             return cached
-        result = risk_agent.analyze(project_id)
+        result = await risk_agent.aanalyze(project_id)
         _set_cached_risk(project_id, result)
         return result
     except Exception as e:
@@ -95,7 +124,7 @@ class ChatRequest(BaseModel):
     messages: List[ChatMessage]
 
 
-def _build_project_context(project_id: str) -> str:
+async def _build_project_context(project_id: str) -> str:
     """Build a rich context block from Neo4j for the given project using ContextAssembler."""
     try:
         # Get risk analysis result from cache or run fresh
@@ -103,40 +132,163 @@ def _build_project_context(project_id: str) -> str:
         try:
             risk_result = _get_cached_risk(project_id)
             if not risk_result:
-                risk_result = risk_agent.analyze(project_id)
+                risk_result = await risk_agent.aanalyze(project_id, priority=Priority.INTERACTIVE)
                 _set_cached_risk(project_id, risk_result)
         except Exception:
             pass
 
-        ctx = context_assembler.assemble_project_context(project_id, risk_result)
+        ctx = await asyncio.to_thread(context_assembler.assemble_project_context, project_id, risk_result)
         return f"{ctx}\n=== END CONTEXT ==="
     except Exception as e:
         return f"Error loading project context: {str(e)}"
 
 
-@app.post("/api/chat")
-async def chat_endpoint(req: ChatRequest):
+# Task generation starts with while a low-confidence intent is still being
+# classified by the LLM — what task_for_intent() falls back to.
+SPECULATIVE_CHAT_TASK = model_router.task_for_intent("general")
+
+
+async def _prepare_chat(req: ChatRequest):
     """
-    Conversational AI chat — answers questions about projects using real Neo4j data.
-    Uses ModelRouter for intent classification and task-specific model selection.
+    Assemble project context (it may run risk_agent.aanalyze) while intent
+    classification runs alongside it. Returns (messages, intent_task);
+    intent_task is usually already done, since most intents are decided
+    locally.
     """
-    try:
-        # Build context from project data
-        context = ""
-        if req.project_id:
-            context = _build_project_context(req.project_id)
+    user_query = req.messages[-1].content if req.messages else ""
+    intent_task = asyncio.create_task(model_router.aclassify_intent(user_query))
+
+    context = ""
+    if req.project_id:
+        try:
+            context = await _build_project_context(req.project_id)
+        except BaseException:
+            intent_task.cancel()
+            raise
+    else:
+        await asyncio.sleep(0)  # Let a local classification finish before deciding to speculate
+
+    # Inject context into first user message
+    messages = [{"role": m.role, "content": m.content} for m in req.messages]
+    if context and messages:
+        messages[0]["content"] = f"{context}\n\nUser question: {messages[0]['content']}"
+    return messages, intent_task
+
+
+# Speculative chat generations: started, kept on a matching intent, cancelled otherwise
+speculation_stats = {"started": 0, "kept": 0, "cancelled": 0}
+
+
+def _speculate(intent_task: "asyncio.Task", speculative: "asyncio.Task"):
+    """
+    Tie `speculative` to the intent: it is cancelled the moment
+    intent_task resolves to a different task (or fails), not when the
+    caller next gets to run.
+    """
+    speculation_stats["started"] += 1
+
+    def settle(done: "asyncio.Task"):
+        if (
+            not done.cancelled() and done.exception() is None
+            and model_router.task_for_intent(done.result()) == SPECULATIVE_CHAT_TASK
+        ):
+            speculation_stats["kept"] += 1
+            return
+        if speculative.cancel():
+            speculation_stats["cancelled"] += 1
+
+    intent_task.add_done_callback(settle)
+
+
+async def _routed_generate(messages: List[Dict[str, str]], intent_task: "asyncio.Task"):
+    """
+    (intent, task, response). If the intent is still pending, generation
+    starts speculatively with SPECULATIVE_CHAT_TASK and is kept when the
+    classified task matches; otherwise it is cancelled and rerun.
+    """
+    if not intent_task.done():
+        speculative = asyncio.create_task(
+            model_router.agenerate(SPECULATIVE_CHAT_TASK, messages, priority=Priority.INTERACTIVE)
+        )
+        _speculate(intent_task, speculative)
+        try:
+            intent = await intent_task
+        except BaseException:
+            speculative.cancel()
+            raise
+        task = model_router.task_for_intent(intent)
+        if task == SPECULATIVE_CHAT_TASK:
+            return intent, task, await speculative
+        await asyncio.wait([speculative])  # Its scheduler slot is free before the rerun
+        return intent, task, await model_router.agenerate(task, messages, priority=Priority.INTERACTIVE)
+
+    intent = intent_task.result()
+    task = model_router.task_for_intent(intent)
+    return intent, task, await model_router.agenerate(task, messages, priority=Priority.INTERACTIVE)
 
-        # Prepare messages: inject context into first user message
-        messages = [{"role": m.role, "content": m.content} for m in req.messages]
-        if context and messages:
-            messages[0]["content"] = f"{context}\n\nUser question: {messages[0]['content']}"
 
-        # Classify intent and route to appropriate model
-        user_query = req.messages[-1].content if req.messages else ""
-        intent = model_router.classify_intent(user_query)
+async def _routed_stream(messages: List[Dict[str, str]], intent_task: "asyncio.Task"):
+    """
+    Streaming _routed_generate(): (intent, task, token iterator). Speculative
+    tokens are buffered until the intent is known, then replayed ahead of
+    the rest of the stream.
+    """
+    if intent_task.done():
+        intent = intent_task.result()
         task = model_router.task_for_intent(intent)
+        return intent, task, model_router.astream(task, messages, priority=Priority.INTERACTIVE)
+
+    buffer: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        tokens = model_router.astream(SPECULATIVE_CHAT_TASK, messages, priority=Priority.INTERACTIVE)
+        try:
+            async for token in tokens:
+                buffer.put_nowait(token)
+        except Exception as e:
+            logger.error(f"Speculative chat stream error: {e}")
+            buffer.put_nowait(f"[ERROR] {e}")
+        finally:
+            await tokens.aclose()
+            buffer.put_nowait(None)
+
+    speculative = asyncio.create_task(pump())
+    _speculate(intent_task, speculative)
+    try:
+        intent = await intent_task
+    except BaseException:
+        speculative.cancel()
+        raise
+    task = model_router.task_for_intent(intent)
+    if task != SPECULATIVE_CHAT_TASK:
+        await asyncio.wait([speculative])
+        return intent, task, model_router.astream(task, messages, priority=Priority.INTERACTIVE)
+
+    async def replay():
+        try:
+            while (token := await buffer.get()) is not None:
+                yield token
+        finally:
+            speculative.cancel()
 
-        response = model_router.generate(task, messages)
+    return intent, task, replay()
+
+
+def _sse_data(text: str) -> str:
+    """One SSE event; each line of a multi-line chunk gets its own data: field."""
+    return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+
+@app.post("/api/chat")
+async def chat_endpoint(req: ChatRequest):
+    """
+    Conversational AI chat — answers questions about projects using real Neo4j data.
+    Uses ModelRouter for intent classification and task-specific model selection;
+    context assembly, classification and generation overlap where possible.
+    """
+    try:
+        messages, intent_task = await _prepare_chat(req)
+        intent, task, response = await _routed_generate(messages, intent_task)
         return {
             "role": "assistant",
             "content": response,
@@ -159,30 +311,23 @@ async def chat_stream_endpoint(req: ChatRequest):
     Uses ModelRouter for task-specific model selection.
     """
     try:
-        context = ""
-        if req.project_id:
-            context = _build_project_context(req.project_id)
-
-        messages = [{"role": m.role, "content": m.content} for m in req.messages]
-        if context and messages:
-            messages[0]["content"] = f"{context}\n\nUser question: {messages[0]['content']}"
+        messages, intent_task = await _prepare_chat(req)
+        intent, task, tokens = await _routed_stream(messages, intent_task)
 
-        # Classify intent for task-specific model
-        user_query = req.messages[-1].content if req.messages else ""
-        intent = model_router.classify_intent(user_query)
-        task = model_router.task_for_intent(intent)
-
-        def generate():
+        async def generate():
+            frames = coalesce_tokens(tokens, "chat")
             try:
                 # Send metadata as first event
-                import json
                 meta = json.dumps({"intent": intent, "task_type": task.value})
                 yield f"data: [META]{meta}\n\n"
-                for token in model_router.stream(task, messages):
-                    yield f"data: {token}\n\n"
+                async for chunk in frames:
+                    yield _sse_data(chunk)
                 yield "data: [DONE]\n\n"
             except Exception as e:
                 yield f"data: [ERROR] {str(e)}\n\n"
+            finally:
+                await frames.aclose()
+                await tokens.aclose()
 
         return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -486,10 +631,179 @@ async def get_graph_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# Generated documents (company report, postmortems, narratives)
+# ============================================================================
+
+# Bump a document's version whenever its prompt changes so cached copies regenerate
+DOCUMENT_TEMPLATE_VERSIONS = {"company-report": 1, "postmortem": 1, "narrative": 1}
+
+
+def _document_fingerprint(kind: str, task: TaskType, *inputs) -> str:
+    """Fingerprint of a document's template version, model and exact inputs."""
+    return document_fingerprint(kind, DOCUMENT_TEMPLATE_VERSIONS[kind], MODEL_REGISTRY[task].model_id, *inputs)
+
+
+# Markdown section headers: "## Title", "**1. Title**", "1. **Title**"
+_SECTION_RE = re.compile(r"^\s*(?:#{1,6}\s+|\*\*\s*\d+\.|\d+\.\s+\*\*)")
+
+
+def _section_frames(lines: List[str], count: int) -> tuple:
+    """([SECTION] SSE frames for header lines, new section count)."""
+    frames = []
+    for line in lines:
+        if _SECTION_RE.match(line):
+            title = re.sub(r"[#*]", "", line).strip()
+            if title:
+                count += 1
+                frames.append(f"data: [SECTION]{json.dumps({'index': count, 'title': title})}\n\n")
+    return frames, count
+
+
+async def _replay_document(text: str, meta: dict):
+    """SSE frames for an already generated document."""
+    yield f"data: [META]{json.dumps(meta)}\n\n"
+    frames, _ = _section_frames(text.split("\n"), 0)
+    for frame in frames:
+        yield frame
+    yield f"data: {json.dumps(text)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+async def _stream_document(key: str, fingerprint: str, task: TaskType, messages, build, priority=None):
+    """
+    SSE frames while a document is generated: [SECTION]{index, title} as
+    each header line completes, coalesced tokens as JSON strings (markdown
+    newlines survive SSE framing), then [DONE] or [ERROR]. On success
+    build(full_text) is written to document_cache under key/fingerprint.
+    """
+    parts: List[str] = []
+    line, sections = "", 0
+    tokens = model_router.astream(task, messages, priority=priority)
+    chunks = coalesce_tokens(tokens, key.split(":")[0])
+    try:
+        async for token in chunks:
+            if token.startswith("[ERROR]"):
+                yield f"data: {token}\n\n"
+                return
+            parts.append(token)
+            yield f"data: {json.dumps(token)}\n\n"
+            *complete, line = (line + token).split("\n")
+            frames, sections = _section_frames(complete, sections)
+            for frame in frames:
+                yield frame
+    finally:
+        await chunks.aclose()
+        await tokens.aclose()  # Frees the scheduler slot on error or disconnect
+    frames, sections = _section_frames([line], sections)
+    for frame in frames:
+        yield frame
+    document_cache.put(key, fingerprint, build("".join(parts)))
+    yield "data: [DONE]\n\n"
+
+
 # ============================================================================
 # Company-wide Report (Chairperson)
 # ============================================================================
 
+def _company_report_data() -> dict:
+    """Teams, projects, workforce and aggregate stats from Neo4j."""
+    # 1. All teams with projects and ticket stats
+    records, _ = neo4j_client.execute_query("""
+        MATCH (t:Team)-[:HAS_PROJECT]->(p:Project)
+        OPTIONAL MATCH (t)<-[:MEMBER_OF]-(m:Member)
+        WITH t, p, collect(DISTINCT m) as members
+        OPTIONAL MATCH (p)-[:HAS_TICKET]->(tk:Ticket)
+        WHERE tk.status <> 'Done'
+        WITH t, p, members, collect(DISTINCT tk) as active_tks
+        OPTIONAL MATCH (p)-[:HAS_TICKET]->(done:Ticket)
+        WHERE done.status = 'Done'
+        WITH t, p, members, active_tks, collect(DISTINCT done) as done_tks
+        OPTIONAL MATCH (p)-[:HAS_TICKET]->(blocked:Ticket)<-[:BLOCKED_BY]-(blocker:Ticket)
+        WHERE blocker.status <> 'Done'
+        WITH t, p, members, active_tks, done_tks, count(DISTINCT blocked) as blocked_count
+        RETURN t { .* } as team,
+               p { .* } as project,
+               size(members) as team_members,
+               size(active_tks) as active_tickets,
+               size(done_tks) as done_tickets,
+               blocked_count
+        ORDER BY t.name, p.name
+    """)
+
+    teams_map = {}
+    all_projects = []
+    for r in records:
+        team = dict(r["team"]) if r["team"] else {}
+        proj = dict(r["project"]) if r["project"] else {}
+        tid = team.get("id", "unknown")
+
+        if tid not in teams_map:
+            teams_map[tid] = {
+                **team,
+                "member_count": r["team_members"],
+                "projects": [],
+                "total_active": 0,
+                "total_done": 0,
+                "total_blocked": 0,
+            }
+
+        proj_data = {
+            **proj,
+            "team": team.get("name"),
+            "team_id": tid,
+            "active_tickets": r["active_tickets"],
+            "done_tickets": r["done_tickets"],
+            "blocked_count": r["blocked_count"],
+        }
+        teams_map[tid]["projects"].append(proj_data)
+        teams_map[tid]["total_active"] += r["active_tickets"]
+        teams_map[tid]["total_done"] += r["done_tickets"]
+        teams_map[tid]["total_blocked"] += r["blocked_count"]
+        all_projects.append(proj_data)
+
+    # 2. Workforce summary
+    mem_records, _ = neo4j_client.execute_query("""
+        MATCH (m:Member)
+        OPTIONAL MATCH (m)-[:ASSIGNED_TO]->(tk:Ticket)
+        WHERE tk.status <> 'Done'
+        OPTIONAL MATCH (m)-[:MEMBER_OF]->(t:Team)
+        RETURN m.name as name, m.role as role, t.name as team,
+               count(tk) as active_tickets
+        ORDER BY count(tk) DESC
+    """)
+    workforce = [dict(r) for r in mem_records]
+    overloaded = [w for w in workforce if w["active_tickets"] >= 3]
+    idle = [w for w in workforce if w["active_tickets"] == 0]
+
+    # 3. Aggregated stats
+    total_members = len(workforce)
+    total_projects = len(all_projects)
+    total_active = sum(p["active_tickets"] for p in all_projects)
+    total_done = sum(p["done_tickets"] for p in all_projects)
+    total_blocked = sum(p["blocked_count"] for p in all_projects)
+    avg_progress = round(sum(p.get("progress", 0) for p in all_projects) / max(total_projects, 1), 1)
+    completion_rate = round((total_done / max(total_active + total_done, 1)) * 100, 1)
+
+    return {
+        "teams": list(teams_map.values()),
+        "projects": all_projects,
+        "workforce": workforce,
+        "summary": {
+            "total_teams": len(teams_map),
+            "total_members": total_members,
+            "total_projects": total_projects,
+            "total_active_tickets": total_active,
+            "total_done_tickets": total_done,
+            "total_blocked": total_blocked,
+            "avg_progress": avg_progress,
+            "completion_rate": completion_rate,
+            "overloaded_members": len(overloaded),
+            "idle_members": len(idle),
+        },
+    }
+
+
 @app.get("/api/company-report")
 async def get_company_report():
     """
@@ -497,144 +811,44 @@ async def get_company_report():
     Used by chairperson for report generation.
     """
     try:
-        # 1. All teams with projects and ticket stats
-        records, _ = neo4j_client.execute_query("""
-            MATCH (t:Team)-[:HAS_PROJECT]->(p:Project)
-            OPTIONAL MATCH (t)<-[:MEMBER_OF]-(m:Member)
-            WITH t, p, collect(DISTINCT m) as members
-            OPTIONAL MATCH (p)-[:HAS_TICKET]->(tk:Ticket)
-            WHERE tk.status <> 'Done'
-            WITH t, p, members, collect(DISTINCT tk) as active_tks
-            OPTIONAL MATCH (p)-[:HAS_TICKET]->(done:Ticket)
-            WHERE done.status = 'Done'
-            WITH t, p, members, active_tks, collect(DISTINCT done) as done_tks
-            OPTIONAL MATCH (p)-[:HAS_TICKET]->(blocked:Ticket)<-[:BLOCKED_BY]-(blocker:Ticket)
-            WHERE blocker.status <> 'Done'
-            WITH t, p, members, active_tks, done_tks, count(DISTINCT blocked) as blocked_count
-            RETURN t { .* } as team,
-                   p { .* } as project,
-                   size(members) as team_members,
-                   size(active_tks) as active_tickets,
-                   size(done_tks) as done_tickets,
-                   blocked_count
-            ORDER BY t.name, p.name
-        """)
-
-        teams_map = {}
-        all_projects = []
-        for r in records:
-            team = dict(r["team"]) if r["team"] else {}
-            proj = dict(r["project"]) if r["project"] else {}
-            tid = team.get("id", "unknown")
-
-            if tid not in teams_map:
-                teams_map[tid] = {
-                    **team,
-                    "member_count": r["team_members"],
-                    "projects": [],
-                    "total_active": 0,
-                    "total_done": 0,
-                    "total_blocked": 0,
-                }
-
-            proj_data = {
-                **proj,
-                "team": team.get("name"),
-                "team_id": tid,
-                "active_tickets": r["active_tickets"],
-                "done_tickets": r["done_tickets"],
-                "blocked_count": r["blocked_count"],
-            }
-            teams_map[tid]["projects"].append(proj_data)
-            teams_map[tid]["total_active"] += r["active_tickets"]
-            teams_map[tid]["total_done"] += r["done_tickets"]
-            teams_map[tid]["total_blocked"] += r["blocked_count"]
-            all_projects.append(proj_data)
-
-        # 2. Workforce summary
-        mem_records, _ = neo4j_client.execute_query("""
-            MATCH (m:Member)
-            OPTIONAL MATCH (m)-[:ASSIGNED_TO]->(tk:Ticket)
-            WHERE tk.status <> 'Done'
-            OPTIONAL MATCH (m)-[:MEMBER_OF]->(t:Team)
-            RETURN m.name as name, m.role as role, t.name as team,
-                   count(tk) as active_tickets
-            ORDER BY count(tk) DESC
-        """)
-        workforce = [dict(r) for r in mem_records]
-        overloaded = [w for w in workforce if w["active_tickets"] >= 3]
-        idle = [w for w in workforce if w["active_tickets"] == 0]
-
-        # 3. Aggregated stats
-        total_members = len(workforce)
-        total_projects = len(all_projects)
-        total_active = sum(p["active_tickets"] for p in all_projects)
-        total_done = sum(p["done_tickets"] for p in all_projects)
-        total_blocked = sum(p["blocked_count"] for p in all_projects)
-        avg_progress = round(sum(p.get("progress", 0) for p in all_projects) / max(total_projects, 1), 1)
-        completion_rate = round((total_done / max(total_active + total_done, 1)) * 100, 1)
-
-        return {
-            "teams": list(teams_map.values()),
-            "projects": all_projects,
-            "workforce": workforce,
-            "summary": {
-                "total_teams": len(teams_map),
-                "total_members": total_members,
-                "total_projects": total_projects,
-                "total_active_tickets": total_active,
-                "total_done_tickets": total_done,
-                "total_blocked": total_blocked,
-                "avg_progress": avg_progress,
-                "completion_rate": completion_rate,
-                "overloaded_members": len(overloaded),
-                "idle_members": len(idle),
-            },
-        }
+        return await asyncio.to_thread(_company_report_data)
     except Exception as e:
         logger.error(f"Company report error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/company-report/generate")
-async def generate_company_report():
-    """
-    Generate a full AI-powered company analysis report using LLM.
-    Returns structured markdown report.
-    """
-    try:
-        # Get company data
-        report_data = await get_company_report()
-        summary = report_data["summary"]
-        teams = report_data["teams"]
-        projects = report_data["projects"]
-        workforce = report_data["workforce"]
-
-        # Build context for LLM
-        teams_ctx = "\n".join([
-            f"  - {t.get('name')}: {t.get('member_count')} members, "
-            f"{len(t.get('projects', []))} projects, "
-            f"{t.get('total_active')} active tickets, "
-            f"{t.get('total_done')} completed, "
-            f"{t.get('total_blocked')} blocked"
-            for t in teams
-        ])
-
-        projects_ctx = "\n".join([
-            f"  - {p.get('name')} ({p.get('team')}): {p.get('status')}, "
-            f"{p.get('progress', 0)}% done, "
-            f"{p.get('active_tickets')} active, "
-            f"{p.get('done_tickets')} done, "
-            f"{p.get('blocked_count')} blocked"
-            for p in projects
-        ])
-
-        overloaded_ctx = "\n".join([
-            f"  - {w['name']} ({w.get('role')}, {w.get('team')}): {w['active_tickets']} active tickets"
-            for w in workforce if w["active_tickets"] >= 3
-        ]) or "  None"
-
-        prompt = f"""Generate a comprehensive COMPANY ANALYSIS REPORT based on the following live organizational data.
+def _company_report_messages(report_data: dict) -> List[Dict[str, str]]:
+    """LLM messages for the company analysis report."""
+    summary = report_data["summary"]
+    teams = report_data["teams"]
+    projects = report_data["projects"]
+    workforce = report_data["workforce"]
+
+    # Build context for LLM
+    teams_ctx = "\n".join([
+        f"  - {t.get('name')}: {t.get('member_count')} members, "
+        f"{len(t.get('projects', []))} projects, "
+        f"{t.get('total_active')} active tickets, "
+        f"{t.get('total_done')} completed, "
+        f"{t.get('total_blocked')} blocked"
+        for t in teams
+    ])
+
+    projects_ctx = "\n".join([
+        f"  - {p.get('name')} ({p.get('team')}): {p.get('status')}, "
+        f"{p.get('progress', 0)}% done, "
+        f"{p.get('active_tickets')} active, "
+        f"{p.get('done_tickets')} done, "
+        f"{p.get('blocked_count')} blocked"
+        for p in projects
+    ])
+
+    overloaded_ctx = "\n".join([
+        f"  - {w['name']} ({w.get('role')}, {w.get('team')}): {w['active_tickets']} active tickets"
+        for w in workforce if w["active_tickets"] >= 3
+    ]) or "  None"
+
+    prompt = f"""Generate a comprehensive COMPANY ANALYSIS REPORT based on the following live organizational data.
 Use ONLY the provided data — do NOT invent information.
 
 COMPANY OVERVIEW:
@@ -672,22 +886,83 @@ Use markdown formatting with headers, bullet points, and bold for key metrics.
 Be data-driven, strategic, and actionable.
 """
 
-        report_text = model_router.generate(
-            TaskType.EXPLANATION,
-            [{"role": "system", "content": "You are a chief strategy officer producing a company analysis report for the board. Be thorough, data-driven, and strategic."},
-             {"role": "user", "content": prompt}],
-        )
+    return [
+        {"role": "system", "content": "You are a chief strategy officer producing a company analysis report for the board. Be thorough, data-driven, and strategic."},
+        {"role": "user", "content": prompt},
+    ]
 
-        return {
-            "report": report_text,
-            "summary": summary,
-            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-        }
+
+def _company_report_document(report_text: str, summary: dict) -> dict:
+    return {
+        "report": report_text,
+        "summary": summary,
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+async def _company_report_inputs():
+    """(fingerprint, messages, summary) for the company report's current data."""
+    report_data = await asyncio.to_thread(_company_report_data)
+    messages = _company_report_messages(report_data)
+    fingerprint = _document_fingerprint("company-report", TaskType.EXPLANATION, messages)
+    return fingerprint, messages, report_data["summary"]
+
+
+async def _company_report_source():
+    """(fingerprint, generate) for the company report's current data."""
+    fingerprint, messages, summary = await _company_report_inputs()
+
+    async def generate():
+        report_text = await model_router.agenerate(TaskType.EXPLANATION, messages, priority=Priority.BATCH)
+        return _company_report_document(report_text, summary)
+
+    return fingerprint, generate
+
+
+document_scheduler.register("company-report", _company_report_source)
+
+
+@app.post("/api/company-report/generate")
+async def generate_company_report():
+    """
+    AI-powered company analysis report as structured markdown.
+    Served from the latest background pre-generation (see DocumentScheduler).
+    """
+    try:
+        document, cache = await document_scheduler.latest("company-report")
+        return {**document, "cache": cache}
     except Exception as e:
         logger.error(f"Company report generation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/company-report/generate/stream")
+async def stream_company_report():
+    """
+    Streaming company report (SSE). The precomputed report is replayed
+    when it is current; otherwise it is generated token by token, with a
+    [SECTION] frame per header, and cached when complete.
+    """
+    try:
+        fingerprint, messages, summary = await _company_report_inputs()
+        if document_cache.fingerprint("company-report") == fingerprint:
+            document, cache = document_cache.latest("company-report")
+            frames = _replay_document(document["report"], {"summary": document["summary"], "cache": cache})
+        else:
+            async def frames():
+                yield f"data: [META]{json.dumps({'summary': summary, 'cache': {'status': 'miss'}})}\n\n"
+                async for frame in _stream_document(
+                    "company-report", fingerprint, TaskType.EXPLANATION, messages,
+                    lambda text: _company_report_document(text, summary), priority=Priority.BATCH,
+                ):
+                    yield frame
+            frames = frames()
+        return StreamingResponse(frames, media_type="text/event-stream")
+    except Exception as e:
+        logger.error(f"Company report stream error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # Risk History / Trend Tracking
 # ============================================================================
@@ -699,7 +974,7 @@ async def save_risk_snapshot(project_id: str):
     Returns the snapshot.
     """
     try:
-        result = risk_agent.analyze(project_id)
+        result = await risk_agent.aanalyze(project_id, priority=Priority.BATCH)
 
         # Count blocked & overdue from supporting_signals
         blocked = sum(1 for s in result.supporting_signals if "blocked" in s.lower())
@@ -717,7 +992,8 @@ async def save_risk_snapshot(project_id: str):
         )
 
         # Persist to Neo4j
-        neo4j_client.execute_query(
+        await asyncio.to_thread(
+            neo4j_client.execute_query,
             """
             MATCH (p:Project {id: $pid})
             CREATE (s:RiskSnapshot {
@@ -777,26 +1053,18 @@ async def get_risk_history(project_id: str, limit: int = 30):
 # Postmortem Generator
 # ============================================================================
 
-@app.get("/api/postmortem/{project_id}")
-async def generate_postmortem(project_id: str):
-    """
-    Generate a structured postmortem report for a project using
-    risk analysis data + LLM reasoning.
-    """
-    try:
-        # Get full analysis
-        result = risk_agent.analyze(project_id)
-
-        # Build evidence summary
-        signals = "\n".join([f"- {s}" for s in result.supporting_signals]) or "- No issues detected"
-        actions = "\n".join([f"- {a}" for a in result.recommended_actions]) or "- None"
-        decisions = "\n".join([
-            f"- {d.action}: risk_reduction={d.risk_reduction:.0%}, "
-            f"cost={d.cost}, feasible={d.feasible}, recommended={d.recommended}"
-            for d in result.decision_comparison
-        ])
-
-        prompt = f"""
+def _postmortem_messages(result: AnalysisResult) -> List[Dict[str, str]]:
+    """LLM messages for a project postmortem built from its risk analysis."""
+    # Build evidence summary
+    signals = "\n".join([f"- {s}" for s in result.supporting_signals]) or "- No issues detected"
+    actions = "\n".join([f"- {a}" for a in result.recommended_actions]) or "- None"
+    decisions = "\n".join([
+        f"- {d.action}: risk_reduction={d.risk_reduction:.0%}, "
+        f"cost={d.cost}, feasible={d.feasible}, recommended={d.recommended}"
+        for d in result.decision_comparison
+    ])
+
+    prompt = f"""
 Generate a structured POSTMORTEM report for this project.
 Use ONLY the evidence provided below — do NOT invent facts.
 
@@ -823,97 +1091,178 @@ Format the postmortem with these sections:
 
 Be direct, data-driven, and actionable.
 """
-        postmortem_text = model_router.generate(
-            TaskType.POSTMORTEM,
-            [{"role": "user", "content": prompt}],
-        )
+    return [{"role": "user", "content": prompt}]
 
-        return {
-            "project_id": result.project_id,
-            "project_name": result.project_name,
-            "risk_score": result.risk_score,
-            "risk_level": result.risk_level,
-            "postmortem": postmortem_text,
-            "generated_from": {
-                "signals_count": len(result.supporting_signals),
-                "actions_count": len(result.recommended_actions),
-                "agents_consulted": [op.agent for op in result.agent_opinions],
-            },
-        }
+
+def _postmortem_document(result: AnalysisResult, postmortem_text: str) -> dict:
+    return {
+        "project_id": result.project_id,
+        "project_name": result.project_name,
+        "risk_score": result.risk_score,
+        "risk_level": result.risk_level,
+        "postmortem": postmortem_text,
+        "generated_from": {
+            "signals_count": len(result.supporting_signals),
+            "actions_count": len(result.recommended_actions),
+            "agents_consulted": [op.agent for op in result.agent_opinions],
+        },
+    }
+
+
+@app.get("/api/postmortem/{project_id}")
+async def generate_postmortem(project_id: str):
+    """
+    Generate a structured postmortem report for a project using
+    risk analysis data + LLM reasoning. Cached until the project's
+    deterministic risk signals change.
+    """
+    try:
+        signals = await asyncio.to_thread(risk_agent.assess, project_id)
+
+        async def generate():
+            result = await risk_agent.aanalyze(project_id, priority=Priority.BATCH)
+            postmortem_text = await model_router.agenerate(
+                TaskType.POSTMORTEM, _postmortem_messages(result),
+            )
+            return _postmortem_document(result, postmortem_text)
+
+        fingerprint = _document_fingerprint("postmortem", TaskType.POSTMORTEM, signals)
+        document, cache = await document_cache.get(f"postmortem:{project_id}", fingerprint, generate)
+        return {**document, "cache": cache}
     except Exception as e:
         logger.error(f"Postmortem generation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/narrative/{role}")
-async def get_narrative(role: str):
+@app.get("/api/postmortem/{project_id}/stream")
+async def stream_postmortem(project_id: str):
     """
-    LLM-powered executive narrative for each role.
-    Reads real Neo4j data, runs it through the LLM for a plain-English intelligence briefing.
+    Streaming postmortem (SSE): [META] with the project's risk, then
+    [SECTION] frames and tokens as the report is written. A cached
+    postmortem for unchanged risk signals is replayed instead.
     """
-    if role not in ROLE_DEFINITIONS:
-        raise HTTPException(status_code=404, detail=f"Role '{role}' not found")
-
     try:
-        # Gather live data from Neo4j
-        context_parts = []
+        signals = await asyncio.to_thread(risk_agent.assess, project_id)
+        key = f"postmortem:{project_id}"
+        fingerprint = _document_fingerprint("postmortem", TaskType.POSTMORTEM, signals)
+        if document_cache.fingerprint(key) == fingerprint:
+            document, cache = document_cache.latest(key)
+            meta = {k: v for k, v in document.items() if k != "postmortem"}
+            return StreamingResponse(
+                _replay_document(document["postmortem"], {**meta, "cache": cache}),
+                media_type="text/event-stream",
+            )
 
-        if role in ("chairperson", "engineer", "finance"):
-            records, _ = neo4j_client.execute_query("""
-                MATCH (t:Team)-[:HAS_PROJECT]->(p:Project)
-                OPTIONAL MATCH (p)-[:HAS_TICKET]->(tk:Ticket)
-                OPTIONAL MATCH (tk)<-[:BLOCKED_BY]-(blocker:Ticket)
-                WHERE blocker.status <> 'Done'
-                RETURN p.name as project, p.status as status, p.progress as progress,
-                       t.name as team,
-                       count(DISTINCT tk) as tickets,
-                       count(DISTINCT blocker) as blockers
-            """)
-            context_parts.append("PROJECTS:\n" + "\n".join([
-                f"  - {r['project']} ({r['team']}): {r['status']}, {r['progress']}% done, {r['tickets']} tickets, {r['blockers']} blockers"
-                for r in records
-            ]))
+        async def frames():
+            try:
+                result = await risk_agent.aanalyze(project_id, priority=Priority.BATCH)
+            except Exception as e:
+                yield f"data: [ERROR] {e}\n\n"
+                return
+            meta = {k: v for k, v in _postmortem_document(result, "").items() if k != "postmortem"}
+            yield f"data: [META]{json.dumps({**meta, 'cache': {'status': 'miss'}})}\n\n"
+            async for frame in _stream_document(
+                key, fingerprint, TaskType.POSTMORTEM, _postmortem_messages(result),
+                lambda text: _postmortem_document(result, text),
+            ):
+                yield frame
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+    except Exception as e:
+        logger.error(f"Postmortem stream error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if role in ("hr", "chairperson"):
-            records, _ = neo4j_client.execute_query("""
-                MATCH (m:Member)
-                OPTIONAL MATCH (m)-[:ASSIGNED_TO]->(tk:Ticket)
-                WHERE tk.status <> 'Done'
-                OPTIONAL MATCH (m)-[:MEMBER_OF]->(t:Team)
-                RETURN m.name as name, m.role as role, t.name as team,
-                       count(tk) as active_tickets
-                ORDER BY count(tk) DESC
-            """)
-            overloaded = [r for r in records if r['active_tickets'] >= 3]
-            idle = [r for r in records if r['active_tickets'] == 0]
-            context_parts.append(
-                f"WORKFORCE ({len(records)} members, {len(overloaded)} overloaded, {len(idle)} idle):\n" +
-                "\n".join([f"  - {r['name']} ({r['role']}, {r['team']}): {r['active_tickets']} tickets" for r in records[:15]])
-            )
 
-        if role == "finance":
-            from .core.constants import INTERVENTION_IMPACTS
-            context_parts.append(
-                "INTERVENTIONS:\n" +
-                "\n".join([f"  - {action}: risk_reduction={v.get('risk_reduction','?')}, cost={v.get('cost_penalty','?')}" for action, v in INTERVENTION_IMPACTS.items()])
-            )
+def _narrative_messages(role: str) -> List[Dict[str, str]]:
+    """LLM messages for a role narrative, built from live Neo4j data."""
+    # Gather live data from Neo4j
+    context_parts = []
 
-        combined_context = "\n\n".join(context_parts)
+    if role in ("chairperson", "engineer", "finance"):
+        records, _ = neo4j_client.execute_query("""
+            MATCH (t:Team)-[:HAS_PROJECT]->(p:Project)
+            OPTIONAL MATCH (p)-[:HAS_TICKET]->(tk:Ticket)
+            OPTIONAL MATCH (tk)<-[:BLOCKED_BY]-(blocker:Ticket)
+            WHERE blocker.status <> 'Done'
+            RETURN p.name as project, p.status as status, p.progress as progress,
+                   t.name as team,
+                   count(DISTINCT tk) as tickets,
+                   count(DISTINCT blocker) as blockers
+        """)
+        context_parts.append("PROJECTS:\n" + "\n".join([
+            f"  - {r['project']} ({r['team']}): {r['status']}, {r['progress']}% done, {r['tickets']} tickets, {r['blockers']} blockers"
+            for r in records
+        ]))
 
-        role_prompts = {
-            "engineer": "You are a senior engineering lead. Based on the project data below, provide a 2-3 sentence briefing on what engineers should focus on today. Highlight blockers, overdue items, and priority work. Be direct and actionable.",
-            "hr": "You are an HR strategist. Based on the workforce data below, provide a 2-3 sentence briefing on team health, workload distribution, and any staffing concerns. Flag overloaded or idle team members.",
-            "chairperson": "You are a chief delivery officer. Based on the project and workforce data below, provide a 2-3 sentence executive briefing on delivery health, top risks, and recommended decisions. Be concise and strategic.",
-            "finance": "You are a finance analyst. Based on the resource and intervention data below, provide a 2-3 sentence briefing on cost efficiency, resource utilization, and ROI of potential interventions. Focus on numbers and impact.",
-        }
+    if role in ("hr", "chairperson"):
+        records, _ = neo4j_client.execute_query("""
+            MATCH (m:Member)
+            OPTIONAL MATCH (m)-[:ASSIGNED_TO]->(tk:Ticket)
+            WHERE tk.status <> 'Done'
+            OPTIONAL MATCH (m)-[:MEMBER_OF]->(t:Team)
+            RETURN m.name as name, m.role as role, t.name as team,
+                   count(tk) as active_tickets
+            ORDER BY count(tk) DESC
+        """)
+        overloaded = [r for r in records if r['active_tickets'] >= 3]
+        idle = [r for r in records if r['active_tickets'] == 0]
+        context_parts.append(
+            f"WORKFORCE ({len(records)} members, {len(overloaded)} overloaded, {len(idle)} idle):\n" +
+            "\n".join([f"  - {r['name']} ({r['role']}, {r['team']}): {r['active_tickets']} tickets" for r in records[:15]])
+        )
+
+    if role == "finance":
+        from .core.constants import INTERVENTION_IMPACTS
+        context_parts.append(
+            "INTERVENTIONS:\n" +
+            "\n".join([f"  - {action}: risk_reduction={v.get('risk_reduction','?')}, cost={v.get('cost_penalty','?')}" for action, v in INTERVENTION_IMPACTS.items()])
+        )
+
+    combined_context = "\n\n".join(context_parts)
+
+    role_prompts = {
+        "engineer": "You are a senior engineering lead. Based on the project data below, provide a 2-3 sentence briefing on what engineers should focus on today. Highlight blockers, overdue items, and priority work. Be direct and actionable.",
+        "hr": "You are an HR strategist. Based on the workforce data below, provide a 2-3 sentence briefing on team health, workload distribution, and any staffing concerns. Flag overloaded or idle team members.",
+        "chairperson": "You are a chief delivery officer. Based on the project and workforce data below, provide a 2-3 sentence executive briefing on delivery health, top risks, and recommended decisions. Be concise and strategic.",
+        "finance": "You are a finance analyst. Based on the resource and intervention data below, provide a 2-3 sentence briefing on cost efficiency, resource utilization, and ROI of potential interventions. Focus on numbers and impact.",
+    }
+
+    return [
+        {"role": "system", "content": role_prompts.get(role, "Provide a brief intelligence summary.")},
+        {"role": "user", "content": f"Here is the live organizational data:\n\n{combined_context}\n\nProvide your intelligence briefing now."},
+    ]
+
+
+def _narrative_source(role: str):
+    """Document source for one role's narrative."""
+    async def source():
+        messages = await asyncio.to_thread(_narrative_messages, role)
+
+        async def generate():
+            narrative = await model_router.agenerate(TaskType.SUMMARY, messages)
+            return {"role": role, "narrative": narrative}
+
+        return _document_fingerprint("narrative", TaskType.SUMMARY, messages), generate
+    return source
 
-        messages = [
-            {"role": "system", "content": role_prompts.get(role, "Provide a brief intelligence summary.")},
-            {"role": "user", "content": f"Here is the live organizational data:\n\n{combined_context}\n\nProvide your intelligence briefing now."},
-        ]
 
-        narrative = model_router.generate(TaskType.SUMMARY, messages)
-        return {"role": role, "narrative": narrative}
+for _role in ROLE_DEFINITIONS:
+    document_scheduler.register(f"narrative:{_role}", _narrative_source(_role))
+
+
+@app.get("/api/narrative/{role}")
+async def get_narrative(role: str):
+    """
+    LLM-powered executive narrative for each role.
+    Reads real Neo4j data, runs it through the LLM for a plain-English intelligence briefing.
+    Served from the latest background pre-generation (see DocumentScheduler).
+    """
+    if role not in ROLE_DEFINITIONS:
+        raise HTTPException(status_code=404, detail=f"Role '{role}' not found")
+
+    try:
+        document, cache = await document_scheduler.latest(f"narrative:{role}")
+        return {**document, "cache": cache}
 
     except HTTPException:
         raise
@@ -926,6 +1275,44 @@ async def get_narrative(role: str):
 # Team Composition Simulator
 # ============================================================================
 
+def _build_mutations(project_id: str, raw: List[dict]) -> List[TeamMutation]:
+    """Validate request mutation dicts into TeamMutation objects."""
+    mutations = []
+    for m in raw:
+        role = m.get("role", "Mid Engineer")
+        if role not in ROLE_PROFILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown role '{role}'. Available: {list(ROLE_PROFILES.keys())}",
+            )
+        mutations.append(TeamMutation(
+            action=m.get("action", "add"),
+            role=role,
+            project_id=project_id,
+            member_name=m.get("member_name"),
+            source_team=m.get("source_team"),
+        ))
+    return mutations
+
+
+def _build_scenarios(project_id: str, raw: List[dict]) -> List[TeamScenario]:
+    """Validate request scenario dicts into TeamScenario objects."""
+    scenarios = []
+    for i, sc in enumerate(raw):
+        steps = sc.get("mutations") or []
+        if not steps or len(steps) > MAX_SCENARIO_STEPS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Each scenario needs 1 to {MAX_SCENARIO_STEPS} mutations",
+            )
+        scenarios.append(TeamScenario(
+            name=sc.get("name") or f"Scenario {i + 1}",
+            project_id=project_id,
+            mutations=_build_mutations(project_id, steps),
+        ))
+    return scenarios
+
+
 class TeamSimulationRequest(BaseModel):
     project_id: str
     mutations: List[dict]  # [{"action": "add", "role": "Senior Engineer"}, ...]
@@ -939,21 +1326,7 @@ async def simulate_team_changes(req: TeamSimulationRequest):
     Accepts hypothetical mutations and returns Monte Carlo projections.
     """
     try:
-        mutations = []
-        for m in req.mutations:
-            role = m.get("role", "Mid Engineer")
-            if role not in ROLE_PROFILES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unknown role '{role}'. Available: {list(ROLE_PROFILES.keys())}",
-                )
-            mutations.append(TeamMutation(
-                action=m.get("action", "add"),
-                role=role,
-                project_id=req.project_id,
-                member_name=m.get("member_name"),
-                source_team=m.get("source_team"),
-            ))
+        mutations = _build_mutations(req.project_id, req.mutations)
 
         # Get baseline risk from cache or let simulator estimate
         baseline = req.baseline_risk
@@ -977,6 +1350,146 @@ async def simulate_team_changes(req: TeamSimulationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class TeamScenarioRequest(BaseModel):
+    project_id: str
+    scenarios: List[dict]  # [{"name": "...", "mutations": [{"action": "add", "role": "Tech Lead"}, ...]}]
+    baseline_risk: Optional[float] = None
+
+
+@app.post("/api/simulate-team/scenarios")
+def simulate_team_scenarios(req: TeamScenarioRequest):
+    """
+    Simulate compound scenarios — ordered lists of mutations applied
+    together — with joint team-size, Brooks and ramp-up effects. All
+    scenarios run in one batched pass and are returned best first.
+    """
+    scenarios = _build_scenarios(req.project_id, req.scenarios)
+
+    try:
+        baseline = req.baseline_risk
+        if baseline is None:
+            cached = _get_cached_risk(req.project_id)
+            if cached:
+                baseline = cached.risk_score
+
+        results = team_simulator.simulate_scenarios(scenarios, baseline)
+        return {
+            "project_id": req.project_id,
+            "baseline_risk": results[0].baseline_risk if results else baseline,
+            "scenarios": [r.to_dict() for r in results],
+        }
+    except Exception as e:
+        logger.error(f"Team scenario simulation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ── Simulation jobs (submit → stream → cancel) ──
+
+SCENARIO_JOB_BATCH = 8  # Scenarios simulated jointly per streamed step
+
+
+class TeamJobRequest(BaseModel):
+    project_id: str
+    user_id: str                 # Advisory label only; the job limit is keyed on the client address
+    mutations: List[dict] = []   # Same shape as /api/simulate-team
+    scenarios: List[dict] = []   # Same shape as /api/simulate-team/scenarios
+    baseline_risk: Optional[float] = None
+
+
+@app.post("/api/simulate-team/jobs", status_code=202)
+def submit_team_job(req: TeamJobRequest, request: Request):
+    """
+    Queue a team simulation as a background job and return its id at once.
+    Results stream from /api/simulate-team/jobs/{job_id}/stream as each
+    mutation (or batch of scenarios) completes, in request order:
+    scenarios are simulated SCENARIO_JOB_BATCH at a time but not ranked —
+    sort the finished results by risk to rank them. The per-client job
+    limit is keyed on the caller's address, not the advisory user_id.
+    """
+    if bool(req.mutations) == bool(req.scenarios):
+        raise HTTPException(status_code=400, detail="Provide either mutations or scenarios")
+
+    mutations = _build_mutations(req.project_id, req.mutations)
+    scenarios = _build_scenarios(req.project_id, req.scenarios)
+
+    baseline = req.baseline_risk
+    if baseline is None:
+        cached = _get_cached_risk(req.project_id)
+        if cached:
+            baseline = cached.risk_score
+
+    def work():
+        # One context snapshot for the whole job
+        context = team_simulator._get_project_context(req.project_id)
+        for m in mutations:
+            yield team_simulator.simulate_mutation(m, baseline, context).to_dict()
+        for i in range(0, len(scenarios), SCENARIO_JOB_BATCH):
+            batch = scenarios[i:i + SCENARIO_JOB_BATCH]
+            for r in team_simulator.simulate_scenarios(batch, baseline, context, ranked=False):
+                yield r.to_dict()
+
+    try:
+        owner = request.client.host if request.client else req.user_id
+        job = job_manager.submit(
+            owner, req.user_id, "scenarios" if scenarios else "mutations", work,
+            len(mutations) + len(scenarios),
+        )
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "total": job.total,
+        "stream": f"/api/simulate-team/jobs/{job.id}/stream",
+    }
+
+
+def _get_job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@app.get("/api/simulate-team/jobs/{job_id}")
+async def get_team_job(job_id: str):
+    """Job status and every result produced so far."""
+    return _get_job_or_404(job_id).to_dict()
+
+
+@app.get("/api/simulate-team/jobs/{job_id}/stream")
+async def stream_team_job(job_id: str):
+    """
+    SSE stream of job results: one `data: {json}` event per result (past
+    results are replayed first), then `data: [DONE]`, `data: [CANCELLED]`
+    or `data: [ERROR] ...`.
+    """
+    job = _get_job_or_404(job_id)
+
+    async def generate():
+        yield f"data: [META]{json.dumps({'job_id': job.id, 'total': job.total, 'kind': job.kind})}\n\n"
+        async for event in job_manager.events(job):
+            if event["type"] == "result":
+                yield f"data: {json.dumps({'index': event['index'], **event['data']})}\n\n"
+            elif event["status"] == "completed":
+                yield "data: [DONE]\n\n"
+            elif event["status"] == "cancelled":
+                yield "data: [CANCELLED]\n\n"
+            else:
+                yield f"data: [ERROR] {event['error']}\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
+@app.delete("/api/simulate-team/jobs/{job_id}")
+async def cancel_team_job(job_id: str):
+    """Cancel a queued or running job; results produced so far are kept."""
+    _get_job_or_404(job_id)
+    job = job_manager.cancel(job_id)
+    return {"job_id": job.id, "status": job.status, "cancel_requested": True}
+
+
 @app.get("/api/simulate-team/roles")
 async def get_available_roles():
     """Return available roles and their profiles for the simulator."""
@@ -991,6 +1504,312 @@ async def get_available_roles():
     }
 
 
+class SweepRange(BaseModel):
+    start: int
+    stop: int          # Inclusive
+    step: int = 1
+
+    def values(self) -> List[int]:
+        return list(range(self.start, self.stop + 1, self.step))
+
+
+class TeamSweepRequest(BaseModel):
+    days_to_deadline: SweepRange
+    team_size: SweepRange
+    roles: Optional[List[str]] = None      # Default: every role
+    project_id: Optional[str] = None       # Blocker / ticket context from Neo4j
+    is_blocked: bool = False               # Used when no project_id is given
+    baseline_risk: Optional[float] = None
+
+
+@app.post("/api/simulate-team/sweep")
+def sweep_team_changes(req: TeamSweepRequest):
+    """
+    What-if grid: projected risk and feasibility of adding each role across
+    ranges of days-to-deadline and team size, as heatmap-ready matrices.
+    """
+    roles = req.roles or list(ROLE_PROFILES.keys())
+    unknown = [r for r in roles if r not in ROLE_PROFILES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown roles {unknown}. Available: {list(ROLE_PROFILES.keys())}",
+        )
+    if req.days_to_deadline.step <= 0 or req.team_size.step <= 0:
+        raise HTTPException(status_code=400, detail="Sweep steps must be positive")
+    days = req.days_to_deadline.values()
+    sizes = req.team_size.values()
+    if not days or not sizes or days[0] < 0 or sizes[0] < 1:
+        raise HTTPException(status_code=400, detail="Sweep ranges must be non-empty, days >= 0 and team size >= 1")
+    if len(days) * len(sizes) > MAX_SWEEP_CELLS:
+        raise HTTPException(status_code=400, detail=f"Sweep grid exceeds {MAX_SWEEP_CELLS} cells")
+
+    try:
+        if req.project_id:
+            context = team_simulator._get_project_context(req.project_id)
+        else:
+            context = {"is_blocked": req.is_blocked, "active_tickets": 0}
+        return {
+            "project_id": req.project_id,
+            **team_simulator.sweep(days, sizes, roles, context, req.baseline_risk),
+        }
+    except Exception as e:
+        logger.error(f"Team sweep error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# Intervention Combination Search
+# ============================================================================
+
+@app.get("/api/interventions/search/{project_id}")
+def search_interventions(project_id: str, max_cost: float = 0.5):
+    """
+    Branch-and-bound search over combinations of interventions.
+    Returns the Pareto frontier of risk reduction vs cost penalty.
+    """
+    try:
+        signals = risk_agent.assess(project_id)
+        result = risk_agent.simulator.search_combinations(
+            signals["risk_score"], signals["sim_context"], max_cost=max_cost,
+        )
+        return {
+            "project_id": project_id,
+            "project_name": signals["project"].get("name", ""),
+            "risk_score": round(signals["risk_score"], 3),
+            **result,
+        }
+    except Exception as e:
+        logger.error(f"Intervention search error for {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# Sensitivity Analysis (tornado charts)
+# ============================================================================
+
+@app.get("/api/sensitivity/{project_id}")
+def get_sensitivity(project_id: str, trials: int = SENSITIVITY_TRIALS):
+    """
+    Perturb every MC_DISTRIBUTIONS, ROLE_PROFILES and RISK_WEIGHTS
+    parameter by ±10% / ±20% and report how far the recommendation moves
+    and whether its ranking flips. Rows are sorted by swing.
+    """
+    if not 1000 <= trials <= MAX_SENSITIVITY_TRIALS:
+        raise HTTPException(status_code=400, detail=f"trials must be between 1000 and {MAX_SENSITIVITY_TRIALS}")
+    try:
+        signals = risk_agent.assess(project_id)
+        team_context = team_simulator._get_project_context(project_id)
+        return {
+            "project_id": project_id,
+            "project_name": signals["project"].get("name", ""),
+            **sensitivity_analyzer.analyze(signals, team_context, n_trials=trials),
+        }
+    except Exception as e:
+        logger.error(f"Sensitivity analysis error for {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# Delivery-Date Forecast (ticket-level Monte Carlo)
+# ============================================================================
+
+@app.get("/api/delivery-forecast/{project_id}")
+def get_delivery_forecast(project_id: str, trials: int = DELIVERY_TRIALS):
+    """
+    Simulate the remaining tickets (durations, BLOCKED_BY order, one ticket
+    per assignee) and return P50/P85 completion dates plus the probability
+    of meeting the project deadline.
+    """
+    if not 100 <= trials <= 100_000:
+        raise HTTPException(status_code=400, detail="trials must be between 100 and 100000")
+    try:
+        return delivery_simulator.forecast(project_id, trials).to_dict()
+    except Exception as e:
+        logger.error(f"Delivery forecast error for {project_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# Portfolio-wide What-If (process pool)
+# ============================================================================
+
+def _portfolio_decisions(project_ids: List[str], signals: List[dict], distribution: bool) -> List[dict]:
+    results, samples = simulation_executor.decision_comparisons(
+        [(s["risk_score"], s["sim_context"]) for s in signals],
+        keep_samples=distribution,
+    )
+    projects = [
+        {
+            "project_id": pid,
+            "project_name": s["project"].get("name", ""),
+            "risk_score": round(s["risk_score"], 3),
+            "risk_level": s["risk_level"],
+            "decision_comparison": [c.model_dump() for c in comparisons],
+            "simulation_opinion": opinion.model_dump(),
+        }
+        for pid, s, (comparisons, opinion, _) in zip(project_ids, signals, results)
+    ]
+    if samples is not None:
+        with samples:
+            for i, project in enumerate(projects):
+                project["net_benefit_distribution"] = samples.percentiles(i)
+    return projects
+
+
+@app.get("/api/portfolio/decisions")
+async def get_portfolio_decisions(distribution: bool = False):
+    """
+    Monte Carlo decision comparison for every project in the portfolio.
+    Signals are read from Neo4j concurrently here; simulation runs on the
+    process pool. With `distribution`, each project also gets net-benefit
+    percentiles per action, read straight from the workers' shared-memory
+    sample blocks.
+    """
+    try:
+        records, _ = await asyncio.to_thread(
+            neo4j_client.execute_query,
+            "MATCH (p:Project) RETURN p.id as id ORDER BY p.id",
+        )
+        project_ids = [r["id"] for r in records if r["id"]]
+        signals = await asyncio.gather(
+            *(asyncio.to_thread(risk_agent.assess, pid) for pid in project_ids)
+        )
+
+        projects = await asyncio.to_thread(_portfolio_decisions, project_ids, signals, distribution)
+        return {
+            "projects": projects,
+            "workers": simulation_executor.max_workers,
+        }
+    except Exception as e:
+        logger.error(f"Portfolio decisions error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class PortfolioAllocationRequest(BaseModel):
+    role: str              # "chairperson" | "finance"
+    budget: float          # USD available for the period
+    headcount: int         # New people that can be added
+    resolution: Optional[float] = None  # Budget granularity (USD) when the exact grid is too large
+
+
+@app.post("/api/portfolio/allocation")
+async def optimise_portfolio_allocation(req: PortfolioAllocationRequest):
+    """
+    Choose interventions / team additions across all projects that
+    minimise expected portfolio risk within budget and headcount.
+    Chairperson and finance only. Signals are read concurrently and both
+    simulation passes run on the process pool side by side.
+    """
+    permissions = ROLE_DEFINITIONS.get(req.role, {}).get("permissions", [])
+    if "approve_decisions" not in permissions and "view_budget_impact" not in permissions:
+        raise HTTPException(status_code=403, detail="Portfolio allocation is limited to chairperson and finance roles")
+    if req.budget < 0 or req.headcount < 0:
+        raise HTTPException(status_code=400, detail="budget and headcount must be non-negative")
+
+    try:
+        records, _ = await asyncio.to_thread(
+            neo4j_client.execute_query,
+            "MATCH (p:Project) RETURN p.id as id ORDER BY p.id",
+        )
+        project_ids = [r["id"] for r in records if r["id"]]
+        signals = await asyncio.gather(
+            *(asyncio.to_thread(risk_agent.assess, pid) for pid in project_ids)
+        )
+
+        (comparisons, _), team_results = await asyncio.gather(
+            asyncio.to_thread(
+                simulation_executor.decision_comparisons,
+                [(s["risk_score"], s["sim_context"]) for s in signals],
+            ),
+            asyncio.to_thread(simulation_executor.team_batches, [
+                (team_mutations(pid), s["risk_score"], s["team_context"])
+                for pid, s in zip(project_ids, signals)
+            ]),
+        )
+
+        projects = [
+            {
+                "project_id": pid,
+                "project_name": s["project"].get("name", ""),
+                "risk_score": s["risk_score"],
+                "options": portfolio_optimizer.build_options(
+                    pid, s["risk_score"], s["sim_context"],
+                    mean_rr=mean_rr, team_results=team,
+                ),
+            }
+            for pid, s, (_, _, mean_rr), team in zip(project_ids, signals, comparisons, team_results)
+        ]
+
+        return await asyncio.to_thread(
+            portfolio_optimizer.optimise, projects, req.budget, req.headcount, req.resolution,
+        )
+    except Exception as e:
+        logger.error(f"Portfolio allocation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class ReallocationRequest(BaseModel):
+    role: str              # "hr" | "chairperson"
+    slots_per_project: int = SLOTS_PER_PROJECT  # Incoming members per project
+
+
+@app.post("/api/portfolio/reallocation")
+async def optimise_member_reallocation(req: ReallocationRequest):
+    """
+    Propose member moves between projects that lower total portfolio risk,
+    counting the loss at each source project and the gain at each target.
+    HR and chairperson only. Signals are read concurrently; each project's
+    team context comes with its signals.
+    """
+    permissions = ROLE_DEFINITIONS.get(req.role, {}).get("permissions", [])
+    if "view_all_members" not in permissions and "approve_decisions" not in permissions:
+        raise HTTPException(status_code=403, detail="Member reallocation is limited to HR and chairperson roles")
+    if not 1 <= req.slots_per_project <= 5:
+        raise HTTPException(status_code=400, detail="slots_per_project must be between 1 and 5")
+
+    try:
+        records, _ = await asyncio.to_thread(
+            neo4j_client.execute_query,
+            "MATCH (p:Project) RETURN p.id as id ORDER BY p.id",
+        )
+        project_ids = [r["id"] for r in records if r["id"]]
+        signals, members = await asyncio.gather(
+            asyncio.gather(*(asyncio.to_thread(risk_agent.assess, pid) for pid in project_ids)),
+            asyncio.to_thread(reallocation_optimizer.load_members),
+        )
+        projects = [
+            {
+                "project_id": pid,
+                "project_name": s["project"].get("name", ""),
+                "risk_score": s["risk_score"],
+                "context": s["team_context"],
+            }
+            for pid, s in zip(project_ids, signals)
+        ]
+
+        return await asyncio.to_thread(
+            reallocation_optimizer.optimise, members, projects, req.slots_per_project,
+        )
+    except Exception as e:
+        logger.error(f"Member reallocation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Operational counters: LLM pool reuse and scheduling, intent routing, chat speculation, generated documents, SSE frames."""
+    return {
+        "llm_http": llm_transport.metrics.snapshot(),
+        "intent_classification": dict(model_router.intent_stats),
+        "document_cache": document_cache.snapshot(),
+        "document_scheduler": document_scheduler.snapshot(),
+        "sse": stream_metrics.snapshot(),
+        "llm_scheduler": llm_scheduler.snapshot(),
+        "chat_speculation": dict(speculation_stats),
+    }
+
+
 @app.get("/")
 def health_check():
     connected = False
@@ -1003,14 +1822,15 @@ def health_check():
         "status": "ok",
         "system": "Decision Intelligence Platform",
         "tagline": "Graph → Agents → LLM → Human",
-        "agents": ["RiskAgent", "ConstraintAgent", "SimulationAgent", "TeamCompositionSimulator", "ModelRouter", "ContextAssembler"],
+        "agents": ["RiskAgent", "ConstraintAgent", "SimulationAgent", "TeamCompositionSimulator", "DeliveryDateSimulator", "ModelRouter", "ContextAssembler"],
         "roles": list(ROLE_DEFINITIONS.keys()),
         "neo4j_status": "connected" if connected else "unavailable",
         "endpoints": {
             "crud": ["/api/teams", "/api/projects/{id}", "/api/tickets/{id}"],
-            "ai": ["/api/analyze/{project_id}", "/api/chat", "/api/chat/stream", "/api/risk-snapshot/{project_id}", "/api/risk-history/{project_id}", "/api/postmortem/{project_id}", "/api/narrative/{role}"],
-            "simulator": ["/api/simulate-team", "/api/simulate-team/roles"],
-            "reports": ["/api/company-report", "/api/company-report/generate"],
+            "ai": ["/api/analyze/{project_id}", "/api/chat", "/api/chat/stream", "/api/risk-snapshot/{project_id}", "/api/risk-history/{project_id}", "/api/postmortem/{project_id}", "/api/postmortem/{project_id}/stream", "/api/narrative/{role}", "/api/interventions/search/{project_id}", "/api/sensitivity/{project_id}"],
+            "simulator": ["/api/simulate-team", "/api/simulate-team/roles", "/api/simulate-team/scenarios", "/api/simulate-team/sweep", "/api/simulate-team/jobs", "/api/portfolio/decisions", "/api/delivery-forecast/{project_id}", "/api/portfolio/allocation", "/api/portfolio/reallocation"],
+            "reports": ["/api/company-report", "/api/company-report/generate", "/api/company-report/generate/stream"],
             "roles": ["/api/roles", "/api/system-users", "/api/dashboard/{role}"],
+            "ops": ["/api/metrics"],
         }
     }
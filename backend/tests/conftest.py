@@ -0,0 +1,15 @@
+"""
+Shared test setup. Settings are read at import time, so the environment
+is filled in before any app module loads: the Neo4j driver is created
+lazily (nothing here connects), and intent logging is switched off so
+tests never write the real log.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("FEATHERLESS_API_KEY", "test")
+os.environ["INTENT_LOG_PATH"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
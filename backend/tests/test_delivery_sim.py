@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import numpy as np
+from neo4j.time import Date
+
+from app.agents import delivery_sim
+from app.agents.delivery_sim import DeliveryDateSimulator
+
+
+def _ticket(tid, assignee=None, status="To Do", blocker_id=None, blocker_status=None):
+    return {
+        "id": tid, "status": status, "priority": "Medium", "assignee": assignee,
+        "blocker_id": blocker_id, "blocker_status": blocker_status,
+    }
+
+
+def test_same_seed_same_completion():
+    tickets = [_ticket("a", "x"), _ticket("b", "y"), _ticket("c", "x", blocker_id="a", blocker_status="To Do")]
+    sim = DeliveryDateSimulator()
+    np.testing.assert_array_equal(
+        sim.simulate_completion(tickets, 2000, seed=5), sim.simulate_completion(tickets, 2000, seed=5),
+    )
+    assert not np.array_equal(
+        sim.simulate_completion(tickets, 2000, seed=5), sim.simulate_completion(tickets, 2000, seed=6),
+    )
+
+
+def test_shared_assignee_serialises_work():
+    sim = DeliveryDateSimulator()
+    parallel = sim.simulate_completion([_ticket("a", "x"), _ticket("b", "y")], 2000, seed=1)
+    serial = sim.simulate_completion([_ticket("a", "x"), _ticket("b", "x")], 2000, seed=1)
+    # Same draws in the same order, so every trial is at least as late
+    assert (serial >= parallel).all() and serial.mean() > parallel.mean()
+
+
+def test_dependency_chain_adds_up():
+    sim = DeliveryDateSimulator()
+    alone = sim.simulate_completion([_ticket("a")], 2000, seed=2)
+    chain = sim.simulate_completion(
+        [_ticket("a"), _ticket("b", blocker_id="a", blocker_status="To Do")], 2000, seed=2,
+    )
+    assert (chain > alone).all()
+
+
+def test_done_blockers_and_tickets_are_ignored():
+    sim = DeliveryDateSimulator()
+    alone = sim.simulate_completion([_ticket("a")], 1000, seed=3)
+    with_done = sim.simulate_completion(
+        [_ticket("a", blocker_id="z", blocker_status="Done"), _ticket("z", status="Done")], 1000, seed=3,
+    )
+    np.testing.assert_array_equal(alone, with_done)
+
+
+def test_cycle_is_still_scheduled():
+    tickets = [
+        _ticket("a", blocker_id="b", blocker_status="To Do"),
+        _ticket("b", blocker_id="a", blocker_status="To Do"),
+    ]
+    completion = DeliveryDateSimulator().simulate_completion(tickets, 500)
+    assert completion.shape == (500,) and (completion > 0).all()
+
+
+def test_forecast_accepts_neo4j_date_deadline(monkeypatch):
+    deadline = date.today() + timedelta(days=60)
+    raw = {
+        "project": {"deadline": Date(deadline.year, deadline.month, deadline.day)},
+        "tickets": [_ticket("a", "x"), _ticket("b", "y")],
+    }
+    monkeypatch.setattr(delivery_sim.context_assembler, "get_project_raw", lambda pid: raw)
+    sim = DeliveryDateSimulator()
+    forecast = sim.forecast("p1", n_trials=2000)
+    assert forecast.deadline == deadline.isoformat()
+    assert forecast.days_to_deadline == 60
+    assert 0.0 <= forecast.prob_meets_deadline <= 1.0
+    assert forecast.to_dict()["active_tickets"] == 2
+    assert sim.forecast("p1", n_trials=2000) is forecast
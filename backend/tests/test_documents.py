@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from app.core.documents import (
+    DEFERRED,
+    FAILED,
+    HIT,
+    MISS,
+    REGENERATED,
+    STALE,
+    UNCHANGED,
+    DocumentCache,
+    DocumentScheduler,
+    document_fingerprint,
+)
+
+
+class Generator:
+    """Counts calls; each document records the version it was built from."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, version):
+        async def generate():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            return {"version": version}
+        return generate
+
+
+def test_fingerprint_is_order_insensitive_for_dicts():
+    assert document_fingerprint("v1", {"a": 1, "b": 2}) == document_fingerprint("v1", {"b": 2, "a": 1})
+    assert document_fingerprint("v1", {"a": 1}) != document_fingerprint("v2", {"a": 1})
+
+
+def test_miss_hit_then_stale_regenerates_in_background():
+    async def run():
+        cache, gen = DocumentCache(), Generator()
+        doc, meta = await cache.get("k", "f1", gen(1))
+        assert (doc, meta["status"]) == ({"version": 1}, MISS)
+        doc, meta = await cache.get("k", "f1", gen(1))
+        assert (doc, meta["status"]) == ({"version": 1}, HIT)
+
+        doc, meta = await cache.get("k", "f2", gen(2))
+        assert (doc, meta["status"], meta["regenerating"]) == ({"version": 1}, STALE, True)
+        await asyncio.sleep(0.01)
+        doc, meta = await cache.get("k", "f2", gen(2))
+        assert (doc, meta["status"]) == ({"version": 2}, HIT)
+        assert gen.calls == 2
+    asyncio.run(run())
+
+
+def test_concurrent_misses_share_one_generation():
+    async def run():
+        cache, gen = DocumentCache(), Generator(delay=0.02)
+        results = await asyncio.gather(*(cache.get("k", "f1", gen(1)) for _ in range(10)))
+        assert gen.calls == 1
+        assert all(doc == {"version": 1} for doc, _ in results)
+        assert cache.snapshot()["regenerating"] == 0
+    asyncio.run(run())
+
+
+def test_failed_generation_is_not_stored():
+    async def run():
+        cache = DocumentCache()
+
+        async def broken():
+            raise RuntimeError("llm down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get("k", "f1", broken)
+        assert cache.latest("k") is None and cache.stats["failed"] == 1
+    asyncio.run(run())
+
+
+def test_cache_is_lru_bounded():
+    cache = DocumentCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, "f", {"key": key})
+    assert cache.latest("a") is None and cache.latest("c") is not None
+
+
+def test_scheduler_regenerates_only_changed_documents():
+    async def run():
+        version = {"a": 1, "b": 1}
+        gen = Generator()
+        scheduler = DocumentScheduler(DocumentCache(), poll_seconds=60, min_interval=0)
+        for key in version:
+            async def source(key=key):
+                return document_fingerprint(key, version[key]), gen(version[key])
+            scheduler.register(key, source)
+
+        assert await scheduler.refresh() == {"a": REGENERATED, "b": REGENERATED}
+        assert await scheduler.refresh() == {"a": UNCHANGED, "b": UNCHANGED}
+        version["b"] = 2
+        assert await scheduler.refresh() == {"a": UNCHANGED, "b": REGENERATED}
+        doc, _ = await scheduler.latest("b")
+        assert doc == {"version": 2} and gen.calls == 3
+    asyncio.run(run())
+
+
+def test_scheduler_defers_within_min_interval_unless_forced():
+    async def run():
+        version = [1]
+        scheduler = DocumentScheduler(DocumentCache(), poll_seconds=60, min_interval=3600)
+
+        async def source():
+            return document_fingerprint(version[0]), Generator()(version[0])
+
+        scheduler.register("k", source)
+        assert await scheduler.refresh_one("k") == REGENERATED
+        version[0] = 2
+        assert await scheduler.refresh_one("k") == DEFERRED
+        assert await scheduler.refresh_one("k", force=True) == REGENERATED
+    asyncio.run(run())
+
+
+def test_scheduler_reports_failures_and_latest_waits_for_first_generation():
+    async def run():
+        scheduler = DocumentScheduler(DocumentCache(), poll_seconds=60, min_interval=0)
+
+        async def broken():
+            raise RuntimeError("neo4j down")
+
+        async def source():
+            return "f1", Generator()(1)
+
+        scheduler.register("broken", broken)
+        scheduler.register("k", source)
+        assert await scheduler.refresh_one("broken") == FAILED
+        doc, meta = await scheduler.latest("k")
+        assert doc == {"version": 1} and meta["status"] == HIT
+    asyncio.run(run())
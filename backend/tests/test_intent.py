@@ -0,0 +1,61 @@
+import json
+
+from app.core import intent
+from app.core.intent import IntentClassifier, normalise_query
+
+
+def test_keywords_decide_clear_queries():
+    clf = IntentClassifier(log_path="")
+    assert clf.predict("Why is the Alpha project blocked?")[0] == "risk_analysis"
+    assert clf.predict("What if we add a senior engineer?")[0] == "simulation"
+    assert clf.predict("How much does this cost us in budget?")[0] == "financial"
+    assert clf.predict("") == ("general", 1.0)
+
+
+def test_confidence_is_a_probability():
+    _, confidence = IntentClassifier(log_path="").predict("who is overloaded on the team")
+    assert 0.0 < confidence <= 1.0
+
+
+def test_learn_caches_by_normalised_query(tmp_path):
+    clf = IntentClassifier(log_path=str(tmp_path / "intents.jsonl"))
+    clf.learn("Tell me   about Alpha!", "risk_analysis")
+    assert clf.cached("tell me about alpha") == "risk_analysis"
+    assert clf.cached("something else") is None
+    clf.learn("ignored", "not-an-intent")
+    assert clf.cached("ignored") is None
+
+
+def test_log_stores_normalised_text_and_reloads(tmp_path):
+    path = tmp_path / "intents.jsonl"
+    IntentClassifier(log_path=str(path)).learn("What's Bob's WORKLOAD?", "team_query")
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert rows == [{"query": normalise_query("What's Bob's WORKLOAD?"), "intent": "team_query"}]
+    assert IntentClassifier(log_path=str(path)).cached("what's bob's workload") == "team_query"
+
+
+def test_log_is_compacted_past_the_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(intent.settings, "INTENT_LOG_MAX_ENTRIES", 10)
+    path = tmp_path / "intents.jsonl"
+    clf = IntentClassifier(log_path=str(path))
+    for _ in range(8):
+        clf.learn("same question", "general")
+    for i in range(5):
+        clf.learn(f"question {i}", "financial")
+    lines = path.read_text().splitlines()
+    assert len(lines) <= 10
+    queries = [json.loads(line)["query"] for line in lines]
+    # Compaction kept one row for the repeated question
+    assert len(queries) == len(set(queries))
+    assert queries[0] == "same question" and queries[-1] == "question 4"
+
+
+def test_reading_an_oversized_log_keeps_the_newest(tmp_path, monkeypatch):
+    monkeypatch.setattr(intent.settings, "INTENT_LOG_MAX_ENTRIES", 3)
+    path = tmp_path / "intents.jsonl"
+    with open(path, "w") as f:
+        for i in range(6):
+            f.write(json.dumps({"query": f"q{i}", "intent": "general"}) + "\n")
+        f.write("not json\n")
+    clf = IntentClassifier(log_path=str(path))
+    assert clf.cached("q5") == "general" and clf.cached("q2") is None
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.jobs import CANCELLED, COMPLETED, FAILED, JobLimitError, JobManager
+
+
+@pytest.fixture
+def manager():
+    m = JobManager(max_workers=2, max_per_user=2, ttl_seconds=60)
+    yield m
+    m.shutdown()
+
+
+def _collect(manager, job):
+    async def run():
+        return [event async for event in manager.events(job)]
+    return asyncio.run(run())
+
+
+def test_results_stream_in_order_then_end(manager):
+    job = manager.submit("10.0.0.1", "alice", "test", lambda: ({"i": i} for i in range(5)), total=5)
+    events = _collect(manager, job)
+    assert [e["data"]["i"] for e in events[:-1]] == list(range(5))
+    assert [e["index"] for e in events[:-1]] == list(range(5))
+    assert events[-1] == {"type": "end", "status": COMPLETED, "error": None}
+    # Late subscribers get the full replay
+    assert _collect(manager, job) == events
+
+
+def test_failure_is_reported(manager):
+    def work():
+        yield {"i": 0}
+        raise RuntimeError("boom")
+
+    job = manager.submit("10.0.0.1", "alice", "test", work, total=2)
+    events = _collect(manager, job)
+    assert events[-1] == {"type": "end", "status": FAILED, "error": "boom"}
+    assert len(events) == 2
+
+
+def test_limit_is_per_owner_not_user_id(manager):
+    release = threading.Event()
+
+    def blocked():
+        release.wait(5)
+        yield {"done": True}
+
+    try:
+        manager.submit("10.0.0.1", "alice", "test", blocked, total=1)
+        manager.submit("10.0.0.1", "alice", "test", blocked, total=1)
+        # A fresh user_id from the same client does not get a fresh quota
+        with pytest.raises(JobLimitError):
+            manager.submit("10.0.0.1", "bob", "test", blocked, total=1)
+        other = manager.submit("10.0.0.2", "alice", "test", blocked, total=1)
+        assert other.owner == "10.0.0.2"
+    finally:
+        release.set()
+
+
+def test_cancel_stops_between_results(manager):
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        for i in range(100):
+            yield {"i": i}
+
+    job = manager.submit("10.0.0.1", "alice", "test", work, total=100)
+    started.wait(5)
+    manager.cancel(job.id)
+    release.set()
+    events = _collect(manager, job)
+    assert events[-1]["status"] == CANCELLED
+    assert len(events) <= 2
+
+
+def test_cancel_queued_job_never_starts():
+    manager = JobManager(max_workers=1, max_per_user=5, ttl_seconds=60)
+    release, ran = threading.Event(), []
+    try:
+        def blocker():
+            release.wait(5)
+            yield {}
+
+        manager.submit("o", "u", "test", blocker, total=1)
+        queued = manager.submit("o", "u", "test", lambda: ran.append(1) or iter(()), total=0)
+        manager.cancel(queued.id)
+        assert queued.status == CANCELLED
+    finally:
+        release.set()
+        manager.shutdown()
+    assert ran == []
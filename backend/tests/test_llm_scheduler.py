@@ -0,0 +1,153 @@
+import asyncio
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.core import llm_scheduler as scheduler_module
+from app.core.llm_scheduler import LLMScheduler, Priority
+
+
+def _rate_limited(retry_after=None):
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://llm/v1/chat"))
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler_module.settings, "LLM_RETRY_BASE", 0.01)
+    monkeypatch.setattr(scheduler_module.settings, "LLM_RETRY_MAX", 0.02)
+
+
+def _scheduler(**kwargs):
+    return LLMScheduler(**{"rate_per_second": 1000, "burst": 1000, "max_retries": 3, **kwargs})
+
+
+def test_interactive_admitted_before_queued_batch():
+    async def run():
+        scheduler = _scheduler(max_concurrency=1, batch_concurrency=1)
+        order, gate = [], asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        def record(name):
+            async def request():
+                order.append(name)
+            return request
+
+        first = asyncio.create_task(scheduler.call(Priority.BATCH, hold))
+        await asyncio.sleep(0)
+        queued = [asyncio.create_task(scheduler.call(Priority.BATCH, record(f"batch{i}"))) for i in range(3)]
+        await asyncio.sleep(0)
+        queued.append(asyncio.create_task(scheduler.call(Priority.INTERACTIVE, record("chat"))))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *queued)
+        assert order == ["chat", "batch0", "batch1", "batch2"]
+    asyncio.run(run())
+
+
+def test_batch_cap_leaves_room_for_interactive():
+    async def run():
+        scheduler = _scheduler(max_concurrency=3, batch_concurrency=1)
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        batch = [asyncio.create_task(scheduler.call(Priority.BATCH, hold)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler._active[Priority.BATCH] == 1
+        done = await asyncio.wait_for(scheduler.call(Priority.INTERACTIVE, lambda: asyncio.sleep(0, "ok")), 1)
+        assert done == "ok"
+        gate.set()
+        await asyncio.gather(*batch)
+    asyncio.run(run())
+
+
+def test_concurrency_cap_is_never_exceeded():
+    async def run():
+        scheduler = _scheduler(max_concurrency=3, batch_concurrency=2)
+        running, peak = [0], [0]
+
+        async def request():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.005)
+            running[0] -= 1
+
+        await asyncio.gather(*(
+            scheduler.call(Priority.BATCH if i % 2 else Priority.INTERACTIVE, request) for i in range(30)
+        ))
+        assert peak[0] == 3
+        assert sum(scheduler._active.values()) == 0
+    asyncio.run(run())
+
+
+def test_rate_limit_is_retried():
+    async def run():
+        scheduler = _scheduler(max_concurrency=2)
+        attempts = [0]
+
+        async def request():
+            attempts[0] += 1
+            if attempts[0] < 3:
+                raise _rate_limited()
+            return "ok"
+
+        assert await scheduler.call(Priority.INTERACTIVE, request) == "ok"
+        assert attempts[0] == 3
+        interactive = scheduler.snapshot()["classes"]["interactive"]
+        assert interactive["retries_429"] == 2 and interactive["gave_up_429"] == 0
+        assert interactive["active"] == 0
+    asyncio.run(run())
+
+
+def test_gives_up_after_max_retries():
+    async def run():
+        scheduler = _scheduler(max_retries=2)
+        attempts = [0]
+
+        async def request():
+            attempts[0] += 1
+            raise _rate_limited()
+
+        with pytest.raises(RateLimitError):
+            await scheduler.call(Priority.BATCH, request)
+        assert attempts[0] == 3
+        assert scheduler.snapshot()["classes"]["batch"]["gave_up_429"] == 1
+    asyncio.run(run())
+
+
+def test_retry_after_pauses_admission():
+    async def run():
+        scheduler = _scheduler()
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def request():
+            times.append(loop.time())
+            if len(times) == 1:
+                raise _rate_limited(retry_after=0.1)
+
+        await scheduler.call(Priority.INTERACTIVE, request)
+        assert times[1] - times[0] >= 0.1
+    asyncio.run(run())
+
+
+def test_stream_holds_slot_until_exhausted():
+    async def run():
+        scheduler = _scheduler(max_concurrency=1)
+
+        async def open_stream():
+            async def items():
+                for i in range(3):
+                    assert sum(scheduler._active.values()) == 1
+                    yield i
+            return items()
+
+        assert [i async for i in scheduler.stream(Priority.INTERACTIVE, open_stream)] == [0, 1, 2]
+        assert sum(scheduler._active.values()) == 0
+    asyncio.run(run())
@@ -0,0 +1,147 @@
+import itertools
+import random
+
+import pytest
+
+from app.agents import portfolio
+from app.agents.portfolio import PortfolioOption, PortfolioOptimizer
+from app.agents.reallocation import MIN_MOVE_GAIN, MIN_TEAM_SIZE, ReallocationOptimizer, member_profile
+from app.agents.simulation import SimulationAgent
+from app.agents.team_simulator import TeamCompositionSimulator
+
+
+def _option(cost, headcount, projected_risk):
+    return PortfolioOption(
+        label="option", source="intervention", cost=cost, headcount=headcount, projected_risk=projected_risk,
+    )
+
+
+def _random_portfolio(rng, n_projects, n_options):
+    projects = []
+    for i in range(n_projects):
+        risk = rng.uniform(0.3, 1.0)
+        projects.append({
+            "project_id": f"p{i}",
+            "risk_score": risk,
+            "options": [
+                _option(rng.choice([0, 2000, 4000, 9000, 13500]), rng.choice([0, 0, 1]), risk - rng.uniform(-0.05, 0.4))
+                for _ in range(n_options)
+            ],
+        })
+    return projects
+
+
+def _brute_force(projects, budget, headcount):
+    best = 0.0
+    menus = [[None] + p["options"] for p in projects]
+    for picks in itertools.product(*menus):
+        chosen = [(p, o) for p, o in zip(projects, picks) if o is not None]
+        if sum(o.cost for _, o in chosen) > budget or sum(o.headcount for _, o in chosen) > headcount:
+            continue
+        best = max(best, sum(p["risk_score"] - o.projected_risk for p, o in chosen))
+    return best
+
+
+def _removed(result):
+    return result["portfolio_risk_before"] - result["portfolio_risk_after"]
+
+
+@pytest.fixture
+def optimizer():
+    return PortfolioOptimizer(SimulationAgent(), TeamCompositionSimulator())
+
+
+def test_knapsack_matches_brute_force(optimizer):
+    rng = random.Random(1)
+    for _ in range(200):
+        projects = _random_portfolio(rng, rng.randint(1, 4), rng.randint(1, 3))
+        budget, headcount = rng.choice([0, 2000, 6000, 15000, 30000]), rng.randint(0, 3)
+        result = optimizer.optimise(projects, budget, headcount)
+        assert result["exact"] and result["method"] == "dp"
+        assert _removed(result) == pytest.approx(_brute_force(projects, budget, headcount), abs=2e-3)
+        assert result["budget_used"] <= budget and result["headcount_used"] <= headcount
+
+
+def test_priced_headcount_is_feasible_and_within_its_gap(optimizer, monkeypatch):
+    monkeypatch.setattr(portfolio, "MAX_DP_CELLS", 0)  # Force the Lagrangian path
+    rng = random.Random(2)
+    for _ in range(200):
+        projects = _random_portfolio(rng, rng.randint(1, 4), rng.randint(1, 3))
+        budget, headcount = rng.choice([2000, 6000, 15000, 30000]), rng.randint(0, 2)
+        result = optimizer.optimise(projects, budget, headcount)
+        best = _brute_force(projects, budget, headcount)
+        assert result["budget_used"] <= budget and result["headcount_used"] <= headcount
+        assert _removed(result) <= best + 2e-3
+        assert best <= _removed(result) + result["optimality_gap"] + 2e-3
+        if result["exact"]:
+            assert _removed(result) == pytest.approx(best, abs=2e-3)
+
+
+def test_coarse_budget_grid_still_fits_budget(optimizer):
+    rng = random.Random(3)
+    projects = _random_portfolio(rng, 30, 4)
+    for p in projects:
+        for o in p["options"]:
+            o.cost += rng.randint(1, 99) / 100  # Cent-level costs → grid too fine
+    result = optimizer.optimise(projects, 60_000, 5)
+    assert not result["exact"]
+    assert result["budget_used"] <= 60_000 and result["headcount_used"] <= 5
+
+
+def test_large_portfolio_uses_bounded_solve(optimizer):
+    projects = _random_portfolio(random.Random(4), 400, 10)
+    result = optimizer.optimise(projects, 2_000_000, 40)
+    assert result["method"] == "lagrangian"
+    assert result["headcount_used"] <= 40
+
+
+# ── Member reallocation ───────────────────────────────────────────────────
+
+def _context(team_size, blocked, days=40):
+    return {
+        "is_blocked": blocked, "blocked_count": int(blocked), "active_tickets": 10, "total_tickets": 14,
+        "days_to_deadline": days, "team_size": team_size, "team_capacity_percent": 90,
+    }
+
+
+def _reallocation_inputs():
+    projects = [
+        {"project_id": "calm", "risk_score": 0.15, "context": _context(6, False, 120)},
+        {"project_id": "fire", "risk_score": 0.9, "context": _context(2, True, 30)},
+        {"project_id": "slow", "risk_score": 0.6, "context": _context(3, True, 45)},
+    ]
+    roles = ["Senior Engineer", "Tech Lead", "QA Engineer", "Junior Developer", "Senior Engineer", "DevOps"]
+    homes = ["calm"] * 4 + [None, None]  # The last two are on the bench
+    members = [
+        {"member_id": f"m{i}", "name": f"M{i}", "role": role, "team": "T",
+         "project_id": home, "profile": member_profile(role)}
+        for i, (role, home) in enumerate(zip(roles, homes))
+    ]
+    return members, projects
+
+
+def test_reallocation_respects_slots_team_floor_and_gain():
+    members, projects = _reallocation_inputs()
+    result = ReallocationOptimizer(TeamCompositionSimulator()).optimise(members, projects, slots_per_project=2)
+    by_id = {p["project_id"]: p for p in projects}
+    incoming, outgoing = {}, {}
+    for move in result["moves"]:
+        assert move["from_project"] != move["to_project"]
+        assert move["expected_net_gain"] > MIN_MOVE_GAIN
+        incoming[move["to_project"]] = incoming.get(move["to_project"], 0) + 1
+        outgoing[move["from_project"]] = outgoing.get(move["from_project"], 0) + 1
+    assert all(n <= 2 for n in incoming.values())
+    for pid, n in outgoing.items():
+        if pid is not None:
+            assert by_id[pid]["context"]["team_size"] - n >= MIN_TEAM_SIZE
+    # Bench members cost nothing to move, so at least one is placed
+    assert any(m["from_project"] is None for m in result["moves"])
+    assert result["portfolio_risk_after"] < result["portfolio_risk_before"]
+
+
+def test_reallocation_is_deterministic():
+    members, projects = _reallocation_inputs()
+    a = ReallocationOptimizer(TeamCompositionSimulator()).optimise(members, projects)
+    b = ReallocationOptimizer(TeamCompositionSimulator()).optimise(members, projects)
+    a.pop("solve_ms"), b.pop("solve_ms")
+    assert a == b
@@ -0,0 +1,198 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.agents import samplers
+from app.agents.simulation import (
+    INTERVENTION_INTERACTIONS,
+    POSSIBLE_ACTIONS,
+    SimulationAgent,
+    SimulationCache,
+    as_date,
+)
+
+CONTEXT = {"is_blocked": True, "days_to_deadline": 20, "team_capacity_percent": 70}
+
+
+# ── Monte Carlo engine ────────────────────────────────────────────────────
+
+def test_same_context_same_result_across_instances():
+    a = SimulationAgent().run_simulations(CONTEXT)
+    b = SimulationAgent().run_simulations(CONTEXT)
+    for action in POSSIBLE_ACTIONS:
+        np.testing.assert_array_equal(a[action].rr_samples, b[action].rr_samples)
+        np.testing.assert_array_equal(a[action].cp_samples, b[action].cp_samples)
+
+
+def test_different_context_changes_the_stream():
+    a = SimulationAgent().run_simulations(CONTEXT)
+    b = SimulationAgent().run_simulations({**CONTEXT, "days_to_deadline": 21})
+    assert not np.array_equal(a["REDUCE_SCOPE"].rr_samples, b["REDUCE_SCOPE"].rr_samples)
+
+
+def test_results_are_memoised():
+    agent = SimulationAgent()
+    assert agent.run_simulations(CONTEXT) is agent.run_simulations(CONTEXT)
+
+
+def test_actions_share_common_random_numbers():
+    # Same draws for every action: standardised samples coincide wherever
+    # neither action was clipped to [0, 1]
+    results = SimulationAgent(sampler="pseudo").run_simulations(CONTEXT)
+    agent = SimulationAgent()
+    a, b = "REDUCE_SCOPE", "ESCALATE_DEPENDENCY"
+    (mean_a, std_a, _, _), (mean_b, std_b, _, _) = (agent._action_params(x, CONTEXT) for x in (a, b))
+    n = min(results[a].n_trials, results[b].n_trials)
+    rr_a, rr_b = results[a].rr_samples[:n], results[b].rr_samples[:n]
+    inside = (rr_a > 0) & (rr_a < 1) & (rr_b > 0) & (rr_b < 1)
+    np.testing.assert_allclose((rr_a[inside] - mean_a) / std_a, (rr_b[inside] - mean_b) / std_b)
+
+
+def test_adaptive_stopping_meets_tolerance_or_budget():
+    agent = SimulationAgent(batch_size=500, max_trials=20_000)
+    for action, mc in agent.run_simulations(CONTEXT).items():
+        assert mc.n_trials % 500 == 0
+        assert mc.n_trials <= 20_000
+        if mc.n_trials < 20_000:
+            assert agent._converged(mc.rr_samples, mc.net_samples)
+
+
+def test_noisier_action_runs_longer():
+    results = SimulationAgent(sampler="pseudo").run_simulations(CONTEXT)
+    # ACCEPT_DELAY is near-deterministic at zero; ADD_ENGINEER is the widest
+    assert results["ACCEPT_DELAY"].n_trials <= results["ADD_ENGINEER"].n_trials
+
+
+def test_unknown_sampler_rejected():
+    with pytest.raises(ValueError):
+        SimulationAgent(sampler="quasi")
+
+
+# ── Combination search ────────────────────────────────────────────────────
+
+def _enumerate_frontier(agent, context, max_cost):
+    """Full enumeration of feasible combinations, then the Pareto frontier."""
+    mc = agent.run_simulations(context)
+    penalties = {
+        a: r["penalty"]
+        for a in POSSIBLE_ACTIONS
+        if (r := agent.constraint_agent.evaluate_intervention(a, context))["feasible"]
+    }
+    candidates = []
+    for k in range(1, len(penalties) + 1):
+        for combo in itertools.combinations(penalties, k):
+            if sum(mc[a].mean_cp + penalties[a] for a in combo) > max_cost:
+                continue
+            n = min(mc[a].n_trials for a in combo)
+            remaining = np.prod([1.0 - mc[a].rr_samples[:n] for a in combo], axis=0)
+            interaction = np.prod([
+                INTERVENTION_INTERACTIONS.get(frozenset(pair), 1.0)
+                for pair in itertools.combinations(combo, 2)
+            ])
+            rr = float(((1.0 - remaining) * interaction).mean())
+            cost = float(np.sum([mc[a].cp_samples[:n] for a in combo], axis=0).mean()) + sum(penalties[a] for a in combo)
+            candidates.append((frozenset(combo), rr, cost))
+    return {
+        combo for combo, rr, cost in candidates
+        if not any(
+            (r2 >= rr and c2 <= cost) and (r2 > rr or c2 < cost)
+            for _, r2, c2 in candidates
+        )
+    }
+
+
+@pytest.mark.parametrize("max_cost", [0.2, 0.35, 0.5, 1.0, 2.0])
+@pytest.mark.parametrize("days", [3, 20])
+def test_branch_and_bound_frontier_matches_enumeration(max_cost, days):
+    agent = SimulationAgent()
+    context = {**CONTEXT, "days_to_deadline": days}
+    found = agent.search_combinations(0.7, context, max_cost=max_cost)
+    assert {frozenset(f["actions"]) for f in found["frontier"]} == _enumerate_frontier(agent, context, max_cost)
+
+
+def test_branch_and_bound_prunes_by_dominance():
+    # Even with no binding cost cap some subsets are never evaluated
+    found = SimulationAgent().search_combinations(0.7, CONTEXT, max_cost=2.0)
+    assert found["pruned"] > 0
+    assert found["evaluated"] < 2 ** len(POSSIBLE_ACTIONS) - 1
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────
+
+def test_cache_is_bounded_by_bytes():
+    cache = SimulationCache(max_entries=100, max_bytes=1000)
+    for key in range(5):
+        cache.set(key, {"a": np.zeros(50)})  # 400 bytes each
+    assert cache.nbytes <= 1000
+    assert cache.get(4) is not None and cache.get(0) is None
+
+
+def test_cache_skips_values_over_budget_and_tracks_replacement():
+    cache = SimulationCache(max_entries=10, max_bytes=1000)
+    cache.set(1, np.zeros(10))
+    cache.set(2, np.zeros(1000))
+    assert cache.get(2) is None and cache.nbytes == 80
+    cache.set(1, np.zeros(20))
+    assert cache.nbytes == 160
+
+
+def test_cache_counts_arrays_inside_slots_objects():
+    results = SimulationAgent().run_simulations(CONTEXT)
+    cache = SimulationCache()
+    cache.set(0, results)
+    assert cache.nbytes == sum(r.rr_samples.nbytes + r.cp_samples.nbytes for r in results.values())
+
+
+# ── Samplers ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("method", samplers.SAMPLERS)
+def test_uniform_shape_and_range(method):
+    u = samplers.uniform(np.random.default_rng(0), 256, 3, method)
+    assert u.shape == (256, 3)
+    assert ((u >= 0) & (u < 1)).all()
+
+
+@pytest.mark.parametrize("method", samplers.SAMPLERS)
+def test_samplers_are_seeded(method):
+    a = samplers.normal(np.random.default_rng(7), 128, 2, method)
+    b = samplers.normal(np.random.default_rng(7), 128, 2, method)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_antithetic_pairs_mirror():
+    u = samplers.uniform(np.random.default_rng(0), 100, 2, "antithetic")
+    np.testing.assert_allclose(u[0::2] + u[1::2], 1.0)
+
+
+def test_lhs_has_one_draw_per_stratum():
+    n = 64
+    u = samplers.uniform(np.random.default_rng(0), n, 3, "lhs")
+    for column in u.T:
+        assert sorted(np.floor(column * n).astype(int)) == list(range(n))
+
+
+def test_antithetic_half_width_credits_pairing():
+    z = samplers.normal(np.random.default_rng(0), 10_000, 1, "antithetic")[:, 0]
+    assert samplers.half_width(z, "antithetic") < samplers.half_width(z, "pseudo")
+
+
+def test_proportion_half_width_positive_at_extremes():
+    for hits in (np.zeros(2000, bool), np.ones(2000, bool)):
+        assert samplers.proportion_half_width(hits) > 0
+    assert samplers.proportion_half_width(np.zeros(10, bool)) > 0.1
+    # Matches Wald in the interior
+    half = np.r_[np.ones(5000, bool), np.zeros(5000, bool)]
+    assert samplers.proportion_half_width(half) == pytest.approx(1.96 * 0.5 / 100, rel=1e-3)
+
+
+# ── Dates ─────────────────────────────────────────────────────────────────
+
+def test_as_date_accepts_strings_and_neo4j_temporals():
+    from datetime import date
+    from neo4j.time import Date, DateTime
+    expected = date(2030, 1, 15)
+    assert as_date("2030-01-15") == expected
+    assert as_date(Date(2030, 1, 15)) == expected
+    assert as_date(DateTime(2030, 1, 15, 9, 30)) == expected
+    assert as_date("soon") is None and as_date(None) is None
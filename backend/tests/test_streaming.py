@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.core.streaming import StreamMetrics, coalesce_tokens
+
+
+async def _tokens(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+def _frames(source, **kwargs):
+    async def run():
+        return [frame async for frame in coalesce_tokens(source, "test", **kwargs)]
+    return asyncio.run(run())
+
+
+def test_fast_stream_flushes_at_byte_limit():
+    tokens = ["abcd"] * 20
+    frames = _frames(_tokens(tokens), flush_ms=10_000, flush_bytes=16)
+    assert "".join(frames) == "".join(tokens)
+    assert frames == ["abcd" * 4] * 5
+
+
+def test_window_flushes_slow_tokens():
+    frames = _frames(_tokens(["a", "b", "c"], delay=0.05), flush_ms=10, flush_bytes=1024)
+    assert frames == ["a", "b", "c"]
+
+
+def test_everything_within_window_is_one_frame():
+    frames = _frames(_tokens(list("hello world")), flush_ms=10_000, flush_bytes=1024)
+    assert frames == ["hello world"]
+
+
+def test_error_tokens_are_never_merged():
+    frames = _frames(_tokens(["a", "b", "[ERROR] boom", "c"]), flush_ms=10_000, flush_bytes=1024)
+    assert frames == ["ab", "[ERROR] boom", "c"]
+
+
+def test_source_failure_propagates():
+    async def broken():
+        yield "a"
+        raise RuntimeError("upstream")
+
+    with pytest.raises(RuntimeError):
+        _frames(broken(), flush_ms=10_000, flush_bytes=1024)
+
+
+def test_metrics_count_frames_per_response():
+    metrics = StreamMetrics()
+    metrics.record("chat", tokens=10, frames=2, nbytes=40)
+    metrics.record("chat", tokens=4, frames=4, nbytes=8)
+    chat = metrics.snapshot()["streams"]["chat"]
+    assert chat["responses"] == 2 and chat["token_frames"] == 6
+    assert chat["avg_frames_per_response"] == 3.0 and chat["max_frames_per_response"] == 4
+    assert chat["avg_bytes_per_frame"] == 8.0
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from app.agents.sensitivity import SensitivityAnalyzer
+from app.agents.simulation import SimulationAgent
+from app.agents.team_simulator import (
+    MAX_SWEEP_CELLS,
+    ROLE_PROFILES,
+    TeamCompositionSimulator,
+    TeamMutation,
+    TeamScenario,
+    project_team_context,
+)
+
+CONTEXT = {
+    "is_blocked": True,
+    "blocked_count": 2,
+    "active_tickets": 8,
+    "total_tickets": 12,
+    "days_to_deadline": 30,
+    "team_size": 4,
+    "team_capacity_percent": 80,
+}
+
+
+def _scenarios():
+    return [
+        TeamScenario("two seniors", "p1", [TeamMutation("add", "Senior Engineer", "p1")] * 2),
+        TeamScenario("lose a lead", "p1", [TeamMutation("remove", "Tech Lead", "p1")]),
+        TeamScenario("qa", "p1", [TeamMutation("add", "QA Engineer", "p1")]),
+        TeamScenario("junior", "p1", [TeamMutation("add", "Junior Engineer", "p1")]),
+    ]
+
+
+# ── Single mutations ──────────────────────────────────────────────────────
+
+def test_mutation_is_deterministic_and_memoised():
+    m = TeamMutation("add", "Senior Engineer", "p1")
+    sim = TeamCompositionSimulator()
+    a = sim.simulate_mutation(m, 0.6, CONTEXT)
+    b = TeamCompositionSimulator().simulate_mutation(m, 0.6, CONTEXT)
+    assert a.projected_risk == b.projected_risk and a.p10_risk == b.p10_risk
+    assert sim.simulate_mutation(m, 0.6, CONTEXT) is a
+
+
+def test_batch_is_ranked_most_beneficial_first():
+    mutations = [TeamMutation("add", role, "p1") for role in ROLE_PROFILES]
+    results = TeamCompositionSimulator().simulate_batch(mutations, 0.6, CONTEXT)
+    deltas = [r.risk_delta for r in results]
+    assert deltas == sorted(deltas)
+
+
+# ── Compound scenarios ────────────────────────────────────────────────────
+
+def test_scenarios_ranked_and_in_input_order():
+    sim = TeamCompositionSimulator()
+    ranked = sim.simulate_scenarios(_scenarios(), 0.6, CONTEXT)
+    ordered = sim.simulate_scenarios(_scenarios(), 0.6, CONTEXT, ranked=False)
+    assert [r.risk_delta for r in ranked] == sorted(r.risk_delta for r in ranked)
+    assert [r.scenario.name for r in ordered] == [sc.name for sc in _scenarios()]
+    assert sorted(r.projected_risk for r in ordered) == sorted(r.projected_risk for r in ranked)
+
+
+def test_scenarios_are_seeded_by_inputs():
+    a = TeamCompositionSimulator().simulate_scenarios(_scenarios(), 0.6, CONTEXT, ranked=False)
+    b = TeamCompositionSimulator().simulate_scenarios(_scenarios(), 0.6, CONTEXT, ranked=False)
+    assert [r.projected_risk for r in a] == [r.projected_risk for r in b]
+
+
+def test_scenario_team_size_and_cost_follow_steps():
+    results = TeamCompositionSimulator().simulate_scenarios(_scenarios(), 0.6, CONTEXT, ranked=False)
+    assert [r.team_size_after for r in results] == [6, 3, 5, 5]
+    assert results[1].cost_delta < 0 < results[0].cost_delta
+
+
+# ── Sweep ─────────────────────────────────────────────────────────────────
+
+def test_sweep_grid_shape_and_determinism():
+    days, sizes, roles = [3, 10, 30, 60], [2, 4, 8], ["Senior Engineer", "QA Engineer"]
+    a = TeamCompositionSimulator().sweep(days, sizes, roles, CONTEXT)
+    b = TeamCompositionSimulator().sweep(days, sizes, roles, CONTEXT)
+    assert a == b
+    for heatmap in a["roles"]:
+        assert np.shape(heatmap["projected_risk"]) == (len(days), len(sizes))
+        helps = np.array(heatmap["helps"])
+        for s, min_days in enumerate(heatmap["min_days_to_help"]):
+            helping = [d for d, h in zip(days, helps[:, s]) if h]
+            assert min_days == (min(helping) if helping else None)
+        # A role never helps where it is infeasible
+        assert not (helps & ~np.array(heatmap["feasible"])).any()
+
+
+def test_sweep_rejects_oversized_grid():
+    with pytest.raises(ValueError):
+        TeamCompositionSimulator().sweep(range(MAX_SWEEP_CELLS + 1), [3], ["QA Engineer"], CONTEXT)
+
+
+# ── Sensitivity ───────────────────────────────────────────────────────────
+
+SIGNALS = {
+    "risk_score": 0.62,
+    "sim_context": {"is_blocked": True, "days_to_deadline": 20},
+    "blocked_tickets": ["a", "b"],
+    "blocked_high_priority": 1,
+    "overdue_tickets": ["c"],
+    "near_deadline_tickets": [],
+    "total_active": 8,
+}
+
+
+def test_sensitivity_is_deterministic_and_sorted_by_swing():
+    analyzer = SensitivityAnalyzer(SimulationAgent(), TeamCompositionSimulator())
+    a = analyzer.analyze(SIGNALS, CONTEXT, n_trials=4000)
+    b = analyzer.analyze(SIGNALS, CONTEXT, n_trials=4000)
+    assert a == b
+    for section in ("interventions", "roles", "risk_weights"):
+        rows = a[section]["parameters"]
+        swings = [r["swing"] for r in rows]
+        assert swings == sorted(swings, reverse=True)
+        for r in rows:
+            assert r["low"] <= r["high"]
+            assert r["swing"] == pytest.approx(r["high"] - r["low"], abs=2e-4)
+
+
+# ── Context ───────────────────────────────────────────────────────────────
+
+def test_project_team_context_counts_tickets():
+    tickets = [
+        {"id": "a", "status": "In Progress", "assignee": "x", "blocker_id": "z", "blocker_status": "To Do"},
+        {"id": "b", "status": "Done", "assignee": "y"},
+        {"id": "c", "status": "To Do", "assignee": "y"},
+    ]
+    ctx = project_team_context({"deadline": None}, tickets)
+    assert ctx["active_tickets"] == 2 and ctx["team_size"] == 2
+    assert ctx["days_to_deadline"] == 30
@@ -89,6 +89,7 @@ export interface DecisionComparison {
   feasible: boolean;
   recommended: boolean;
   reason: string;
+  n_trials?: number;
 }
 
 export interface AnalysisResult {
@@ -268,6 +269,8 @@ export const api = {
         mutation: { action: string; role: string; project_id: string; member_name?: string };
         baseline_risk: number;
         projected_risk: number;
+        projected_risk_p10?: number;
+        projected_risk_p90?: number;
         risk_delta: number;
         cost_delta: number;
         velocity_change: number;